@@ -5,6 +5,7 @@ from openai import OpenAI
 import json
 import numpy as np
 from typing import Dict, List, Any
+from correlation_service import CorrelationService
 
 class AdvancedRAGAssistant:
     def __init__(self):
@@ -47,7 +48,7 @@ class AdvancedRAGAssistant:
         
         # Statistical summaries for each column
         for col in dataset.columns:
-            if dataset[col].dtype in ['int64', 'float64']:
+            if pd.api.types.is_numeric_dtype(dataset[col]):
                 knowledge["statistics"][col] = {
                     "mean": dataset[col].mean(),
                     "median": dataset[col].median(),
@@ -57,9 +58,10 @@ class AdvancedRAGAssistant:
                     "distribution": "numerical"
                 }
             else:
+                counts = dataset[col].value_counts()
                 knowledge["statistics"][col] = {
                     "unique_values": dataset[col].unique().tolist(),
-                    "value_counts": dataset[col].value_counts().to_dict(),
+                    "value_counts": counts[counts > 0].to_dict(),  # categoricals also count unused levels
                     "distribution": "categorical"
                 }
         
@@ -78,21 +80,20 @@ class AdvancedRAGAssistant:
             }
             
             # Correlations
-            if len(dataset.select_dtypes(include=[np.number]).columns) > 1:
-                numeric_cols = dataset.select_dtypes(include=[np.number])
-                correlations = numeric_cols.corr()['Exam_Score'].to_dict()
+            if len(CorrelationService.numeric_columns(dataset)) > 1:
+                correlations = CorrelationService.with_target(dataset, 'Exam_Score').to_dict()
                 knowledge["relationships"]["score_correlations"] = correlations
         
         # Parental involvement analysis
         if 'Parental_Involvement' in dataset.columns and 'Exam_Score' in dataset.columns:
-            involvement_analysis = dataset.groupby('Parental_Involvement')['Exam_Score'].agg([
+            involvement_analysis = dataset.groupby('Parental_Involvement', observed=True)['Exam_Score'].agg([
                 'mean', 'count', 'std'
             ]).to_dict()
             knowledge["insights"]["parental_impact"] = involvement_analysis
         
         # Attendance analysis
         if 'Attendance' in dataset.columns and 'Exam_Score' in dataset.columns:
-            attendance_correlation = dataset['Attendance'].corr(dataset['Exam_Score'])
+            attendance_correlation = CorrelationService.pair(dataset, 'Attendance', 'Exam_Score')
             knowledge["relationships"]["attendance_performance"] = attendance_correlation
         
         self.knowledge_base = knowledge
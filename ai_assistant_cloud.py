@@ -185,7 +185,7 @@ This cloud version has limited AI. For full conversational AI powered by Ollama:
         # Add data context if relevant
         if dataset is not None and not dataset.empty:
             if response_key == 'parental_involvement' and 'Parental_Involvement' in dataset.columns:
-                avg_by_involvement = dataset.groupby('Parental_Involvement')['Exam_Score'].mean()
+                avg_by_involvement = dataset.groupby('Parental_Involvement', observed=True)['Exam_Score'].mean()
                 response += f"\n\n📊 **Your Data**: Average scores by involvement level:\n"
                 for level, score in avg_by_involvement.items():
                     response += f"- {level}: {score:.1f}\n"
@@ -3,6 +3,7 @@ import pandas as pd
 import streamlit as st
 from openai import OpenAI
 import json
+from correlation_service import CorrelationService
 
 class EducationalAIAssistant:
     """
@@ -93,17 +94,18 @@ Communication style:
             
             # Parental involvement impact
             if 'Parental_Involvement' in dataset.columns and 'Exam_Score' in dataset.columns:
-                involvement_impact = dataset.groupby('Parental_Involvement')['Exam_Score'].mean().to_dict()
+                involvement_impact = dataset.groupby('Parental_Involvement', observed=True)['Exam_Score'].mean().to_dict()
                 insights.append(f"- Parental involvement correlation with scores: {involvement_impact}")
             
             # Study hours impact
             if 'Hours_Studied' in dataset.columns and 'Exam_Score' in dataset.columns:
-                correlation = dataset[['Hours_Studied', 'Exam_Score']].corr().iloc[0, 1]
+                correlation = CorrelationService.pair(dataset, 'Hours_Studied', 'Exam_Score')
                 insights.append(f"- Study hours correlation with performance: {correlation:.2f}")
             
             # Extracurricular activities
             if 'Extracurricular_Activities' in dataset.columns:
-                activities_dist = dataset['Extracurricular_Activities'].value_counts().to_dict()
+                activities_dist = dataset['Extracurricular_Activities'].value_counts()
+                activities_dist = activities_dist[activities_dist > 0].to_dict()  # skip unused levels
                 insights.append(f"- Extracurricular participation: {activities_dist}")
             
         except Exception as e:
@@ -51,7 +51,8 @@ CURRENT DATASET:
                 context += f"- Average Attendance: {avg_attendance:.1f}%\n"
                 
             if 'Parental_Involvement' in dataset.columns:
-                involvement_counts = dataset['Parental_Involvement'].value_counts().to_dict()
+                involvement_counts = dataset['Parental_Involvement'].value_counts()
+                involvement_counts = involvement_counts[involvement_counts > 0].to_dict()  # skip unused levels
                 context += f"- Parental Involvement Distribution: {involvement_counts}\n"
         except:
             pass
@@ -1,75 +1,15 @@
 import pandas as pd
-import numpy as np
+from class_stats import ClassStats
+from correlation_service import CorrelationService
+from insights_engine import InsightsEngine
+from risk_engine import RiskEngine
 
 class Analytics:
     @staticmethod
     def get_performance_insights(df):
         """Comprehensive performance analytics with actionable insights"""
-        insights = {}
-        
-        # Basic metrics
-        insights['total_students'] = len(df)
-        
-        if 'Exam_Score' in df.columns:
-            insights['avg_score'] = df['Exam_Score'].mean()
-            insights['score_std'] = df['Exam_Score'].std()
-            insights['median_score'] = df['Exam_Score'].median()
-            insights['min_score'] = df['Exam_Score'].min()
-            insights['max_score'] = df['Exam_Score'].max()
-            
-            # Performance categories
-            insights['top_10_percent_threshold'] = df['Exam_Score'].quantile(0.9)
-            insights['bottom_10_percent_threshold'] = df['Exam_Score'].quantile(0.1)
-            insights['high_performers'] = len(df[df['Exam_Score'] >= 80])
-            insights['at_risk_students'] = len(df[df['Exam_Score'] < 60])
-            insights['average_performers'] = len(df[(df['Exam_Score'] >= 60) & (df['Exam_Score'] < 80)])
-        
-        # Parental involvement analysis
-        if 'Parental_Involvement' in df.columns and 'Exam_Score' in df.columns:
-            insights['avg_score_by_involvement'] = df.groupby('Parental_Involvement')['Exam_Score'].mean().to_dict()
-            insights['involvement_distribution'] = df['Parental_Involvement'].value_counts().to_dict()
-            
-            if 'Involvement_Score' in df.columns:
-                corr = df[['Involvement_Score', 'Exam_Score']].corr().iloc[0, 1]
-                insights['involvement_correlation'] = corr
-                insights['involvement_impact'] = "High" if abs(corr) > 0.5 else "Medium" if abs(corr) > 0.3 else "Low"
-        
-        # Attendance analysis
-        if 'Attendance' in df.columns and 'Exam_Score' in df.columns:
-            insights['avg_attendance'] = df['Attendance'].mean()
-            insights['attendance_correlation'] = df[['Attendance', 'Exam_Score']].corr().iloc[0, 1]
-            
-            high_attendance = df[df['Attendance'] >= 90]
-            low_attendance = df[df['Attendance'] < 70]
-            
-            if len(high_attendance) > 0:
-                insights['avg_score_high_attendance'] = high_attendance['Exam_Score'].mean()
-                insights['high_attendance_count'] = len(high_attendance)
-            
-            if len(low_attendance) > 0:
-                insights['avg_score_low_attendance'] = low_attendance['Exam_Score'].mean()
-                insights['low_attendance_count'] = len(low_attendance)
-            
-            # Attendance impact
-            if len(high_attendance) > 0 and len(low_attendance) > 0:
-                insights['attendance_score_difference'] = insights['avg_score_high_attendance'] - insights['avg_score_low_attendance']
-        
-        # Study hours analysis
-        if 'Hours_Studied' in df.columns and 'Exam_Score' in df.columns:
-            insights['avg_study_hours'] = df['Hours_Studied'].mean()
-            insights['study_hours_correlation'] = df[['Hours_Studied', 'Exam_Score']].corr().iloc[0, 1]
-            insights['optimal_study_hours'] = Analytics._find_optimal_study_hours(df)
-        
-        # Demographics
-        if 'Gender' in df.columns:
-            insights['gender_distribution'] = df['Gender'].value_counts().to_dict()
-            if 'Exam_Score' in df.columns:
-                insights['avg_score_by_gender'] = df.groupby('Gender')['Exam_Score'].mean().to_dict()
-        
-        # Key predictors
-        insights['strongest_predictors'] = Analytics._identify_strongest_predictors(df)
-        
-        return insights
+        # Moments, counts, quantiles and correlations are computed in one batched NumPy pass
+        return InsightsEngine.get_performance_insights(df)
     
     @staticmethod
     def _find_optimal_study_hours(df):
@@ -83,7 +23,7 @@ class Analytics:
                                          bins=[0, 10, 15, 20, 25, 50],
                                          labels=['0-10', '11-15', '16-20', '21-25', '25+'])
         
-        avg_by_range = df_copy.groupby('Study_Range')['Exam_Score'].mean()
+        avg_by_range = df_copy.groupby('Study_Range', observed=True)['Exam_Score'].mean()
         if len(avg_by_range) > 0:
             optimal_range = avg_by_range.idxmax()
             return str(optimal_range)
@@ -95,62 +35,32 @@ class Analytics:
         if 'Exam_Score' not in df.columns:
             return []
         
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
-        correlations = []
-        
-        for col in numeric_cols:
-            if col != 'Exam_Score' and df[col].notna().sum() > 0:
-                corr = df[[col, 'Exam_Score']].corr().iloc[0, 1]
-                if not np.isnan(corr):
-                    correlations.append({
-                        'factor': col,
-                        'correlation': abs(corr),
-                        'direction': 'positive' if corr > 0 else 'negative'
-                    })
-        
-        # Sort by correlation strength
-        correlations.sort(key=lambda x: x['correlation'], reverse=True)
-        return correlations[:5]  # Top 5 predictors
+        # One shared correlation matrix instead of a 2x2 matrix per column
+        correlations = CorrelationService.with_target(df).to_dict()
+        non_empty = df[list(correlations)].notna().any().to_dict()
+        return InsightsEngine.rank_predictors(correlations, non_empty)  # Top 5 predictors
     
     @staticmethod
-    def predict_at_risk_students(df, score_threshold=60, attendance_threshold=75):
-        """Identify students who need intervention"""
-        at_risk_criteria = []
-        
-        if 'Exam_Score' in df.columns:
-            at_risk_criteria.append(df['Exam_Score'] < score_threshold)
-        
-        if 'Attendance' in df.columns:
-            at_risk_criteria.append(df['Attendance'] < attendance_threshold)
-        
-        if 'Parental_Involvement' in df.columns:
-            at_risk_criteria.append(df['Parental_Involvement'] == 'Low')
-        
-        if at_risk_criteria:
-            # Students meeting ANY at-risk criteria
-            at_risk_mask = at_risk_criteria[0]
-            for criteria in at_risk_criteria[1:]:
-                at_risk_mask = at_risk_mask | criteria
-            
-            at_risk_students = df[at_risk_mask].copy()
-            
-            # Calculate risk level
-            risk_scores = []
-            for _, student in at_risk_students.iterrows():
-                risk_score = 0
-                if 'Exam_Score' in df.columns and student['Exam_Score'] < score_threshold:
-                    risk_score += 1
-                if 'Attendance' in df.columns and student['Attendance'] < attendance_threshold:
-                    risk_score += 1
-                if 'Parental_Involvement' in df.columns and student['Parental_Involvement'] == 'Low':
-                    risk_score += 1
-                risk_scores.append(risk_score)
-            
-            at_risk_students['Risk_Level'] = ['High' if score >= 2 else 'Medium' for score in risk_scores]
-            
-            return at_risk_students
-        
-        return pd.DataFrame()
+    def predict_at_risk_students(df, score_threshold=60, attendance_threshold=75, criteria=None, high_risk_score=2):
+        """
+        Identify students who need intervention
+        
+        Args:
+            df: DataFrame with student data
+            score_threshold: Exam score below which a student is flagged
+            attendance_threshold: Attendance below which a student is flagged
+            criteria: Optional list of weighted criteria (see risk_engine.EXTENDED_CRITERIA);
+                      overrides the two thresholds when given
+            high_risk_score: Summed weight at which a student is 'High' rather than 'Medium' risk
+        
+        Returns:
+            DataFrame of students meeting ANY criterion, with Risk_Score and Risk_Level columns
+        """
+        if criteria is None:
+            criteria = RiskEngine.build_criteria(score_threshold, attendance_threshold)
+        
+        # Criterion masks are summed into a score array instead of re-testing each row
+        return RiskEngine.at_risk_students(df, criteria, high_risk_score)
     
     @staticmethod
     def calculate_intervention_impact(df):
@@ -161,9 +71,10 @@ class Analytics:
         if 'Attendance' in df.columns and 'Exam_Score' in df.columns:
             low_attendance = df[df['Attendance'] < 85]
             if len(low_attendance) > 0:
-                correlation = df[['Attendance', 'Exam_Score']].corr().iloc[0, 1]
+                correlation = CorrelationService.pair(df, 'Attendance', 'Exam_Score')
                 # Estimate: 10% attendance improvement
-                estimated_score_gain = correlation * 10 * df['Exam_Score'].std() / df['Attendance'].std()
+                class_stats = ClassStats.for_frame(df)
+                estimated_score_gain = correlation * 10 * class_stats['Exam_Score'].std / class_stats['Attendance'].std
                 
                 interventions['improve_attendance'] = {
                     'students_affected': len(low_attendance),
@@ -304,7 +215,7 @@ class Analytics:
             return None
         
         trends = {
-            'grouped_stats': df.groupby(group_by)['Exam_Score'].agg([
+            'grouped_stats': df.groupby(group_by, observed=True)['Exam_Score'].agg([
                 ('count', 'count'),
                 ('mean', 'mean'),
                 ('median', 'median'),
@@ -0,0 +1,1032 @@
+"""
+Performance benchmarks for the analytics pipeline
+Compares the optimized code paths against the implementations they replaced
+and checks that both produce the same results.
+
+Run with: python benchmarks.py
+"""
+import os
+import time
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from analytics import Analytics
+from chart_renderer import ChartRenderer, DatasetRows
+from class_stats import ClassStats
+from correlation_service import CorrelationService
+from goal_store import MemoryGoalStore, SQLiteGoalStore
+from goal_tracker import GoalTracker
+from data_manager import DataManager, FilterIndex, StudentIndex, SCHEMA
+from insights_engine import InsightsEngine
+from progress_history import ProgressHistory
+from report_export import ReportExporter
+from risk_engine import EXTENDED_CRITERIA
+from student_profile import StudentProfile
+from visualizations import Visualizations, ANNOTATION_MAX_CELLS
+
+
+def load_roster(scale=1):
+    """Bundled dataset, optionally replicated to simulate a larger district"""
+    manager = DataManager()
+    df = pd.read_csv(manager.filename, dtype={col: 'category' for col, dtype in SCHEMA.items() if dtype == 'category'})
+    df = manager.normalize_data(manager.categorize_data(manager.apply_schema(df)))
+    if scale > 1:
+        df = pd.concat([df] * scale, ignore_index=True)
+    df.attrs['dataset_version'] = f"benchmark-x{scale}"
+    return df
+
+
+def cold(func):
+    """Wrap func so every call starts with an empty correlation cache"""
+    def run(*args):
+        CorrelationService.clear()
+        return func(*args)
+    return run
+
+
+def best_of(func, *args, repeat=5):
+    """Best wall-clock time of several runs, in milliseconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings), result
+
+
+def assert_same(expected, actual, path='insights'):
+    """Recursively compare two results, allowing float rounding differences"""
+    if isinstance(expected, dict):
+        assert set(expected) == set(actual), f"{path}: keys differ {set(expected) ^ set(actual)}"
+        for key in expected:
+            assert_same(expected[key], actual[key], f"{path}[{key!r}]")
+    elif isinstance(expected, list):
+        assert len(expected) == len(actual), f"{path}: lengths differ"
+        for i, (e, a) in enumerate(zip(expected, actual)):
+            assert_same(e, a, f"{path}[{i}]")
+    elif isinstance(expected, (float, np.floating)) and np.isnan(expected):
+        assert np.isnan(actual), f"{path}: expected NaN, got {actual}"
+    elif isinstance(expected, (int, float, np.number)) and not isinstance(expected, bool):
+        assert np.isclose(expected, actual, rtol=1e-9, atol=1e-9), f"{path}: {expected} != {actual}"
+    else:
+        assert expected == actual, f"{path}: {expected!r} != {actual!r}"
+
+
+class LegacyAnalytics:
+    """Previous pandas implementations, kept as the benchmark baseline"""
+
+    @staticmethod
+    def get_performance_insights(df):
+        """Column-by-column pandas implementation the insights engine replaced"""
+        insights = {}
+        
+        # Basic metrics
+        insights['total_students'] = len(df)
+        
+        if 'Exam_Score' in df.columns:
+            insights['avg_score'] = df['Exam_Score'].mean()
+            insights['score_std'] = df['Exam_Score'].std()
+            insights['median_score'] = df['Exam_Score'].median()
+            insights['min_score'] = df['Exam_Score'].min()
+            insights['max_score'] = df['Exam_Score'].max()
+            
+            # Performance categories
+            insights['top_10_percent_threshold'] = df['Exam_Score'].quantile(0.9)
+            insights['bottom_10_percent_threshold'] = df['Exam_Score'].quantile(0.1)
+            insights['high_performers'] = len(df[df['Exam_Score'] >= 80])
+            insights['at_risk_students'] = len(df[df['Exam_Score'] < 60])
+            insights['average_performers'] = len(df[(df['Exam_Score'] >= 60) & (df['Exam_Score'] < 80)])
+        
+        # Parental involvement analysis
+        if 'Parental_Involvement' in df.columns and 'Exam_Score' in df.columns:
+            insights['avg_score_by_involvement'] = df.groupby('Parental_Involvement', observed=True)['Exam_Score'].mean().to_dict()
+            insights['involvement_distribution'] = df['Parental_Involvement'].value_counts()[lambda s: s > 0].to_dict()
+            
+            if 'Involvement_Score' in df.columns:
+                corr = df[['Involvement_Score', 'Exam_Score']].corr().iloc[0, 1]
+                insights['involvement_correlation'] = corr
+                insights['involvement_impact'] = "High" if abs(corr) > 0.5 else "Medium" if abs(corr) > 0.3 else "Low"
+        
+        # Attendance analysis
+        if 'Attendance' in df.columns and 'Exam_Score' in df.columns:
+            insights['avg_attendance'] = df['Attendance'].mean()
+            insights['attendance_correlation'] = df[['Attendance', 'Exam_Score']].corr().iloc[0, 1]
+            
+            high_attendance = df[df['Attendance'] >= 90]
+            low_attendance = df[df['Attendance'] < 70]
+            
+            if len(high_attendance) > 0:
+                insights['avg_score_high_attendance'] = high_attendance['Exam_Score'].mean()
+                insights['high_attendance_count'] = len(high_attendance)
+            
+            if len(low_attendance) > 0:
+                insights['avg_score_low_attendance'] = low_attendance['Exam_Score'].mean()
+                insights['low_attendance_count'] = len(low_attendance)
+            
+            # Attendance impact
+            if len(high_attendance) > 0 and len(low_attendance) > 0:
+                insights['attendance_score_difference'] = insights['avg_score_high_attendance'] - insights['avg_score_low_attendance']
+        
+        # Study hours analysis
+        if 'Hours_Studied' in df.columns and 'Exam_Score' in df.columns:
+            insights['avg_study_hours'] = df['Hours_Studied'].mean()
+            insights['study_hours_correlation'] = df[['Hours_Studied', 'Exam_Score']].corr().iloc[0, 1]
+            insights['optimal_study_hours'] = Analytics._find_optimal_study_hours(df)
+        
+        # Demographics
+        if 'Gender' in df.columns:
+            insights['gender_distribution'] = df['Gender'].value_counts()[lambda s: s > 0].to_dict()
+            if 'Exam_Score' in df.columns:
+                insights['avg_score_by_gender'] = df.groupby('Gender', observed=True)['Exam_Score'].mean().to_dict()
+        
+        # Key predictors
+        insights['strongest_predictors'] = LegacyAnalytics._identify_strongest_predictors(df)
+        
+        return insights
+    
+    @staticmethod
+    def _identify_strongest_predictors(df):
+        """Identify which factors most strongly predict exam scores"""
+        if 'Exam_Score' not in df.columns:
+            return []
+        
+        numeric_cols = df.select_dtypes(include=[np.number]).columns
+        correlations = []
+        
+        for col in numeric_cols:
+            if col != 'Exam_Score' and df[col].notna().sum() > 0:
+                corr = df[[col, 'Exam_Score']].corr().iloc[0, 1]
+                if not np.isnan(corr):
+                    correlations.append({
+                        'factor': col,
+                        'correlation': abs(corr),
+                        'direction': 'positive' if corr > 0 else 'negative'
+                    })
+        
+        # Sort by correlation strength
+        correlations.sort(key=lambda x: x['correlation'], reverse=True)
+        return correlations[:5]  # Top 5 predictors
+
+    @staticmethod
+    def predict_at_risk_students(df, score_threshold=60, attendance_threshold=75):
+        """Row-by-row iterrows implementation the risk engine replaced"""
+        at_risk_criteria = []
+        
+        if 'Exam_Score' in df.columns:
+            at_risk_criteria.append(df['Exam_Score'] < score_threshold)
+        
+        if 'Attendance' in df.columns:
+            at_risk_criteria.append(df['Attendance'] < attendance_threshold)
+        
+        if 'Parental_Involvement' in df.columns:
+            at_risk_criteria.append(df['Parental_Involvement'] == 'Low')
+        
+        if at_risk_criteria:
+            # Students meeting ANY at-risk criteria
+            at_risk_mask = at_risk_criteria[0]
+            for criteria in at_risk_criteria[1:]:
+                at_risk_mask = at_risk_mask | criteria
+            
+            at_risk_students = df[at_risk_mask].copy()
+            
+            # Calculate risk level
+            risk_scores = []
+            for _, student in at_risk_students.iterrows():
+                risk_score = 0
+                if 'Exam_Score' in df.columns and student['Exam_Score'] < score_threshold:
+                    risk_score += 1
+                if 'Attendance' in df.columns and student['Attendance'] < attendance_threshold:
+                    risk_score += 1
+                if 'Parental_Involvement' in df.columns and student['Parental_Involvement'] == 'Low':
+                    risk_score += 1
+                risk_scores.append(risk_score)
+            
+            at_risk_students['Risk_Level'] = ['High' if score >= 2 else 'Medium' for score in risk_scores]
+            
+            return at_risk_students
+        
+        return pd.DataFrame()
+
+
+class LegacyVisualizations:
+    """Chart code as it was before binned rendering"""
+
+    @staticmethod
+    def create_scatter_plot(df, x_col, y_col, color_by=None, title=None):
+        """One marker per student, re-masking the frame for every category"""
+        fig, ax = plt.subplots(figsize=(10, 7))
+        if color_by and color_by in df.columns:
+            categories = df[color_by].unique()
+            colors = plt.cm.Set3(np.linspace(0, 1, len(categories)))
+            for category, color in zip(categories, colors):
+                mask = df[color_by] == category
+                ax.scatter(df[mask][x_col], df[mask][y_col],
+                           label=category, alpha=0.6, s=50, color=color, edgecolors='black')
+            ax.legend(title=color_by, loc='best')
+        else:
+            ax.scatter(df[x_col], df[y_col], alpha=0.5, s=50, color='skyblue', edgecolors='black')
+        z = np.polyfit(df[x_col].dropna(), df[y_col].dropna(), 1)
+        x_trend = np.linspace(df[x_col].min(), df[x_col].max(), 100)
+        ax.plot(x_trend, np.poly1d(z)(x_trend), "r--", alpha=0.8, linewidth=2, label='Trend')
+        ax.set_title(title or f'{y_col} vs {x_col}', fontsize=14, fontweight='bold')
+        plt.tight_layout()
+        return fig
+
+    @staticmethod
+    def create_correlation_heatmap(df):
+        """One ax.text and iloc lookup per cell"""
+        corr_matrix = CorrelationService.matrix(df)
+        fig, ax = plt.subplots(figsize=(12, 8))
+        im = ax.imshow(corr_matrix, aspect='auto', vmin=-1, vmax=1, cmap='RdBu_r')
+        plt.colorbar(im, ax=ax, shrink=0.8)
+        ax.set_xticks(range(len(corr_matrix.columns)))
+        ax.set_yticks(range(len(corr_matrix.columns)))
+        ax.set_xticklabels(corr_matrix.columns, rotation=45, ha='right')
+        ax.set_yticklabels(corr_matrix.columns)
+        for i in range(len(corr_matrix.columns)):
+            for j in range(len(corr_matrix.columns)):
+                ax.text(j, i, f'{corr_matrix.iloc[i, j]:.2f}',
+                        ha="center", va="center", color="black", fontsize=8)
+        plt.tight_layout()
+        return fig
+
+
+class LegacyStudentProfile(StudentProfile):
+    """Previous per-call class statistics and full-column percentiles, kept as the benchmark baseline"""
+
+    def __init__(self, student_data, class_data):
+        self.student = student_data.to_dict()
+        self.class_data = class_data
+        self.class_avg = class_data.mean(numeric_only=True)
+
+    @staticmethod
+    def generate_comprehensive_report(df, student_id):
+        student_data = df[df['Student_ID'] == student_id]
+        if len(student_data) == 0:
+            return None
+        return LegacyStudentProfile(student_data.iloc[0], df)._generate_report()
+
+    def _analyze_performance(self):
+        analysis = {}
+
+        if 'Exam_Score' in self.student:
+            score = self.student['Exam_Score']
+            class_avg = self.class_avg.get('Exam_Score', 0)
+            class_std = self.class_data['Exam_Score'].std()
+
+            # Performance level
+            if score >= class_avg + class_std:
+                status = "Exceeding Expectations"
+                level = "High Performer"
+            elif score >= class_avg:
+                status = "Meeting Expectations"
+                level = "Average Performer"
+            elif score >= class_avg - class_std:
+                status = "Approaching Expectations"
+                level = "Below Average"
+            else:
+                status = "Needs Significant Support"
+                level = "At Risk"
+
+            # Percentile calculation
+            percentile = (self.class_data['Exam_Score'] < score).sum() / len(self.class_data) * 100
+
+            # Letter grade
+            if score >= 90:
+                grade = 'A'
+            elif score >= 80:
+                grade = 'B'
+            elif score >= 70:
+                grade = 'C'
+            elif score >= 60:
+                grade = 'D'
+            else:
+                grade = 'F'
+
+            analysis['exam_score'] = score
+            analysis['class_average'] = class_avg
+            analysis['difference_from_average'] = score - class_avg
+            analysis['percentile'] = percentile
+            analysis['performance_status'] = status
+            analysis['performance_level'] = level
+            analysis['letter_grade'] = grade
+            analysis['standard_deviations_from_mean'] = (score - class_avg) / class_std if class_std > 0 else 0
+
+        # Attendance analysis
+        if 'Attendance' in self.student:
+            attendance = self.student['Attendance']
+            class_avg_attendance = self.class_avg.get('Attendance', 0)
+
+            if attendance >= 95:
+                attendance_rating = "Excellent"
+            elif attendance >= 90:
+                attendance_rating = "Good"
+            elif attendance >= 80:
+                attendance_rating = "Fair"
+            elif attendance >= 70:
+                attendance_rating = "Poor"
+            else:
+                attendance_rating = "Critical"
+
+            analysis['attendance_rate'] = attendance
+            analysis['attendance_rating'] = attendance_rating
+            analysis['attendance_vs_class'] = attendance - class_avg_attendance
+            analysis['days_missed_estimate'] = int((100 - attendance) * 1.8)  # Assuming 180 school days
+
+        # Study habits
+        if 'Hours_Studied' in self.student:
+            study_hours = self.student['Hours_Studied']
+            class_avg_study = self.class_avg.get('Hours_Studied', 0)
+
+            analysis['study_hours_per_week'] = study_hours
+            analysis['study_hours_vs_class'] = study_hours - class_avg_study
+
+            if study_hours >= 20:
+                study_rating = "Dedicated"
+            elif study_hours >= 15:
+                study_rating = "Good"
+            elif study_hours >= 10:
+                study_rating = "Moderate"
+            else:
+                study_rating = "Insufficient"
+
+            analysis['study_habits_rating'] = study_rating
+
+        return analysis
+
+    def _compare_to_peers(self):
+        comparison = {}
+        for field in ['Exam_Score', 'Attendance', 'Hours_Studied', 'Sleep_Hours']:
+            if field in self.student and field in self.class_data.columns:
+                student_value = self.student[field]
+                class_mean = self.class_data[field].mean()
+                class_median = self.class_data[field].median()
+                percentile = (self.class_data[field] < student_value).sum() / len(self.class_data) * 100
+                if percentile >= 90:
+                    standing = "Top 10%"
+                elif percentile >= 75:
+                    standing = "Upper Quarter"
+                elif percentile >= 50:
+                    standing = "Above Average"
+                elif percentile >= 25:
+                    standing = "Below Average"
+                else:
+                    standing = "Bottom Quarter"
+                comparison[field] = {
+                    'student_value': student_value,
+                    'class_mean': class_mean,
+                    'class_median': class_median,
+                    'percentile': percentile,
+                    'standing': standing,
+                    'difference_from_mean': student_value - class_mean
+                }
+        return comparison
+
+
+def benchmark_performance_insights(scales=(1, 20)):
+    """get_performance_insights: per-column pandas passes vs. the batched insights engine"""
+    print("\nget_performance_insights")
+    for scale in scales:
+        df = load_roster(scale)
+        legacy_ms, expected = best_of(LegacyAnalytics.get_performance_insights, df)
+        engine_ms, actual = best_of(cold(InsightsEngine.get_performance_insights), df)
+        assert_same(expected, actual)
+        print(f"  {len(df):>8,} rows: legacy {legacy_ms:8.1f} ms | engine {engine_ms:8.1f} ms | "
+              f"{legacy_ms / engine_ms:5.1f}x faster")
+
+
+def benchmark_at_risk_students(scales=(1, 20)):
+    """predict_at_risk_students: iterrows risk scoring vs. summed criterion masks"""
+    print("\npredict_at_risk_students")
+    for scale in scales:
+        df = load_roster(scale)
+        legacy_ms, expected = best_of(LegacyAnalytics.predict_at_risk_students, df, repeat=1)
+        engine_ms, actual = best_of(Analytics.predict_at_risk_students, df)
+        assert expected.index.equals(actual.index), "at-risk rows differ"
+        assert (expected['Risk_Level'] == actual['Risk_Level']).all(), "risk levels differ"
+        print(f"  {len(df):>8,} rows: legacy {legacy_ms:8.1f} ms | engine {engine_ms:8.1f} ms | "
+              f"{legacy_ms / engine_ms:5.1f}x faster")
+    extended_ms, _ = best_of(Analytics.predict_at_risk_students, df, 60, 75, EXTENDED_CRITERIA)
+    print(f"  {len(df):>8,} rows with 6 weighted criteria: {extended_ms:8.1f} ms")
+
+
+def benchmark_correlations(scales=(1, 20)):
+    """Correlations one overview render needs: separate pandas .corr() calls vs. the shared matrix"""
+    print("\ncorrelations per overview render")
+    for scale in scales:
+        df = load_roster(scale)
+
+        def legacy_render(df):
+            # Predictors (twice: insights + key insights panel), factor chart, heatmap and pair lookups
+            LegacyAnalytics._identify_strongest_predictors(df)
+            LegacyAnalytics._identify_strongest_predictors(df)
+            numeric_cols = df.select_dtypes(include=[np.number]).columns
+            for col in numeric_cols:
+                df[[col, 'Exam_Score']].corr()
+            df[numeric_cols].corr()
+            for col in ['Involvement_Score', 'Attendance', 'Hours_Studied', 'Attendance']:
+                df[[col, 'Exam_Score']].corr()
+
+        def shared_render(df):
+            for _ in range(4):
+                CorrelationService.with_target(df)
+            CorrelationService.matrix(df)
+            for col in ['Involvement_Score', 'Attendance', 'Hours_Studied', 'Attendance']:
+                CorrelationService.pair(df, col, 'Exam_Score')
+
+        legacy_ms, _ = best_of(legacy_render, df)
+        cold_ms, _ = best_of(cold(shared_render), df)
+        warm_ms, _ = best_of(shared_render, df)
+        expected = df[CorrelationService.numeric_columns(df)].corr()
+        assert np.allclose(expected.to_numpy(), CorrelationService.matrix(df).to_numpy(), equal_nan=True)
+        print(f"  {len(df):>8,} rows: legacy {legacy_ms:8.1f} ms | shared cold {cold_ms:6.1f} ms | "
+              f"shared warm {warm_ms:6.2f} ms")
+
+
+def benchmark_filters(scales=(1, 20)):
+    """Sidebar filtering: copy + boolean masks vs. bitmap AND over the filter index"""
+    print("\nsidebar filters (involvement, gender, school type, income)")
+    filters = {'Parental_Involvement': 'Low', 'Gender': 'Male', 'School_Type': 'Public', 'Family_Income': 'Medium'}
+    for scale in scales:
+        df = load_roster(scale)
+
+        def legacy_filter(df):
+            filtered = df.copy()
+            for column, value in filters.items():
+                filtered = filtered[filtered[column] == value]
+            return filtered
+
+        build_ms, index = best_of(FilterIndex, df, repeat=1)
+        legacy_ms, expected = best_of(legacy_filter, df)
+        bitmap_ms, positions = best_of(index.positions, filters)
+        view_ms, view = best_of(lambda f: index.view(df, f).frame, filters)
+        pd.testing.assert_frame_equal(expected, view)
+        assert len(positions) == len(expected)
+        print(f"  {len(df):>8,} rows: legacy {legacy_ms:8.2f} ms | bitmap rows {bitmap_ms:6.2f} ms | "
+              f"materialized view {view_ms:6.2f} ms | index build {build_ms:6.1f} ms (once)")
+
+
+def benchmark_scatter(scales=(1, 80)):
+    """Study hours scatter rendered to PNG: one marker per student vs. binned above the threshold"""
+    print("\nscatter plot rendering (PNG)")
+    for scale in scales:
+        df = load_roster(scale)
+        for color_by in (None, 'Parental_Involvement'):
+            args = (df, 'Hours_Studied', 'Exam_Score', color_by)
+            legacy_ms, _ = best_of(lambda *a: Visualizations.render(LegacyVisualizations.create_scatter_plot(*a)),
+                                   *args, repeat=1)
+            current_ms, _ = best_of(lambda *a: Visualizations.render_chart('scatter_plot', *a), *args, repeat=2)
+            mode = 'binned' if Visualizations.use_density(len(df)) else 'markers'
+            print(f"  {len(df):>8,} rows, color_by={color_by}: legacy {legacy_ms:8.1f} ms | "
+                  f"{mode} {current_ms:8.1f} ms")
+
+
+def benchmark_heatmap(extra_features=(0, 24)):
+    """Correlation heatmap rendered to PNG: per-cell iloc + ax.text vs. plot_heatmap (which only saves
+    time by skipping labels above ANNOTATION_MAX_CELLS; annotated sizes render at the same speed)"""
+    print("\ncorrelation heatmap rendering (PNG)")
+    base = load_roster()
+    rng = np.random.default_rng(0)
+    for extra in extra_features:
+        df = base.copy()
+        # Engineered features: noisy combinations of existing columns
+        for k in range(extra):
+            df[f'Feature_{k}'] = df['Hours_Studied'] * rng.random() + rng.normal(size=len(df))
+        n_cols = len(CorrelationService.numeric_columns(df))
+        legacy_ms, _ = best_of(lambda d: Visualizations.render(LegacyVisualizations.create_correlation_heatmap(d)),
+                               df, repeat=2)
+        current_ms, _ = best_of(lambda d: Visualizations.render_chart('correlation_heatmap', d), df, repeat=2)
+        annotated = 'annotated' if n_cols ** 2 <= ANNOTATION_MAX_CELLS else 'unannotated'
+        print(f"  {n_cols:>3} features ({n_cols ** 2} cells): legacy {legacy_ms:8.1f} ms | "
+              f"{annotated} {current_ms:8.1f} ms")
+
+
+def benchmark_chart_backends(scales=(1, 80)):
+    """Server time and payload for all 14 overview charts: matplotlib PNGs vs. plotly JSON"""
+    from dashboard import OVERVIEW_CHARTS
+    from plotly_charts import PlotlyVisualizations
+    if not PlotlyVisualizations.available():
+        return
+    print("\nchart backends (all overview charts)")
+    specs = [spec for charts in OVERVIEW_CHARTS.values() for spec in charts.values()]
+    for scale in scales:
+        df = load_roster(scale)
+        for name in ('matplotlib', 'plotly'):
+            backend = Visualizations.backend(name)
+            elapsed_ms, payloads = best_of(lambda: [backend.render_chart(chart, df, *args) for chart, args in specs],
+                                           repeat=1)
+            size_kb = sum(len(p) for p in payloads if p) / 1024
+            print(f"  {len(df):>8,} rows, {name:<10}: {elapsed_ms:8.1f} ms server time | {size_kb:8.1f} KB sent")
+
+
+def benchmark_chart_rendering(workers=(1, 2, 4)):
+    """All 14 overview charts: drawn one after another vs. by the rendering pool"""
+    from dashboard import OVERVIEW_CHARTS
+    print(f"\noverview chart rendering ({os.cpu_count()} CPUs)")
+    df = load_roster()
+    requests = [(chart, df, args, {}) for charts in OVERVIEW_CHARTS.values() for chart, args in charts.values()]
+
+    def serial(requests):
+        return [Visualizations.render_chart(chart, df, *args, **kwargs) for chart, df, args, kwargs in requests]
+
+    serial_ms, expected = best_of(serial, requests, repeat=2)
+    print(f"  {len(requests)} charts serial: {serial_ms:8.1f} ms")
+    default_workers = ChartRenderer.max_workers
+    for count in workers:
+        if count < 2:
+            continue
+        ChartRenderer.shutdown()
+        ChartRenderer.max_workers = count
+        ChartRenderer.render_many(requests[:count])  # start the workers outside the timing
+        pool_ms, rendered = best_of(ChartRenderer.render_many, requests, repeat=2)
+        assert [len(data) for data in rendered] == [len(data) for data in expected]
+        print(f"  {len(requests)} charts, {count} workers: {pool_ms:8.1f} ms")
+    ChartRenderer.shutdown()
+    ChartRenderer.max_workers = default_workers
+
+
+def benchmark_chart_payload(scale=20, workers=2):
+    """Overview charts in the pool for a filtered district: pickled frame per chart vs. DatasetRows"""
+    import pickle
+    import tempfile
+    from dashboard import OVERVIEW_CHARTS
+    print(f"\nchart pool payload (district x{scale}, {workers} workers)")
+    specs = [spec for charts in OVERVIEW_CHARTS.values() for spec in charts.values()]
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, 'district.csv')
+        pd.concat([pd.read_csv(DataManager().filename)] * scale, ignore_index=True).to_csv(filename, index=False)
+        df = DataManager.read_processed_data(filename, tmp)
+        index = FilterIndex(df)
+        filters = {'School_Type': 'Public'}
+        view = index.view(df, filters)
+        rows = DatasetRows(filename, tmp, df.attrs['dataset_version'], view.mask)
+        assert rows.frame().equals(view.frame)
+
+        default_workers = ChartRenderer.max_workers
+        ChartRenderer.shutdown()
+        ChartRenderer.max_workers = workers
+        ChartRenderer.render_many([(chart, rows, args, {}) for chart, args in specs[:workers]])  # workers load once
+        for label, source in (('pickled frame', view.frame), ('DatasetRows', rows)):
+            # The Streamlit thread pickles the payload of every chart it submits
+            pickle_ms, payload = best_of(pickle.dumps, source)
+            elapsed_ms, rendered = best_of(ChartRenderer.render_many,
+                                           [(chart, source, args, {}) for chart, args in specs], repeat=2)
+            print(f"  {len(view):>8,} rows, {label:<13}: {len(payload) / 1024:9.1f} KB, "
+                  f"{pickle_ms:6.2f} ms pickling per chart | {len(specs)} charts {elapsed_ms:8.1f} ms")
+        ChartRenderer.shutdown()
+        ChartRenderer.max_workers = default_workers
+
+
+def benchmark_student_reports(cohort=200):
+    """End-of-term reports: one generate_comprehensive_report call per student vs. the batch API"""
+    print("\nstudent reports")
+    df = DataManager.assign_student_ids(load_roster())
+    ids = df['Student_ID'].iloc[:cohort].tolist()
+
+    def strip_timestamps(reports):
+        return [{k: v for k, v in report.items() if k != 'timestamp'} for report in reports]
+
+    legacy_ms, expected = best_of(lambda: [LegacyStudentProfile.generate_comprehensive_report(df, i) for i in ids],
+                                  repeat=1)
+    batch_ms, actual = best_of(StudentProfile.generate_reports, df, ids, repeat=2)
+    assert_same(strip_timestamps(expected), strip_timestamps(actual), 'reports')
+    table = StudentProfile.generate_report_table(df, ids)
+    assert np.allclose(table['exam_score_percentile'], [r['performance']['percentile'] for r in expected])
+    assert table['letter_grade'].tolist() == [r['performance']['letter_grade'] for r in expected]
+    print(f"  {cohort:>8,} students: legacy {legacy_ms:8.1f} ms | batch {batch_ms:8.1f} ms | "
+          f"{legacy_ms / batch_ms:5.1f}x faster")
+
+    roster_ms, reports = best_of(StudentProfile.generate_reports, df, repeat=1)
+    table_ms, table = best_of(StudentProfile.generate_report_table, df)
+    print(f"  {len(reports):>8,} students: batch {roster_ms:8.1f} ms | report table {table_ms:6.1f} ms | "
+          f"legacy ~{legacy_ms / cohort * len(df):8.0f} ms (projected)")
+
+    # One profile against the class, with the class statistics recomputed vs. read from the snapshot
+    row = df.iloc[0]
+    legacy_one_ms, expected = best_of(lambda: LegacyStudentProfile(row, df)._generate_report(), repeat=20)
+    snapshot_ms, _ = best_of(ClassStats, df)
+    one_ms, actual = best_of(lambda: StudentProfile(row, df)._generate_report(), repeat=20)
+    assert_same(strip_timestamps([expected]), strip_timestamps([actual]), 'profile')
+    print(f"  single profile: legacy {legacy_one_ms:6.2f} ms | snapshot {one_ms:6.3f} ms | "
+          f"snapshot build {snapshot_ms:6.2f} ms (once per dataset version)")
+
+
+def benchmark_student_lookup(scales=(1, 20)):
+    """
+    Finding one student: Student_ID comparison over the frame vs. the shared index, and
+    vs. the scanning index an unversioned frame gets for a one-off lookup
+    """
+    print("\nstudent lookup by Student_ID")
+
+    def build_index(df):
+        index = StudentIndex(df)
+        index.ids  # the ID map is built on first use
+        return index
+
+    for scale in scales:
+        df = DataManager.assign_student_ids(load_roster(scale))
+        ids = df['Student_ID'].iloc[::max(1, len(df) // 100)].tolist()
+        build_ms, index = best_of(build_index, df, repeat=1)
+        legacy_ms, expected = best_of(lambda: [df[df['Student_ID'] == i].iloc[0] for i in ids], repeat=2)
+        index_ms, actual = best_of(lambda: [index.row(df, i) for i in ids], repeat=2)
+        one_off_ms, one_off = best_of(lambda: [StudentIndex(df, scan=True).row(df, i) for i in ids], repeat=2)
+        assert all(e.equals(a) and e.equals(o) for e, a, o in zip(expected, actual, one_off))
+        print(f"  {len(df):>8,} rows: scan {legacy_ms / len(ids):7.3f} ms | index {index_ms / len(ids):7.3f} ms "
+              f"per student | index build {build_ms:6.1f} ms (once) | one-off {one_off_ms / len(ids):7.3f} ms")
+
+
+def benchmark_report_export(cohort=300):
+    """Printable summaries for a cohort: one report + download per student vs. the bulk ZIP export"""
+    import io
+    import zipfile
+    print(f"\nbulk summary export ({ChartRenderer.max_workers} workers)")
+    df = DataManager.assign_student_ids(load_roster())
+    ids = df['Student_ID'].iloc[:cohort].tolist()
+
+    def legacy_export(ids):
+        with zipfile.ZipFile(io.BytesIO(), 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+            for student_id in ids:
+                report = LegacyStudentProfile.generate_comprehensive_report(df, student_id)
+                archive.writestr(ReportExporter.entry_name(student_id), StudentProfile._format_printable_summary(report))
+
+    def bulk_export(ids):
+        archive = io.BytesIO()
+        ReportExporter.export_zip(df, archive, ids)
+        return archive
+
+    legacy_ms, _ = best_of(legacy_export, ids, repeat=1)
+    bulk_export(ids[:10])  # start the workers outside the timing
+    cohort_ms, archive = best_of(bulk_export, ids, repeat=2)
+    with zipfile.ZipFile(archive) as zipped:
+        assert len(zipped.namelist()) == cohort
+    roster_ms, archive = best_of(bulk_export, None, repeat=1)
+    print(f"  {cohort:>8,} students: legacy {legacy_ms:8.1f} ms | bulk {cohort_ms:8.1f} ms")
+    print(f"  {len(df):>8,} students: bulk {roster_ms:8.1f} ms ({len(archive.getvalue()) / 1024:.0f} KB) | "
+          f"legacy ~{legacy_ms / cohort * len(df):8.0f} ms (projected)")
+    ChartRenderer.shutdown()
+
+
+def seed_goals(tracker, n_students, goals_per_student=2):
+    """Create goals for n_students in one write batch"""
+    with tracker.store.batch():
+        for student_id in range(1, n_students + 1):
+            for k in range(goals_per_student):
+                tracker.create_goal(student_id, 'Exam Score' if k == 0 else 'Attendance', 60.0 + k, 80.0)
+
+
+def benchmark_goal_storage(n_students=(1_000, 25_000)):
+    """Goal lookups: the indexed in-memory store vs. the indexed SQLite store"""
+    import tempfile
+    print("\ngoal storage (2 goals per student)")
+    for count in n_students:
+        with tempfile.TemporaryDirectory() as tmp:
+            trackers = {'memory': GoalTracker(MemoryGoalStore()),
+                        'sqlite': GoalTracker(SQLiteGoalStore(os.path.join(tmp, 'goals.db')))}
+            students = np.random.default_rng(0).integers(1, count + 1, 200).tolist()
+            timings = {}
+            for name, tracker in trackers.items():
+                seed_ms, _ = best_of(seed_goals, tracker, count, repeat=1)
+                lookup_ms, found = best_of(lambda: [tracker.get_student_goals(i) for i in students], repeat=2)
+                status_ms, statuses = best_of(lambda: [tracker.get_goal_status(2 * i) for i in students], repeat=2)
+                update_ms, _ = best_of(lambda: [tracker.update_progress(2 * i, 70.0) for i in students[:50]], repeat=1)
+                timings[name] = (seed_ms, lookup_ms / len(students), status_ms / len(students), update_ms / 50)
+                assert all(len(goals) == 2 for goals in found) and all(statuses)
+            for name, (seed_ms, lookup_ms, status_ms, update_ms) in timings.items():
+                print(f"  {count:>8,} students, {name:<6}: create {seed_ms:8.1f} ms | student goals {lookup_ms:6.3f} ms | "
+                      f"goal status {status_ms:6.3f} ms | update {update_ms:6.3f} ms")
+
+
+class LegacyGoalTracker(GoalTracker):
+    """Previous per-student suggestion rules, for comparison with suggest_goals_for_cohort"""
+
+    def suggest_goals(self, df, student_id, class_stats=None):
+        """
+        Suggest goals based on student performance
+        
+        Args:
+            df: DataFrame with all student data
+            student_id: ID of the student
+            class_stats: ClassStats snapshot of df (default: the shared snapshot for df)
+        
+        Returns:
+            List of suggested goals
+        """
+        # Find student data
+        student_row = StudentIndex.for_frame(df).row(df, student_id)
+        if student_row is None:
+            return []
+        
+        suggestions = []
+        
+        # Exam score goal
+        if 'Exam_Score' in df.columns:
+            current_score = student_row['Exam_Score']
+            if class_stats is None:
+                class_stats = ClassStats.for_frame(df)
+            class_avg = class_stats['Exam_Score'].mean
+            
+            if current_score < 70:
+                target = 70
+                priority = 'High'
+                reason = "Reach passing grade (70) - Essential for academic progress"
+            elif current_score < class_avg:
+                target = class_avg + 5
+                priority = 'Medium'
+                reason = f"Score above class average ({class_avg:.1f}) - Shows improvement"
+            else:
+                target = min(current_score + 10, 98)
+                priority = 'Medium'
+                reason = "Maintain excellence and aim for top performance"
+            
+            suggestions.append({
+                'goal_type': 'Exam Score',
+                'current_value': float(current_score),
+                'target_value': float(target),
+                'timeline_days': 90,
+                'reason': reason,
+                'priority': priority
+            })
+        
+        # Attendance goal
+        if 'Attendance' in df.columns:
+            current_attendance = student_row['Attendance']
+            
+            if current_attendance < 85:
+                target = 90
+                priority = 'High'
+                reason = "Achieve 90% attendance - Critical for academic success"
+            elif current_attendance < 95:
+                target = 95
+                priority = 'Medium'
+                reason = "Reach 95% attendance - Excellent performance level"
+            else:
+                target = 98
+                priority = 'Low'
+                reason = "Maintain near-perfect attendance"
+            
+            suggestions.append({
+                'goal_type': 'Attendance',
+                'current_value': float(current_attendance),
+                'target_value': float(target),
+                'timeline_days': 60,
+                'reason': reason,
+                'priority': priority
+            })
+        
+        # Study hours goal
+        if 'Hours_Studied' in df.columns:
+            current_hours = student_row['Hours_Studied']
+            
+            if current_hours < 15:
+                target = 18
+                priority = 'High'
+                reason = "Increase to recommended 15-20 hours/week for better results"
+            elif current_hours < 20:
+                target = 20
+                priority = 'Medium'
+                reason = "Optimize study time to 20 hours/week for maximum effectiveness"
+            else:
+                target = current_hours
+                priority = 'Low'
+                reason = "Maintain consistent study schedule"
+            
+            suggestions.append({
+                'goal_type': 'Study Hours',
+                'current_value': float(current_hours),
+                'target_value': float(target),
+                'timeline_days': 30,
+                'reason': reason,
+                'priority': priority
+            })
+        
+        # Sort by priority
+        priority_order = {'High': 0, 'Medium': 1, 'Low': 2}
+        suggestions.sort(key=lambda x: priority_order.get(x['priority'], 2))
+        
+        return suggestions
+
+
+def legacy_goal_metrics(tracker):
+    """Previous GoalTracker.calculate_goal_metrics: list scans plus a status lookup per active goal"""
+    goals = tracker.goals
+    if not goals:
+        return None
+    active_goals = [g for g in goals if g['status'] == 'active']
+    achieved_goals = [g for g in goals if g['status'] == 'achieved']
+    # 'goal_id' instead of the old 'id' key, which raised KeyError whenever a goal was active
+    statuses = [tracker.get_goal_status(g['goal_id']) for g in active_goals]
+    return {
+        'total_goals': len(goals),
+        'active_goals': len(active_goals),
+        'achieved_goals': len(achieved_goals),
+        'achievement_rate': len(achieved_goals) / len(goals) * 100 if goals else 0,
+        'average_progress': np.mean([s['progress_percentage'] for s in statuses]) if active_goals else 0,
+        'goals_on_track': len([s for s in statuses if s['on_track']]),
+        'goals_behind': len([s for s in statuses if not s['on_track']])
+    }
+
+
+def seed_goal_progress(tracker, n_students):
+    """Goals of n_students created over the last 60 days, with progress on every third one"""
+    seed_goals(tracker, n_students)
+    store = tracker.store
+    for goal in store.find():
+        goal['created_date'] -= timedelta(days=goal['goal_id'] % 60)
+        store.metric_columns.update(goal)
+    with store.batch():
+        for goal_id in range(1, 2 * n_students + 1, 3):
+            tracker.update_progress(goal_id, 60.0 + goal_id % 25)
+
+
+def benchmark_goal_metrics(n_students=(1_000, 25_000)):
+    """Dashboard goal metrics: per-goal status lookups vs. array operations over the goal columns"""
+    print("\ngoal metrics (2 goals per student)")
+    for count in n_students:
+        tracker = GoalTracker(MemoryGoalStore())
+        seed_goal_progress(tracker, count)
+        vectorized_ms, metrics = best_of(tracker.calculate_goal_metrics, repeat=20)
+        summary_ms, summary = best_of(tracker.get_achievement_counts, repeat=20)
+        line = f"  {2 * count:>8,} goals: columns {vectorized_ms:6.3f} ms | counts {summary_ms:6.3f} ms"
+        if count <= 1_000:
+            legacy_ms, legacy = best_of(legacy_goal_metrics, tracker, repeat=3)
+            assert_same(legacy, metrics, 'goal_metrics')
+            line += f" | per-goal {legacy_ms:8.1f} ms ({legacy_ms / vectorized_ms:5.0f}x)"
+        assert summary['total_goals'] == metrics['total_goals'] == 2 * count
+        print(line)
+
+
+def progress_export(n_goals, n_rows, seed=0):
+    """Nightly export rows of (goal_id, value, date) spread over the last 120 days"""
+    rng = np.random.default_rng(seed)
+    start = np.datetime64('today', 'us') - np.timedelta64(120, 'D')
+    return pd.DataFrame({
+        'goal_id': rng.integers(1, n_goals + 1, n_rows),
+        'value': rng.uniform(55.0, 85.0, n_rows).round(1),
+        'date': start + rng.integers(0, 120 * 24, n_rows) * np.timedelta64(1, 'h'),
+    })
+
+
+def benchmark_progress_ingest(n_students=1_000, n_rows=5_000):
+    """Nightly progress import: update_progress per row vs. one bulk ingest"""
+    import tempfile
+    print(f"\nprogress ingest ({2 * n_students:,} goals, {n_rows:,} updates)")
+    updates = progress_export(2 * n_students, n_rows)
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, make_store in [('memory', MemoryGoalStore),
+                                 ('sqlite', lambda: SQLiteGoalStore(os.path.join(tmp, f'goals_{len(os.listdir(tmp))}.db')))]:
+            legacy, bulk = GoalTracker(make_store()), GoalTracker(make_store())
+            seed_goals(legacy, n_students)
+            create_ms, _ = best_of(bulk.create_goals, pd.DataFrame({
+                'student_id': np.repeat(np.arange(1, n_students + 1), 2),
+                'goal_type': ['Exam Score', 'Attendance'] * n_students,
+                'current_value': [60.0, 61.0] * n_students, 'target_value': 80.0}), repeat=1)
+            legacy_ms, _ = best_of(lambda: [legacy.update_progress(row.goal_id, row.value, date=row.date.to_pydatetime())
+                                            for row in updates.itertuples()], repeat=1)
+            bulk_ms, result = best_of(bulk.ingest_progress, updates, repeat=1)
+            assert result['entries'] == n_rows and not result['missing']
+            for before, after in zip(legacy.goals, bulk.goals):
+                assert before['status'] == after['status'] and before['milestones'] == after['milestones']
+                assert [entry['value'] for entry in before['progress_history']] == \
+                    [entry['value'] for entry in after['progress_history']]
+            print(f"  {name:<6}: per row {legacy_ms:8.1f} ms | bulk {bulk_ms:7.1f} ms ({legacy_ms / bulk_ms:5.1f}x) | "
+                  f"bulk create {create_ms:6.1f} ms")
+
+
+def benchmark_goal_suggestions(scales=(1, 4)):
+    """Suggested goals for a whole roster: suggest_goals per student vs. one cohort-wide pass"""
+    print("\ngoal suggestions for every student")
+    for scale in scales:
+        df = DataManager.assign_student_ids(load_roster(scale))
+        ids = df['Student_ID'].tolist()
+        tracker = LegacyGoalTracker(MemoryGoalStore())
+        cohort_ms, suggestions = best_of(GoalTracker.suggest_goals_for_cohort, df, repeat=3)
+        legacy_ids = ids[::max(1, len(ids) // 2_000)]
+        legacy_ms, expected = best_of(lambda: [tracker.suggest_goals(df, i) for i in legacy_ids], repeat=1)
+        by_student = dict(iter(suggestions.groupby('student_id', sort=False)))
+        for student_id, student_expected in zip(legacy_ids, expected):
+            actual = by_student[student_id].rename(columns={'description': 'reason'}).drop(columns='student_id')
+            assert_same(student_expected, actual.to_dict('records'), 'goal_suggestions')
+        legacy_total = legacy_ms / len(legacy_ids) * len(ids)
+        print(f"  {len(df):>8,} students: per student {legacy_total:8.1f} ms (projected) | cohort {cohort_ms:6.1f} ms "
+              f"({legacy_total / cohort_ms:5.0f}x) | {len(suggestions):,} suggestions")
+
+
+def benchmark_progress_history(n_goals=500, days=(30, 180, 365)):
+    """Progress history per goal: a list of entry dicts vs. ProgressHistory arrays (+ compaction)"""
+    import tracemalloc
+    print(f"\nprogress history ({n_goals:,} goals, one update per day)")
+    start = datetime.now() - timedelta(days=max(days))
+    for n_days in days:
+        dates = [start + timedelta(days=i) for i in range(n_days)]
+        values = np.linspace(60.0, 85.0, n_days).round(1).tolist()
+
+        def legacy_histories():
+            return [[{'date': date.isoformat(), 'value': value, 'notes': ""} for date, value in zip(dates, values)]
+                    for _ in range(n_goals)]
+
+        def compact_histories():
+            histories = [ProgressHistory() for _ in range(n_goals)]
+            for date, value in zip(dates, values):
+                for history in histories:
+                    history.append(date, value, "")
+            return histories
+
+        sizes = {}
+        for name, build in [('dicts', legacy_histories), ('arrays', compact_histories)]:
+            tracemalloc.start()
+            histories = build()
+            sizes[name] = tracemalloc.get_traced_memory()[0] / n_goals
+            tracemalloc.stop()
+        assert [entry['value'] for entry in histories[0]] == values
+        append_ms, _ = best_of(lambda: [history.append(dates[-1], values[-1]) for history in histories], repeat=1)
+        window = (dates[-1] - timedelta(days=30), dates[-1])
+        legacy = legacy_histories()[:200]
+        low, high = (date.isoformat() for date in window)
+        legacy_range_ms, expected = best_of(lambda: [[e['value'] for e in h if low <= e['date'] < high]
+                                                     for h in legacy], repeat=3)
+        range_ms, actual = best_of(lambda: [h.range(*window)[1] for h in histories[:200]], repeat=3)
+        assert all(np.allclose(e, a) for e, a in zip(expected, actual))
+        removed = sum(history.compact(datetime.now() - timedelta(days=90)) for history in histories)
+        compacted = sum(history.nbytes for history in histories) / n_goals
+        print(f"  {n_days:>4} days: {sizes['dicts'] / 1024:6.1f} KiB/goal as dicts | "
+              f"{sizes['arrays'] / 1024:5.2f} KiB as arrays | {compacted / 1024:5.2f} KiB compacted "
+              f"({removed // n_goals} entries merged) | append {append_ms / n_goals * 1000:5.1f} us | "
+              f"30-day range {legacy_range_ms / 200:6.3f} -> {range_ms / 200:6.3f} ms")
+
+
+def legacy_export_goals_to_json(tracker, filename):
+    """Previous export_goals_to_json: the whole goal list in memory, then one json.dump(indent=2)"""
+    import json
+    export_data = []
+    for goal in tracker.goals:
+        goal_copy = goal.copy()
+        goal_copy['created_date'] = goal_copy['created_date'].isoformat()
+        goal_copy['target_date'] = goal_copy['target_date'].isoformat()
+        # Achievement and progress dates are already strings (the old code called .isoformat() on them and failed)
+        goal_copy['progress_history'] = list(goal_copy['progress_history'])
+        export_data.append(goal_copy)
+    with open(filename, 'w') as f:
+        json.dump(export_data, f, indent=2)
+    return filename
+
+
+def benchmark_goal_backup(n_students=25_000, n_updates=100_000):
+    """Goal store backup and restore: one json.dump of every goal vs. streamed JSON Lines / Parquet"""
+    import tempfile
+    import tracemalloc
+    from goal_export import GoalExporter
+    print(f"\ngoal backup ({2 * n_students:,} goals, {n_updates:,} progress updates, SQLite store)")
+    with tempfile.TemporaryDirectory() as tmp:
+        tracker = GoalTracker(SQLiteGoalStore(os.path.join(tmp, 'goals.db')))
+        seed_goals(tracker, n_students)
+        tracker.ingest_progress(progress_export(2 * n_students, n_updates))
+        expected = tracker.calculate_goal_metrics()
+
+        def peak_mb(func, *args):
+            tracemalloc.start()
+            func(*args)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            return peak / 1024 ** 2
+
+        legacy_path = os.path.join(tmp, 'goals.json')
+        legacy_ms, _ = best_of(legacy_export_goals_to_json, tracker, legacy_path, repeat=1)
+        legacy_mb = peak_mb(legacy_export_goals_to_json, tracker, legacy_path)
+        print(f"  json.dump : export {legacy_ms:8.1f} ms | peak {legacy_mb:6.1f} MiB | "
+              f"{os.path.getsize(legacy_path) / 1024 ** 2:6.1f} MiB file")
+        for format in ['jsonl', 'parquet']:
+            path = os.path.join(tmp, f'goals.{format}')
+            export_ms, count = best_of(GoalExporter.export_goals, tracker.store, path, repeat=1)
+            export_mb = peak_mb(GoalExporter.export_goals, tracker.store, path)
+            restored = GoalTracker(SQLiteGoalStore(os.path.join(tmp, f'restored_{format}.db')))
+            import_ms, _ = best_of(GoalExporter.import_goals, restored.store, path, repeat=1)
+            assert count == 2 * n_students and restored.calculate_goal_metrics() == expected
+            assert next(restored.store.iter_goals(50)) == next(tracker.store.iter_goals(50))
+            print(f"  {format:<10}: export {export_ms:8.1f} ms | peak {export_mb:6.1f} MiB | "
+                  f"{os.path.getsize(path) / 1024 ** 2:6.1f} MiB file | restore {import_ms:8.1f} ms")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("ENGAGEMETRICS - PERFORMANCE BENCHMARKS")
+    print("=" * 60)
+    benchmark_performance_insights()
+    benchmark_at_risk_students()
+    benchmark_correlations()
+    benchmark_filters()
+    benchmark_scatter()
+    benchmark_heatmap()
+    benchmark_chart_backends()
+    benchmark_chart_rendering()
+    benchmark_chart_payload()
+    benchmark_student_reports()
+    benchmark_student_lookup()
+    benchmark_report_export()
+    benchmark_goal_storage()
+    benchmark_goal_metrics()
+    benchmark_progress_ingest()
+    benchmark_goal_suggestions()
+    benchmark_progress_history()
+    benchmark_goal_backup()
+    print("\nAll results match the previous implementations.")
@@ -0,0 +1,158 @@
+"""
+Chart Cache
+Rendered chart bytes in a bounded in-memory tier, backed by an optional on-disk
+tier that every Streamlit worker process on the host can share
+"""
+
+import hashlib
+import os
+from data_manager import CACHE_DIR
+from result_cache import ResultCache
+
+CHART_CACHE_DIR = os.path.join(CACHE_DIR, "charts")
+MAX_DISK_BYTES = 256 * 1024 * 1024  # oldest charts are pruned beyond this
+PRUNE_TARGET = 0.9  # pruning frees space down to this fraction of the limit
+RESCAN_EVERY_WRITES = 128  # recount the tier after this many writes to pick up other workers' files
+
+
+class ChartCache:
+    """Two-tier cache of rendered PNG/SVG bytes keyed by chart, parameters, dataset and filter"""
+
+    def __init__(self, max_entries=256, ttl_seconds=None, disk_dir=None, max_disk_bytes=MAX_DISK_BYTES):
+        """
+        Args:
+            max_entries: Size of the in-memory tier
+            ttl_seconds: Lifetime of in-memory entries (None = never expire)
+            disk_dir: Directory for the shared on-disk tier (None = memory only)
+            max_disk_bytes: Size limit of the on-disk tier
+        """
+        self.memory = ResultCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.disk_hits = 0
+        self.disk_writes = 0
+        self.disk_scans = 0
+        self._disk_bytes = None  # size of the on-disk tier as of the last scan plus this process's writes
+        self._writes_since_scan = 0
+
+    @staticmethod
+    def make_key(chart, params, fingerprint, filter_key=(), fmt='png', dpi=100):
+        """
+        Cache key for one rendered chart
+
+        Args:
+            chart: Visualizations chart name (create_<chart>)
+            params: Chart arguments other than the frame, e.g. (args, kwargs)
+            fingerprint: Dataset version of the frame the chart is drawn from
+            filter_key: Normalized filter predicate from ResultCache.filter_key
+            fmt: Image format
+            dpi: Resolution
+        """
+        return (chart, repr(params), fingerprint, filter_key, fmt, dpi)
+
+    def disk_path(self, key):
+        """File holding the rendered bytes for key in the on-disk tier"""
+        digest = hashlib.sha256(repr(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.disk_dir, f"{digest}.{key[4]}")
+
+    def get(self, key):
+        """Rendered bytes for key from memory, then disk, or None on a miss"""
+        data = self.memory.get(key)
+        if data is not None or self.disk_dir is None:
+            return data
+        path = self.disk_path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            os.utime(path)  # pruning removes the least recently used files first
+        except OSError:
+            return None
+        self.disk_hits += 1
+        self.memory.set(key, data)
+        return data
+
+    def set(self, key, data):
+        """Store rendered bytes in memory and, if enabled, on disk"""
+        if data is None:
+            return
+        self.memory.set(key, data)
+        if self.disk_dir is None:
+            return
+        path = self.disk_path(key)
+        try:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            # Write to a temp file and rename so other workers never read a partial image
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            return
+        self.disk_writes += 1
+        self._writes_since_scan += 1
+        if self._disk_bytes is not None:
+            self._disk_bytes += len(data)
+        # Only scan the directory when the running total crosses the limit (or it is stale),
+        # so a write costs O(1) rather than a stat of every cached chart
+        if self._disk_bytes is None or self._disk_bytes > self.max_disk_bytes \
+                or self._writes_since_scan >= RESCAN_EVERY_WRITES:
+            self._prune_disk()
+
+    def get_or_render(self, key, render):
+        """Rendered bytes for key, calling render() and storing its result on a miss"""
+        data = self.get(key)
+        if data is None:
+            data = render()
+            self.set(key, data)
+        return data
+
+    def _prune_disk(self):
+        """
+        Recount the on-disk tier and, if it is over its size limit, remove the least recently
+        used chart files until it is down to PRUNE_TARGET of the limit
+        """
+        self._writes_since_scan = 0
+        self.disk_scans += 1
+        files = []
+        try:
+            with os.scandir(self.disk_dir) as entries:
+                for entry in entries:
+                    if entry.is_file() and not entry.name.endswith('.tmp'):
+                        stat = entry.stat()
+                        files.append((stat.st_mtime, stat.st_size, entry.path))
+        except OSError:
+            return
+        total = sum(size for _, size, _ in files)
+        if total > self.max_disk_bytes:
+            for _, size, path in sorted(files):
+                if total <= self.max_disk_bytes * PRUNE_TARGET:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError:
+                    pass
+        self._disk_bytes = total
+
+    def clear(self, disk=False):
+        """Drop the in-memory tier, and the on-disk tier too if disk=True"""
+        self.memory.clear()
+        self.disk_hits = 0
+        self.disk_writes = 0
+        self.disk_scans = 0
+        if disk and self.disk_dir is not None and os.path.isdir(self.disk_dir):
+            self._disk_bytes = None
+            for name in os.listdir(self.disk_dir):
+                try:
+                    os.remove(os.path.join(self.disk_dir, name))
+                except OSError:
+                    pass
+
+    def stats(self):
+        """In-memory counters plus on-disk hits, writes and directory scans"""
+        stats = self.memory.stats()
+        stats['disk_dir'] = self.disk_dir
+        stats['disk_hits'] = self.disk_hits
+        stats['disk_writes'] = self.disk_writes
+        stats['disk_scans'] = self.disk_scans
+        return stats
@@ -0,0 +1,199 @@
+"""
+Chart Renderer
+Renders Visualizations charts to image bytes in a pool of worker processes, so
+independent charts are drawn in parallel instead of one after another on the
+Streamlit script thread
+"""
+
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import numpy as np
+from data_manager import DataManager
+from visualizations import Visualizations
+
+# Agg rendering is CPU-bound and holds the GIL, so threads would not help; one
+# process per core, capped so a busy host keeps cores for other sessions
+MAX_WORKERS = min(4, os.cpu_count() or 1)
+
+# Processed dataset of this process, loaded by the first DatasetRows that needs it:
+# (filename, cache_dir, dataset version) -> frame, plus the most recent row selection
+# from it (the charts of one tab all draw the same rows)
+_dataset_frames = {}
+_selection = {}
+
+
+class DatasetRows:
+    """
+    Picklable stand-in for rows of the processed dataset
+
+    Only the dataset's location, version and a packed row bitmap are sent to a worker
+    (a few bytes per 8 students) instead of the pickled frame; each worker loads the
+    dataset from the columnar cache once and selects the rows itself.
+    """
+
+    def __init__(self, filename, cache_dir, version, mask=None):
+        """
+        Args:
+            filename, cache_dir: Source of DataManager.load_processed_data
+            version: Dataset version of the loaded frame (a new version is reloaded)
+            mask: Packed row bitmap from FilterIndex.mask (None = every row)
+        """
+        self.filename = filename
+        self.cache_dir = cache_dir
+        self.version = version
+        self.mask = mask
+
+    def frame(self):
+        """The selected rows, loading the dataset on first use in this process"""
+        key = (self.filename, self.cache_dir, self.version)
+        df = _dataset_frames.get(key)
+        if df is None:
+            df = DataManager.read_processed_data(self.filename, self.cache_dir)
+            _dataset_frames.clear()  # one dataset version per process
+            _dataset_frames[key] = df
+        if self.mask is None:
+            return df
+        selection_key = (key, self.mask.tobytes())
+        selected = _selection.get(selection_key)
+        if selected is None:
+            selected = df.take(np.flatnonzero(np.unpackbits(self.mask, count=len(df))))
+            _selection.clear()
+            _selection[selection_key] = selected
+        return selected
+
+
+def render_chart_bytes(chart, df, args, kwargs, fmt, dpi):
+    """Worker entry point: create_<chart>(df, *args, **kwargs) rendered to bytes"""
+    if isinstance(df, DatasetRows):
+        df = df.frame()
+    return Visualizations.render_chart(chart, df, *args, fmt=fmt, dpi=dpi, **kwargs)
+
+
+class ChartRenderer:
+    """Process pool shared by every session; renders inline when only one core is available"""
+
+    _executor = None
+    _lock = threading.Lock()
+    _in_flight = {}  # cache key -> Future of a render that has not finished yet
+    max_workers = MAX_WORKERS
+
+    @classmethod
+    def parallel(cls):
+        """Whether charts are rendered in worker processes"""
+        return cls.max_workers > 1
+
+    @classmethod
+    def executor(cls):
+        """The shared pool, started on first use"""
+        with cls._lock:
+            if cls._executor is None:
+                # spawn: forking the multi-threaded Streamlit server can deadlock the children
+                cls._executor = ProcessPoolExecutor(max_workers=cls.max_workers,
+                                                    mp_context=multiprocessing.get_context('spawn'))
+            return cls._executor
+
+    @classmethod
+    def submit(cls, chart, df, *args, fmt='png', dpi=100, **kwargs):
+        """
+        Start rendering a chart and return a Future of its image bytes
+
+        Args:
+            chart: Visualizations chart name (create_<chart>)
+            df: Frame to draw from (pickled to the worker), or DatasetRows
+            *args, **kwargs: Chart arguments after the frame
+            fmt: 'png' or 'svg'
+            dpi: Resolution for raster formats
+        """
+        if cls.parallel():
+            try:
+                return cls.executor().submit(render_chart_bytes, chart, df, args, kwargs, fmt, dpi)
+            except BrokenProcessPool:
+                # A worker died (e.g. killed for memory); start a fresh pool next time
+                cls.shutdown()
+        future = Future()
+        try:
+            future.set_result(render_chart_bytes(chart, df, args, kwargs, fmt, dpi))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    @classmethod
+    def render_many(cls, requests, fmt='png', dpi=100):
+        """
+        Render several charts concurrently
+
+        Args:
+            requests: List of (chart, df, args, kwargs) tuples
+
+        Returns:
+            List of image bytes in the same order as requests
+        """
+        futures = [cls.submit(chart, df, *args, fmt=fmt, dpi=dpi, **kwargs)
+                   for chart, df, args, kwargs in requests]
+        return [future.result() for future in futures]
+
+    @classmethod
+    def render_cached(cls, cache, requests, frame, fmt='png', dpi=100, wait=True, rows=None):
+        """
+        Rendered bytes for several charts, serving cache hits and rendering the misses concurrently
+
+        A chart already being rendered for another session is awaited rather than drawn twice.
+
+        Args:
+            cache: ChartCache the results are read from and stored in (None = always render)
+            requests: dict of name -> (cache key, chart, args)
+            frame: Zero-argument callable returning the frame; only called if a chart is drawn
+            wait: False starts the misses in the background and leaves them out of the result
+                  (ignored without worker processes, where misses would block anyway)
+            rows: DatasetRows for the same rows as frame(); sent to the workers in its place,
+                  so the frame is never pickled
+
+        Returns:
+            dict of name -> image bytes
+        """
+        results = {}
+        futures = {}
+        for name, (key, chart, args) in requests.items():
+            data = cache.get(key) if cache is not None else None
+            if data is not None:
+                results[name] = data
+                continue
+            if not wait and not cls.parallel():
+                continue
+            with cls._lock:
+                future = cls._in_flight.get(key) if cache is not None else None
+            if future is None:
+                source = rows if rows is not None and cls.parallel() else frame()
+                future = cls.submit(chart, source, *args, fmt=fmt, dpi=dpi)
+                if cache is not None:
+                    with cls._lock:
+                        cls._in_flight[key] = future
+                    future.add_done_callback(lambda done, key=key: cls._store(cache, key, done))
+            futures[name] = future
+        if wait:
+            for name, future in futures.items():
+                results[name] = future.result()
+        return results
+
+    @classmethod
+    def _store(cls, cache, key, future):
+        """Done callback: move a finished render from the in-flight table into the cache"""
+        with cls._lock:
+            cls._in_flight.pop(key, None)
+        if not future.cancelled() and future.exception() is None:
+            cache.set(key, future.result())
+
+    @classmethod
+    def shutdown(cls):
+        """Stop the worker processes"""
+        with cls._lock:
+            executor, cls._executor = cls._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+atexit.register(ChartRenderer.shutdown)
@@ -0,0 +1,160 @@
+"""
+Class Statistics Snapshot
+Per-field means, spreads, medians, sorted values and histograms of a class,
+built once per (dataset version, selected rows) and shared read-only by
+StudentProfile, GoalTracker and Analytics
+"""
+
+from types import MappingProxyType
+import pandas as pd
+import numpy as np
+from correlation_service import CorrelationService
+from result_cache import ResultCache
+
+# Numeric fields individual students are compared to their class on
+CLASS_STAT_FIELDS = ['Exam_Score', 'Attendance', 'Hours_Studied', 'Sleep_Hours']
+HISTOGRAM_BINS = 20
+
+
+class FieldStats:
+    """
+    Immutable summary of one numeric column
+
+    Every statistic is a linear pass except the sorted values, which are only sorted the
+    first time a batch of percentiles needs them; a single percentile is a linear count,
+    so a snapshot used for one student costs O(N) rather than a sort.
+    """
+
+    __slots__ = ('mean', 'std', 'median', 'present', '_sorted', 'histogram', 'bin_edges', 'rows')
+
+    def __init__(self, values):
+        """
+        Args:
+            values: Series with the column for every student in the class
+        """
+        present = values.dropna().to_numpy(dtype=np.float64)
+        if len(present):
+            histogram, bin_edges = np.histogram(present, bins=HISTOGRAM_BINS)
+        else:
+            histogram, bin_edges = np.zeros(HISTOGRAM_BINS, dtype=np.int64), np.zeros(HISTOGRAM_BINS + 1)
+        for array in (present, histogram, bin_edges):
+            array.setflags(write=False)
+        # Same pandas reductions the per-student code used, so reports are unchanged
+        for name, value in [('mean', values.mean()), ('std', values.std()), ('median', values.median()),
+                            ('present', present), ('_sorted', None), ('histogram', histogram),
+                            ('bin_edges', bin_edges), ('rows', len(values))]:
+            object.__setattr__(self, name, value)
+
+    @property
+    def sorted(self):
+        """Present values in ascending order (sorted on first use, then kept)"""
+        if self._sorted is None:
+            ordered = np.sort(self.present)
+            ordered.setflags(write=False)
+            object.__setattr__(self, '_sorted', ordered)
+        return self._sorted
+
+    def __setattr__(self, name, value):
+        raise AttributeError("FieldStats is read-only")
+
+    def __getstate__(self):
+        # Workers only look up percentiles, so ship the sorted values and not the unsorted copy
+        state = {name: getattr(self, name) for name in self.__slots__ if name not in ('present', '_sorted')}
+        state['_sorted'] = self.sorted
+        return state
+
+    def __setstate__(self, state):
+        # Unpickled in worker processes: bypass the read-only __setattr__ and re-freeze the arrays
+        for name, value in state.items():
+            if isinstance(value, np.ndarray):
+                value.setflags(write=False)
+            object.__setattr__(self, name, value)
+        object.__setattr__(self, 'present', self._sorted)  # the same values, already in order
+
+    def percentile(self, values):
+        """
+        Percentage of the class strictly below each value, by binary search over the sorted values
+        (a single value before anything was sorted is counted directly)
+
+        Args:
+            values: Scalar or array of values
+
+        Returns:
+            float for a scalar, array otherwise; missing values rank at 0
+        """
+        if np.ndim(values) == 0 and self._sorted is None:
+            below = 0 if pd.isna(values) else np.count_nonzero(self.present < values)
+            return float(below / self.rows * 100)
+        below = np.searchsorted(self.sorted, values, side='left')
+        below = np.where(pd.isna(values), 0, below)
+        percentile = below / self.rows * 100
+        return float(percentile) if np.ndim(percentile) == 0 else percentile
+
+
+class ClassStats:
+    """Read-only snapshot of FieldStats for each comparison field of a class"""
+
+    _cache = ResultCache(max_entries=32)
+
+    def __init__(self, df, fields=None):
+        """
+        Args:
+            df: DataFrame with every student in the class
+            fields: Numeric fields to summarize (default CLASS_STAT_FIELDS)
+        """
+        stats = {}
+        for field in fields or CLASS_STAT_FIELDS:
+            if field in df.columns and pd.api.types.is_numeric_dtype(df[field]):
+                stats[field] = FieldStats(df[field])
+        object.__setattr__(self, 'fields', MappingProxyType(stats))
+        object.__setattr__(self, 'rows', len(df))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ClassStats is read-only")
+
+    def __getstate__(self):
+        return {'fields': dict(self.fields), 'rows': self.rows}
+
+    def __setstate__(self, state):
+        object.__setattr__(self, 'fields', MappingProxyType(state['fields']))
+        object.__setattr__(self, 'rows', state['rows'])
+
+    def __getitem__(self, field):
+        return self.fields[field]
+
+    def __contains__(self, field):
+        return field in self.fields
+
+    def items(self):
+        return self.fields.items()
+
+    def means(self):
+        """Mean of every summarized field, as a dict"""
+        return {field: stats.mean for field, stats in self.fields.items()}
+
+    @classmethod
+    def for_frame(cls, df, fields=None):
+        """
+        Shared snapshot for df
+
+        Frames carrying df.attrs['dataset_version'] are summarized once per version and
+        selected rows, with every field sorted up front since the snapshot serves many
+        lookups; other frames get a fresh snapshot that only sorts if a batch of
+        percentiles needs it, so one profile of such a frame stays a linear pass.
+        """
+        fields = tuple(fields or CLASS_STAT_FIELDS)
+        if df.attrs.get('dataset_version') is None:
+            return cls(df, fields)
+        key = CorrelationService.frame_key(df, list(fields))
+        return cls._cache.get_or_compute(key, lambda: cls(df, fields).presorted())
+
+    def presorted(self):
+        """Sort every field now (for shared snapshots), returning self"""
+        for stats in self.fields.values():
+            stats.sorted
+        return self
+
+    @classmethod
+    def clear(cls):
+        """Drop every cached snapshot"""
+        cls._cache.clear()
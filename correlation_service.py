@@ -0,0 +1,138 @@
+"""
+Shared Correlation Service
+Computes the numeric correlation matrix once per (dataset version, filter) and
+serves it to Analytics, Visualizations and the AI assistants
+"""
+
+import hashlib
+import weakref
+import pandas as pd
+import numpy as np
+from result_cache import ResultCache
+
+# Student identifier: numeric, but never a feature to correlate or summarize
+ID_COLUMN = 'Student_ID'
+
+
+class CorrelationService:
+    """LRU-cached correlation matrices keyed by dataset version and selected rows"""
+
+    _cache = ResultCache(max_entries=32)
+    _fingerprints = {}  # id(frame) -> {columns: digest}, dropped when the frame is collected
+
+    @staticmethod
+    def numeric_columns(df):
+        """Numeric columns, matching select_dtypes(include=[np.number]) without the student identifier"""
+        return [col for col, dtype in df.dtypes.items()
+                if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+                and col != ID_COLUMN]
+
+    @staticmethod
+    def frame_key(df, columns):
+        """
+        Cache key for the correlation matrix of df[columns]
+
+        Frames produced by DataManager carry df.attrs['dataset_version'], which pandas keeps
+        on filtered copies. For those, the selected row labels identify the filter, so the
+        key is the version plus a digest of the index. pandas also keeps the attrs on derived
+        frames whose values changed (df.assign, normalized or imputed columns), so the key
+        includes a cheap fingerprint of the selected columns too. Other frames are keyed by
+        a hash of their numeric contents.
+        """
+        version = df.attrs.get('dataset_version')
+        if version is not None:
+            index = df.index
+            if isinstance(index, pd.RangeIndex):
+                rows = (index.start, index.stop, index.step)
+            elif pd.api.types.is_integer_dtype(index.dtype):
+                rows = hashlib.blake2b(np.ascontiguousarray(index.to_numpy()).tobytes(), digest_size=16).hexdigest()
+            else:
+                rows = int(pd.util.hash_pandas_object(index.to_series(), index=False).sum())
+            return (version, len(df), rows, tuple(columns), CorrelationService.fingerprint(df, columns))
+
+        content = pd.util.hash_pandas_object(df[columns], index=False).to_numpy()
+        digest = hashlib.blake2b(content.tobytes(), digest_size=16).hexdigest()
+        return ('content', len(df), digest, tuple(columns))
+
+    @classmethod
+    def fingerprint(cls, df, columns):
+        """
+        Digest of the values of df[columns], computed once per frame object and columns
+
+        Frames are treated as read-only once keyed, so a frame's digest is kept until the
+        frame itself is garbage collected; derived frames are new objects and get their own.
+        """
+        columns = tuple(columns)
+        per_frame = cls._fingerprints.get(id(df))
+        if per_frame is None:
+            per_frame = cls._fingerprints[id(df)] = {}
+            weakref.finalize(df, cls._fingerprints.pop, id(df), None)
+        if columns not in per_frame:
+            per_frame[columns] = cls.content_digest(df, columns)
+        return per_frame[columns]
+
+    @staticmethod
+    def content_digest(df, columns):
+        """
+        Per column, the sum and count of the present values (category codes for
+        categoricals, value hashes for other dtypes): one vectorized pass per column
+        """
+        digest = []
+        for col in columns:
+            if col not in df.columns:
+                continue
+            series = df[col]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                values = series.cat.codes.to_numpy().astype(np.float64)
+            elif pd.api.types.is_numeric_dtype(series.dtype):
+                values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+            else:
+                values = pd.util.hash_pandas_object(series, index=False).to_numpy().astype(np.float64)
+            present = ~np.isnan(values)
+            digest.append((col, float(values[present].sum()), int(present.sum())))
+        return tuple(digest)
+
+    @staticmethod
+    def compute_matrix(df, columns):
+        """Full Pearson correlation matrix, like DataFrame.corr()"""
+        values = df[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        if len(columns) == 0 or np.isnan(values).any() or len(values) < 2:
+            # Pairwise-complete observations are needed; pandas handles the masking
+            return df[columns].corr()
+        with np.errstate(invalid='ignore', divide='ignore'):
+            matrix = np.corrcoef(values, rowvar=False)
+        matrix = np.clip(np.atleast_2d(matrix), -1.0, 1.0)
+        return pd.DataFrame(matrix, index=columns, columns=columns)
+
+    @classmethod
+    def matrix(cls, df):
+        """Correlation matrix of the numeric columns of df (shared; do not modify)"""
+        columns = cls.numeric_columns(df)
+        key = cls.frame_key(df, columns)
+        return cls._cache.get_or_compute(key, lambda: cls.compute_matrix(df, columns))
+
+    @classmethod
+    def with_target(cls, df, target='Exam_Score'):
+        """Correlation of every numeric column with the target column, as a Series"""
+        matrix = cls.matrix(df)
+        if target not in matrix.columns:
+            return pd.Series(dtype=np.float64)
+        return matrix[target]
+
+    @classmethod
+    def pair(cls, df, col_a, col_b):
+        """Correlation between two numeric columns"""
+        matrix = cls.matrix(df)
+        if col_a not in matrix.columns or col_b not in matrix.columns:
+            return np.nan
+        return matrix.at[col_a, col_b]
+
+    @classmethod
+    def clear(cls):
+        """Drop every cached matrix and reset the counters"""
+        cls._cache.clear()
+
+    @classmethod
+    def stats(cls):
+        """Cache size and hit/miss counters"""
+        return cls._cache.stats()
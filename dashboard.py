@@ -1,3 +1,6 @@
+import io
+import os
+import tempfile
 import streamlit as st
 import pandas as pd
 import numpy as np
@@ -6,7 +9,47 @@ from visualizations import Visualizations
 from analytics import Analytics
 from ai_assistant_educational import EducationalAIAssistant
 from student_profile import StudentProfile
+from goal_export import GoalExporter
 from goal_tracker import GoalTracker
+from progress_history import HISTORY_KEEP_DAYS
+from result_cache import ResultCache
+from chart_cache import ChartCache, CHART_CACHE_DIR
+from chart_renderer import ChartRenderer, DatasetRows
+from plotly_charts import PlotlyVisualizations
+from report_export import ReportExporter
+
+# Overview results shared by every session in this process, keyed by
+# (result name, dataset version, normalized filter predicate)
+OVERVIEW_CACHE = ResultCache(max_entries=512, ttl_seconds=15 * 60)
+
+# Rendered overview charts; the on-disk tier is shared by every worker process
+CHART_CACHE = ChartCache(max_entries=256, disk_dir=CHART_CACHE_DIR)
+
+# Overview charts by tab: chart name -> (Visualizations chart, arguments after the frame)
+OVERVIEW_CHARTS = {
+    "Distribution Charts": {
+        'involvement': ('donut_chart', ('Parental_Involvement', 'Parental Involvement Distribution')),
+        'performance': ('histogram_chart', ('Performance_Category', 'Academic Performance Distribution')),
+        'exam_score': ('histogram_chart', ('Exam_Score', 'Distribution of Exam Scores')),
+        'attendance': ('histogram_chart', ('Attendance', 'Distribution of Attendance')),
+    },
+    "Correlation Analysis": {
+        'heatmap': ('correlation_heatmap', ()),
+        'factor_importance': ('factor_importance_chart', ()),
+        'study_hours': ('scatter_plot', ('Hours_Studied', 'Exam_Score', None, 'Study Hours vs Exam Score')),
+    },
+    "Performance Breakdown": {
+        'by_involvement': ('bar_chart_scores_by_involvement', ()),
+        'by_education': ('bar_chart_scores_by_education', ()),
+        'box_plot': ('box_plot', ('Parental_Involvement', 'Exam_Score', 'Exam Scores by Parental Involvement')),
+        'violin_plot': ('violin_plot', ('Performance_Category', 'Exam_Score', 'Score Distribution by Performance Category')),
+    },
+    "Advanced Analytics": {
+        'multi_factor': ('multi_factor_chart', ()),
+        'involvement_heatmap': ('parental_involvement_heatmap', ()),
+        'attendance_heatmap': ('attendance_performance_heatmap', ()),
+    },
+}
 
 
 class StudentDashboard:
@@ -23,6 +66,8 @@ class StudentDashboard:
             st.session_state.intelligent_mode = False
         
         self.intelligent_dashboard = None
+        self.dataset_version = None
+        self.chart_backend = 'matplotlib'
 
     def run(self):
         """Main dashboard application"""
@@ -48,31 +93,30 @@ class StudentDashboard:
         if df is None or df.empty:
             st.error("Failed to load data. Please check your data file.")
             return
+        self.dataset_version = df.attrs.get('dataset_version')
         
-        df_clean = self.clean_dataframe(df)
-
         # PAGE 1: Overview & Analytics
         if page == "📈 Overview & Analytics":
-            self.render_overview_page(df_clean)
+            self.render_overview_page(df)
         
         # PAGE 2: Student Profiles
         elif page == "👤 Student Profiles":
-            self.render_student_profiles_page(df_clean)
+            self.render_student_profiles_page(df)
         
         # PAGE 3: Goal Tracking
         elif page == "🎯 Goal Tracking":
-            self.render_goal_tracking_page(df_clean)
+            self.render_goal_tracking_page(df)
         
         # PAGE 4: AI Assistant
         elif page == "💬 AI Assistant":
-            self.render_ai_assistant_page(df_clean)
+            self.render_ai_assistant_page(df)
 
     def render_overview_page(self, df):
         """Render the main overview and analytics page"""
         st.header("📊 Performance Overview")
         
         # Get comprehensive insights
-        insights = self.analytics.get_performance_insights(df)
+        insights = self.memoized('insights', (), lambda: self.analytics.get_performance_insights(df))
         
         # Top metrics row
         col1, col2, col3, col4 = st.columns(4)
@@ -86,9 +130,7 @@ class StudentDashboard:
             st.metric("Avg Attendance", f"{insights.get('avg_attendance', 0):.1f}%")
         
         # Expanded metrics
-        at_risk_df = self.analytics.predict_at_risk_students(df)
-        high_risk = len(at_risk_df[at_risk_df['Risk_Level'] == 'High']) if not at_risk_df.empty else 0
-        medium_risk = len(at_risk_df[at_risk_df['Risk_Level'] == 'Medium']) if not at_risk_df.empty else 0
+        high_risk, medium_risk = self.memoized('risk_counts', (), lambda: self.risk_counts(df))
         
         col1, col2, col3, col4 = st.columns(4)
         with col1:
@@ -102,23 +144,20 @@ class StudentDashboard:
 
         # Interactive Filters
         st.sidebar.header("🔍 Interactive Filters")
-        involvement_options = ['All'] + sorted(list(df['Parental_Involvement'].unique()))
-        selected_involvement = st.sidebar.selectbox("Filter by Parental Involvement:", involvement_options)
+        filter_index = self.data_manager.get_filter_index()
+        filters = {}
+        involvement_options = ['All'] + filter_index.options('Parental_Involvement')
+        filters['Parental_Involvement'] = st.sidebar.selectbox("Filter by Parental Involvement:", involvement_options)
 
         if 'Gender' in df.columns:
-            gender_options = ['All'] + sorted(list(df['Gender'].unique()))
-            selected_gender = st.sidebar.selectbox("Filter by Gender:", gender_options)
-        else:
-            selected_gender = 'All'
+            gender_options = ['All'] + filter_index.options('Gender')
+            filters['Gender'] = st.sidebar.selectbox("Filter by Gender:", gender_options)
 
-        # Apply filters
-        filtered_df = df.copy()
-        if selected_involvement != 'All':
-            filtered_df = filtered_df[filtered_df['Parental_Involvement'] == selected_involvement]
-        if selected_gender != 'All' and 'Gender' in df.columns:
-            filtered_df = filtered_df[filtered_df['Gender'] == selected_gender]
+        # Apply filters: bitmap AND over the index; rows are only copied on a cache miss
+        view = filter_index.view(df, filters)
+        filter_key = ResultCache.filter_key(filters)
 
-        st.info(f"Showing {len(filtered_df):,} students (filtered from {len(df):,} total)")
+        st.info(f"Showing {len(view):,} students (filtered from {len(df):,} total)")
 
         # Key Insights Section
         st.header("🔍 Key Insights")
@@ -126,15 +165,15 @@ class StudentDashboard:
         
         with col1:
             st.subheader("Strongest Performance Predictors")
-            predictors = self.analytics._identify_strongest_predictors(filtered_df)
-            for i, (factor, corr) in enumerate(predictors, 1):
-                st.write(f"{i}. **{factor}**: {corr:.3f} correlation")
+            predictors = self.memoized('predictors', filter_key,
+                                       lambda: self.analytics._identify_strongest_predictors(view.frame))
+            for i, predictor in enumerate(predictors, 1):
+                st.write(f"{i}. **{predictor['factor']}**: {predictor['correlation']:.3f} correlation")
         
         with col2:
             st.subheader("At-Risk Student Analysis")
-            at_risk = self.analytics.predict_at_risk_students(filtered_df)
-            high_risk = len(at_risk[at_risk['Risk_Level'] == 'High']) if not at_risk.empty else 0
-            medium_risk = len(at_risk[at_risk['Risk_Level'] == 'Medium']) if not at_risk.empty else 0
+            high_risk, medium_risk = self.memoized('risk_counts', filter_key,
+                                                   lambda: self.risk_counts(view.frame))
             st.write(f"**High Risk:** {high_risk} students")
             st.write(f"**Medium Risk:** {medium_risk} students")
             if high_risk > 0:
@@ -144,7 +183,8 @@ class StudentDashboard:
         st.header("💡 Intervention Impact Calculator")
         st.markdown("**Estimate the potential impact of targeted interventions**")
         
-        interventions = self.analytics.calculate_intervention_impact(filtered_df)
+        interventions = self.memoized('interventions', filter_key,
+                                      lambda: self.analytics.calculate_intervention_impact(view.frame))
         
         col1, col2, col3 = st.columns(3)
         
@@ -184,56 +224,51 @@ class StudentDashboard:
         # Visualizations
         st.header("📊 Data Visualizations")
         
-        viz_tabs = st.tabs([
-            "Distribution Charts", 
-            "Correlation Analysis", 
-            "Performance Breakdown",
-            "Advanced Analytics"
-        ])
+        # Interactive charts are drawn by the browser; static charts are rasterized here.
+        # Opt-in: the matplotlib charts stay the default view
+        interactive = st.sidebar.toggle("Interactive charts", value=False,
+                                        disabled=not PlotlyVisualizations.available())
+        self.chart_backend = 'plotly' if interactive else 'matplotlib'
+
+        # Only the selected tab's charts are needed for this rerun; the other tabs are
+        # rendered in the background so switching to them hits the chart cache
+        selected_tab = st.radio("Chart view:", list(OVERVIEW_CHARTS), horizontal=True)
+        charts = self.render_charts(selected_tab, filter_key, view)
+        for tab in OVERVIEW_CHARTS:
+            if tab != selected_tab:
+                self.render_charts(tab, filter_key, view, wait=False)
         
         # Tab 1: Distribution Charts
-        with viz_tabs[0]:
+        if selected_tab == "Distribution Charts":
             col1, col2 = st.columns(2)
             
             with col1:
                 st.subheader("Parental Involvement Distribution")
-                fig1 = self.visualizations.create_donut_chart(
-                    filtered_df, 'Parental_Involvement', 'Parental Involvement Distribution'
-                )
-                st.pyplot(fig1)
+                self.show_chart(charts['involvement'])
             
             with col2:
                 st.subheader("Performance Distribution")
-                fig2 = self.visualizations.create_histogram_chart(
-                    filtered_df, 'Performance_Category', 'Academic Performance Distribution'
-                )
-                st.pyplot(fig2)
+                self.show_chart(charts['performance'])
             
             col1, col2 = st.columns(2)
             
             with col1:
                 st.subheader("Exam Score Distribution")
-                fig3 = self.visualizations.create_histogram_chart(
-                    filtered_df, 'Exam_Score', 'Distribution of Exam Scores'
-                )
-                st.pyplot(fig3)
+                self.show_chart(charts['exam_score'])
             
             with col2:
                 st.subheader("Attendance Distribution")
-                fig4 = self.visualizations.create_histogram_chart(
-                    filtered_df, 'Attendance', 'Distribution of Attendance'
-                )
-                st.pyplot(fig4)
+                self.show_chart(charts['attendance'])
         
         # Tab 2: Correlation Analysis
-        with viz_tabs[1]:
+        if selected_tab == "Correlation Analysis":
             col1, col2 = st.columns(2)
             
             with col1:
                 st.subheader("Correlation Heatmap")
-                fig5 = self.visualizations.create_correlation_heatmap(filtered_df)
-                if fig5:
-                    st.pyplot(fig5)
+                chart5 = charts['heatmap']
+                if chart5:
+                    self.show_chart(chart5)
                     st.markdown("""
                     **Interpretation:** Darker colors indicate stronger relationships. 
                     Look for high correlations with Exam_Score to identify key success factors.
@@ -241,63 +276,52 @@ class StudentDashboard:
             
             with col2:
                 st.subheader("Factor Importance")
-                fig6 = self.visualizations.create_factor_importance_chart(filtered_df)
-                if fig6:
-                    st.pyplot(fig6)
+                chart6 = charts['factor_importance']
+                if chart6:
+                    self.show_chart(chart6)
                     st.markdown("""
                     **Key Insight:** This chart ranks factors by their correlation with exam scores.
                     Focus interventions on the top factors for maximum impact.
                     """)
             
             st.subheader("Scatter Plot: Study Hours vs Exam Score")
-            if 'Hours_Studied' in filtered_df.columns:
-                fig7 = self.visualizations.create_scatter_plot(
-                    filtered_df, 'Hours_Studied', 'Exam_Score', 
-                    'Study Hours vs Exam Score'
-                )
-                if fig7:
-                    st.pyplot(fig7)
+            if 'study_hours' in charts:
+                chart7 = charts['study_hours']
+                if chart7:
+                    self.show_chart(chart7)
         
         # Tab 3: Performance Breakdown
-        with viz_tabs[2]:
+        if selected_tab == "Performance Breakdown":
             col1, col2 = st.columns(2)
             
             with col1:
                 st.subheader("Scores by Parental Involvement")
-                fig8 = self.visualizations.create_bar_chart_scores_by_involvement(filtered_df)
-                st.pyplot(fig8)
+                self.show_chart(charts['by_involvement'])
             
             with col2:
                 st.subheader("Scores by Parental Education")
-                fig9 = self.visualizations.create_bar_chart_scores_by_education(filtered_df)
-                st.pyplot(fig9)
+                self.show_chart(charts['by_education'])
             
             col1, col2 = st.columns(2)
             
             with col1:
                 st.subheader("Performance Box Plot")
-                fig10 = self.visualizations.create_box_plot(
-                    filtered_df, 'Parental_Involvement', 'Exam_Score',
-                    'Exam Scores by Parental Involvement'
-                )
-                if fig10:
-                    st.pyplot(fig10)
+                chart10 = charts['box_plot']
+                if chart10:
+                    self.show_chart(chart10)
             
             with col2:
                 st.subheader("Performance Violin Plot")
-                fig11 = self.visualizations.create_violin_plot(
-                    filtered_df, 'Performance_Category', 'Exam_Score',
-                    'Score Distribution by Performance Category'
-                )
-                if fig11:
-                    st.pyplot(fig11)
+                chart11 = charts['violin_plot']
+                if chart11:
+                    self.show_chart(chart11)
         
         # Tab 4: Advanced Analytics
-        with viz_tabs[3]:
+        if selected_tab == "Advanced Analytics":
             st.subheader("Multi-Factor Analysis")
-            fig12 = self.visualizations.create_multi_factor_chart(filtered_df)
-            if fig12:
-                st.pyplot(fig12)
+            chart12 = charts['multi_factor']
+            if chart12:
+                self.show_chart(chart12)
                 st.markdown("""
                 **Comprehensive View:** This 4-panel chart shows the interplay between 
                 key factors: parental involvement, attendance, study hours, and exam scores.
@@ -307,18 +331,18 @@ class StudentDashboard:
             
             with col1:
                 st.subheader("Parental Involvement Heatmap")
-                fig13 = self.visualizations.create_parental_involvement_heatmap(filtered_df)
-                st.pyplot(fig13)
+                self.show_chart(charts['involvement_heatmap'])
             
             with col2:
                 st.subheader("Attendance Performance Heatmap")
-                fig14 = self.visualizations.create_attendance_performance_heatmap(filtered_df)
-                if fig14:
-                    st.pyplot(fig14)
+                chart14 = charts['attendance_heatmap']
+                if chart14:
+                    self.show_chart(chart14)
 
         # Recommendations Section
         st.header("💡 Actionable Recommendations")
-        recommendations = self.analytics.generate_recommendations(filtered_df)
+        recommendations = self.memoized('recommendations', filter_key,
+                                        lambda: self.analytics.generate_recommendations(view.frame))
         
         rec_tabs = st.tabs(["👨‍👩‍👧 Parents", "👨‍🏫 Educators", "🏛️ Administrators", "👨‍🎓 Students"])
         
@@ -382,11 +406,87 @@ class StudentDashboard:
         st.header("📥 Export Data")
         st.download_button(
             label="Download Filtered Dataset (CSV)",
-            data=filtered_df.to_csv(index=False).encode('utf-8'),
+            data=view.frame.to_csv(index=False).encode('utf-8'),
             file_name='student_performance_export.csv',
             mime='text/csv',
         )
 
+    def memoized(self, name, filter_key, compute):
+        """
+        Serve an overview result from the shared cache, computing it on a miss
+
+        Args:
+            name: Name of the result
+            filter_key: Normalized filter predicate from ResultCache.filter_key
+            compute: Zero-argument callable producing the result
+        """
+        if self.dataset_version is None:
+            return compute()
+        return OVERVIEW_CACHE.get_or_compute((name, self.dataset_version, filter_key), compute)
+
+    def render_charts(self, tab, filter_key, view, wait=True):
+        """
+        Rendered charts of one overview tab, for show_chart
+
+        Cached charts come from the chart cache. With the matplotlib backend the rest are
+        drawn concurrently by the rendering pool; plotly figures are only serialized to
+        JSON, which is cheap enough to do inline.
+
+        Args:
+            tab: Key of OVERVIEW_CHARTS
+            filter_key: Normalized filter predicate from ResultCache.filter_key
+            view: FilteredView of the data; only materialized if a chart has to be drawn
+            wait: False starts the misses in the background and returns without them
+
+        Returns:
+            dict of chart name -> PNG or plotly JSON bytes (None if the chart has nothing to show)
+        """
+        fmt = 'json' if self.chart_backend == 'plotly' else 'png'
+        requests = {}
+        for name, (chart, args) in OVERVIEW_CHARTS[tab].items():
+            if name == 'study_hours' and 'Hours_Studied' not in view.columns:
+                continue
+            key = ChartCache.make_key(chart, (args, {}), self.dataset_version, filter_key, fmt=fmt) \
+                if self.dataset_version is not None else None
+            requests[name] = (key, chart, args)
+        cache = CHART_CACHE if self.dataset_version is not None else None
+
+        if self.chart_backend == 'plotly':
+            if not wait:
+                return {}
+            charts = {}
+            for name, (key, chart, args) in requests.items():
+                def render(chart=chart, args=args):
+                    return PlotlyVisualizations.render_chart(chart, view.frame, *args)
+                charts[name] = cache.get_or_render(key, render) if cache is not None else render()
+            return charts
+        # Workers load the dataset themselves and only receive the filter's row bitmap
+        rows = DatasetRows(self.data_manager.filename, self.data_manager.cache_dir, self.dataset_version,
+                           view.mask) if self.dataset_version is not None else None
+        return ChartRenderer.render_cached(cache, requests, lambda: view.frame, wait=wait, rows=rows)
+
+    def show_chart(self, chart):
+        """Display bytes from render_charts with the active backend"""
+        if chart is None:
+            return
+        if self.chart_backend == 'plotly':
+            st.plotly_chart(PlotlyVisualizations.load(chart), use_container_width=True)
+        else:
+            st.image(chart, use_container_width=True)
+
+    def at_risk_ids(self, df):
+        """Student IDs of the at-risk cohort, computed once per dataset version"""
+        return self.memoized('at_risk_ids', (),
+                             lambda: self.analytics.predict_at_risk_students(df)['Student_ID'].tolist())
+
+    def risk_counts(self, df):
+        """Number of high and medium risk students"""
+        at_risk = self.analytics.predict_at_risk_students(df)
+        if at_risk.empty:
+            return 0, 0
+        levels = at_risk['Risk_Level'].value_counts()
+        return int(levels.get('High', 0)), int(levels.get('Medium', 0))
+
     def render_student_profiles_page(self, df):
         """Render the student profiles page"""
         st.header("👤 Individual Student Profiles")
@@ -398,15 +498,9 @@ class StudentDashboard:
         - 30/60/90 day action plan
         """)
 
-        # Student selection
-        if 'Student_ID' in df.columns:
-            student_ids = sorted(df['Student_ID'].unique())
-            selected_student = st.selectbox("Select Student ID:", student_ids)
-        else:
-            # Create synthetic IDs if not available
-            df['Student_ID'] = range(1, len(df) + 1)
-            student_ids = list(df['Student_ID'].unique())
-            selected_student = st.selectbox("Select Student (Row Number):", student_ids)
+        # Student selection (IDs are assigned when the dataset is loaded)
+        student_ids = self.data_manager.get_student_index().ids
+        selected_student = st.selectbox("Select Student ID:", student_ids)
         
         if st.button("Generate Comprehensive Profile", type="primary"):
             with st.spinner("Generating comprehensive student profile..."):
@@ -490,7 +584,7 @@ class StudentDashboard:
                     
                     # Printable Summary
                     st.subheader("📄 Printable Summary")
-                    summary = self.student_profile.generate_printable_summary(df, selected_student)
+                    summary = self.student_profile.generate_printable_summary(df, selected_student, report)
                     st.text_area("Parent-Friendly Report (Copy & Share)", summary, height=300)
                     
                     # Download button
@@ -503,6 +597,26 @@ class StudentDashboard:
                 else:
                     st.error(f"Could not generate profile for Student #{selected_student}")
 
+        # Bulk export: every summary of a cohort in one archive
+        st.subheader("📦 Bulk Export")
+        cohort = st.radio("Cohort:", ["All students", "At-risk students"], horizontal=True, key="export_cohort")
+        if st.button("Prepare Printable Summaries (ZIP)"):
+            cohort_ids = self.at_risk_ids(df) if cohort == "At-risk students" else None
+            progress_bar = st.progress(0.0, text="Generating summaries...")
+            # The archive is streamed to a temp file rather than built up in memory next to the frame
+            with tempfile.TemporaryDirectory() as tmp:
+                archive_path = os.path.join(tmp, 'student_summaries.zip')
+                result = ReportExporter.export_zip(df, archive_path, cohort_ids,
+                                                   progress=lambda done, total: progress_bar.progress(done / total))
+                st.success(f"✅ {result['students']} printable summaries ready")
+                with open(archive_path, 'rb') as archive:
+                    st.download_button(
+                        label="Download Summaries (ZIP)",
+                        data=archive,
+                        file_name='student_summaries.zip',
+                        mime='application/zip',
+                    )
+
     def render_goal_tracking_page(self, df):
         """Render the goal tracking page"""
         st.header("🎯 Student Goal Tracking")
@@ -510,17 +624,28 @@ class StudentDashboard:
         Set academic goals, track progress over time, and monitor milestone achievements.
         """)
 
-        # Student selection
-        if 'Student_ID' in df.columns:
-            student_ids = sorted(df['Student_ID'].unique())
-        else:
-            df['Student_ID'] = range(1, len(df) + 1)
-            student_ids = list(df['Student_ID'].unique())
+        # Goal metrics across every student
+        metrics = self.goal_tracker.calculate_goal_metrics()
+        if metrics:
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.metric("Active Goals", f"{metrics['active_goals']:,}")
+            with col2:
+                st.metric("Achievement Rate", f"{metrics['achievement_rate']:.1f}%")
+            with col3:
+                st.metric("Average Progress", f"{metrics['average_progress']:.1f}%")
+            with col4:
+                st.metric("On Track", f"{metrics['goals_on_track']:,}", f"{metrics['goals_behind']:,} behind",
+                          delta_color="off")
+
+        # Student selection (IDs are assigned when the dataset is loaded)
+        student_ids = self.data_manager.get_student_index().ids
         
         selected_student = st.selectbox("Select Student:", student_ids, key="goal_student")
 
         # Action tabs
-        goal_tabs = st.tabs(["📝 Create Goal", "📊 Track Progress", "📈 View Goals", "💡 Suggested Goals"])
+        goal_tabs = st.tabs(["📝 Create Goal", "📊 Track Progress", "📈 View Goals", "💡 Suggested Goals",
+                             "📥 Import Progress"])
 
         # Tab 1: Create Goal
         with goal_tabs[0]:
@@ -620,18 +745,12 @@ class StudentDashboard:
                             st.write("**Milestones:**")
                             for milestone in goal['milestones']:
                                 icon = "✅" if milestone.get('achieved') else "⏳"
-                                st.write(f"{icon} {milestone['name']}: {milestone['target_value']}")
+                                st.write(f"{icon} Day {milestone['day']}: {milestone['target_value']:.1f}")
                 
-                # Show progress chart
-                if len(active_goals) > 0:
-                    st.subheader("Progress Visualization")
-                    # Use the goal tracker's visualization
-                    fig = self.visualizations.create_progress_tracking_chart(
-                        student_id=selected_student,
-                        goals=active_goals
-                    )
-                    if fig:
-                        st.pyplot(fig)
+                        # Show progress chart
+                        st.image(Visualizations.render_chart(
+                            'progress_tracking_chart', goal['baseline_value'], status['current_value'],
+                            goal['target_value'], goal['goal_type']))
             else:
                 st.info("No goals found for this student. Create your first goal!")
 
@@ -664,6 +783,73 @@ class StudentDashboard:
                     else:
                         st.info("No specific goal suggestions at this time.")
 
+            # Seed suggested goals for a whole cohort in one write
+            st.markdown("---")
+            st.subheader("Seed Goals for a Cohort")
+            cohort = st.radio("Cohort:", ["All students", "At-risk students"], horizontal=True, key="goal_cohort")
+            priorities = st.multiselect("Priorities:", ["High", "Medium", "Low"], default=["High"],
+                                        key="goal_priorities")
+
+            def cohort_suggestions():
+                cohort_ids = self.at_risk_ids(df) if cohort == "At-risk students" else None
+                return self.goal_tracker.suggest_goals_for_cohort(df, cohort_ids)
+
+            # Suggestions depend only on the dataset and cohort; shared read-only across reruns
+            suggestions = self.memoized('cohort_goal_suggestions', cohort, cohort_suggestions)
+            suggestions = suggestions[suggestions['priority'].isin(priorities)]
+            st.caption(f"{len(suggestions):,} suggested goals for {suggestions['student_id'].nunique():,} students")
+            if st.button("Create Suggested Goals for Cohort", disabled=suggestions.empty):
+                # Pressing the button twice must not give a student a second active goal of a type
+                new_goals = self.goal_tracker.without_active_goals(suggestions)
+                goal_ids = self.goal_tracker.create_goals(new_goals)
+                st.success(f"✅ Created {len(goal_ids):,} goals "
+                           f"({len(suggestions) - len(new_goals):,} skipped: already active)")
+
+        # Tab 5: Import Progress (e.g. the nightly SIS export)
+        with goal_tabs[4]:
+            st.subheader("Import Progress Updates")
+            st.markdown("Upload a CSV or Parquet file with `goal_id` and `value` columns, "
+                        "and optionally `date` and `notes`. All rows are applied together.")
+            
+            upload = st.file_uploader("Progress file:", type=['csv', 'parquet'], key="progress_upload")
+            compact = st.checkbox(f"Afterwards keep one entry per week for updates older than {HISTORY_KEEP_DAYS} days",
+                                  value=True, key="compact_history")
+            if upload is not None and st.button("Import Progress", type="primary"):
+                updates = pd.read_parquet(upload) if upload.name.endswith('.parquet') else pd.read_csv(upload)
+                missing_columns = {'goal_id', 'value'} - set(updates.columns)
+                if missing_columns:
+                    st.error(f"Missing columns: {', '.join(sorted(missing_columns))}")
+                else:
+                    result = self.goal_tracker.ingest_progress(updates)
+                    st.success(f"✅ Recorded {result['entries']:,} updates for {result['updated']:,} goals "
+                               f"({result['achieved']:,} newly achieved)")
+                    if result['missing']:
+                        st.warning(f"{len(result['missing'])} goal IDs were not found: "
+                                   f"{', '.join(str(i) for i in result['missing'][:20])}")
+                    if compact:
+                        removed = self.goal_tracker.compact_history()
+                        st.info(f"Compacted {removed:,} older progress entries")
+
+            # Snapshot and restore of every goal
+            st.markdown("---")
+            st.subheader("Backup & Restore")
+            backup_format = st.radio("Format:", ["parquet", "jsonl"], horizontal=True, key="goal_backup_format")
+            if st.button("Prepare Goal Backup"):
+                with st.spinner("Exporting goals..."):
+                    backup = GoalExporter.export_bytes(self.goal_tracker.store, backup_format)
+                st.download_button(
+                    label=f"Download Backup ({len(backup) / 1024:,.0f} KiB)",
+                    data=backup,
+                    file_name=f'goals_backup.{backup_format}',
+                    mime='application/octet-stream',
+                )
+            restore = st.file_uploader("Restore from backup:", type=['parquet', 'jsonl'], key="goal_restore")
+            if restore is not None and st.button("Restore Goals"):
+                restore_format = GoalExporter.file_format(restore.name)
+                source = restore if restore_format == 'parquet' else io.TextIOWrapper(restore, encoding='utf-8')
+                restored = self.goal_tracker.import_goals(source, restore_format)
+                st.success(f"✅ Restored {restored:,} goals")
+
     def render_ai_assistant_page(self, df):
         """Render the AI assistant chat interface"""
         st.header("💬 Educational AI Assistant")
@@ -674,24 +860,3 @@ class StudentDashboard:
         
         # Render the chat interface
         self.ai_assistant.render_chat_interface(df)
-
-    def clean_dataframe(self, df):
-        """Clean dataframe for analysis"""
-        df_clean = df.copy()
-        for col in df_clean.columns:
-            if pd.api.types.is_categorical_dtype(df_clean[col]):
-                df_clean[col] = df_clean[col].astype(str)
-            if df_clean[col].dtype == 'object':
-                try:
-                    non_null_vals = df_clean[col].dropna()
-                    if len(non_null_vals) > 0:
-                        pd.to_numeric(non_null_vals.iloc[0])
-                        df_clean[col] = pd.to_numeric(df_clean[col], errors='coerce')
-                except (ValueError, TypeError):
-                    df_clean[col] = df_clean[col].astype(str)
-        for col in df_clean.columns:
-            if df_clean[col].dtype in ['float64', 'int64']:
-                df_clean[col] = df_clean[col].fillna(0)
-            else:
-                df_clean[col] = df_clean[col].fillna('Unknown')
-        return df_clean
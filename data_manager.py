@@ -1,23 +1,507 @@
+import hashlib
+import os
+import numpy as np
 import pandas as pd
 import streamlit as st
+from correlation_service import CorrelationService, ID_COLUMN
+from result_cache import ResultCache
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # columnar cache is optional, CSV parsing still works without it
+    pa = None
+    pq = None
+
+CACHE_DIR = ".engage_cache"
+CACHE_VERSION = 3  # bump whenever categorize_data changes the processed columns
+
+# Source files larger than this are ingested chunk by chunk instead of in one read_csv
+STREAMING_THRESHOLD_BYTES = 64 * 1024 * 1024
+STREAMING_CHUNK_ROWS = 100_000
+
+# An unshared StudentIndex scans the Student_ID column for up to this many lookups at
+# once; more than that and building the ID map is cheaper
+SCAN_MAX_LOOKUPS = 8
+
+# Explicit dtypes for the student frame: low-cardinality strings are stored as
+# categoricals and bounded numeric fields as the narrowest integer that fits.
+# Score fields use int16 so offsets like "score + 15" cannot wrap around.
+SCHEMA = {
+    'Hours_Studied': 'int8',
+    'Attendance': 'int8',
+    'Sleep_Hours': 'int8',
+    'Previous_Scores': 'int16',
+    'Tutoring_Sessions': 'int8',
+    'Physical_Activity': 'int8',
+    'Exam_Score': 'int16',
+    'Parental_Involvement': 'category',
+    'Access_to_Resources': 'category',
+    'Extracurricular_Activities': 'category',
+    'Motivation_Level': 'category',
+    'Internet_Access': 'category',
+    'Family_Income': 'category',
+    'Teacher_Quality': 'category',
+    'School_Type': 'category',
+    'Peer_Influence': 'category',
+    'Learning_Disabilities': 'category',
+    'Parental_Education_Level': 'category',
+    'Distance_from_Home': 'category',
+    'Gender': 'category',
+}
+
+
+class FilterIndex:
+    """
+    Packed row bitmaps for every value of the categorical columns
+
+    Built once per dataset; a sidebar filter is then a bitwise AND of the bitmaps of
+    the selected values instead of a full comparison over the frame.
+    """
+
+    def __init__(self, df, columns=None):
+        """
+        Args:
+            df: Processed student frame
+            columns: Columns to index (defaults to every categorical or text column)
+        """
+        if columns is None:
+            columns = [col for col, dtype in df.dtypes.items()
+                       if isinstance(dtype, pd.CategoricalDtype) or dtype == object]
+        self.n_rows = len(df)
+        self.bitmaps = {}  # column -> {value: packed uint8 bitmap}
+        for col in columns:
+            series = df[col]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                codes = series.cat.codes.to_numpy()
+                values = series.cat.categories
+            else:
+                codes, values = pd.factorize(series)
+            counts = np.bincount(codes[codes >= 0], minlength=len(values))
+            # Unused categories get no bitmap, so they never show up as filter options
+            self.bitmaps[col] = {values[i]: np.packbits(codes == i) for i in np.flatnonzero(counts)}
+
+    def options(self, column):
+        """Values present in an indexed column, sorted"""
+        return sorted(self.bitmaps.get(column, {}))
+
+    def mask(self, filters):
+        """
+        Packed bitmap of the rows matching every filter, or None when nothing is filtered
+
+        Args:
+            filters: dict of column -> selected value or list of values; 'All' (or an empty
+                     selection) means no predicate, several values in one column are ORed
+        """
+        result = None
+        for column, selected in filters.items():
+            values = selected if isinstance(selected, (list, tuple, set)) else [selected]
+            values = [v for v in values if v is not None and v != 'All']
+            if not values:
+                continue
+            if column not in self.bitmaps:
+                raise KeyError(f"Column '{column}' is not in the filter index")
+            column_bitmaps = self.bitmaps[column]
+            empty = np.zeros((self.n_rows + 7) // 8, dtype=np.uint8)
+            column_mask = np.bitwise_or.reduce([column_bitmaps.get(v, empty) for v in values])
+            result = column_mask if result is None else result & column_mask
+        return result
+
+    def positions(self, filters):
+        """Row positions matching the filters (every row when nothing is filtered)"""
+        bits = self.mask(filters)
+        if bits is None:
+            return np.arange(self.n_rows)
+        return np.flatnonzero(np.unpackbits(bits, count=self.n_rows))
+
+    def view(self, df, filters):
+        """Lazy filtered view of df; rows are only copied if the frame is actually used"""
+        bits = self.mask(filters)
+        positions = None if bits is None else np.flatnonzero(np.unpackbits(bits, count=self.n_rows))
+        return FilteredView(df, positions, bits)
+
+
+class FilteredView:
+    """Row selection over a shared frame, materialized on first access to .frame"""
+
+    def __init__(self, df, positions=None, mask=None):
+        self.source = df
+        self.positions = positions  # None = every row
+        self.mask = mask  # the same selection as a packed row bitmap, if known
+        self._frame = None
+
+    def __len__(self):
+        return len(self.source) if self.positions is None else len(self.positions)
+
+    @property
+    def columns(self):
+        return self.source.columns
+
+    @property
+    def frame(self):
+        """The filtered frame (the shared frame itself when nothing is filtered; treat as read-only)"""
+        if self._frame is None:
+            self._frame = self.source if self.positions is None else self.source.take(self.positions)
+        return self._frame
+
+
+class StudentIndex:
+    """
+    Student_ID -> row position map for a student frame
+
+    Built once per dataset version, so finding one student is a dict lookup instead of a
+    comparison over every row of the district. The map itself is built on first use; an
+    index that is not shared (scan=True) answers a few lookups by scanning the column
+    instead, since a one-off profile of a frame would not pay back the O(N log N) build.
+    """
+
+    _cache = ResultCache(max_entries=8)
+
+    def __init__(self, df, scan=False):
+        """
+        Args:
+            df: Student frame; without a Student_ID column students are numbered by row from 1
+            scan: Scan the column for lookups of up to SCAN_MAX_LOOKUPS students instead of
+                  building the map (for frames that are only looked up once)
+        """
+        self.n_rows = len(df)
+        self.scan = scan
+        self._column = df[ID_COLUMN].to_numpy() if ID_COLUMN in df.columns else None
+        self._ids = None
+        self._positions = None  # Student_ID -> first row of that ID, built on first use
+
+    def _build(self):
+        unique, first = np.unique(self._column, return_index=True)
+        self._ids = unique.tolist()  # sorted
+        self._positions = dict(zip(self._ids, first.tolist()))
+
+    @property
+    def ids(self):
+        """Every Student_ID, sorted"""
+        if self._column is None:
+            return list(range(1, self.n_rows + 1))
+        if self._ids is None:
+            self._build()
+        return self._ids
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, student_id):
+        return self.position(student_id) is not None
+
+    def position(self, student_id):
+        """Row position of the student, or None if there is no such student"""
+        if self._column is None:
+            try:
+                number = int(student_id)
+            except (TypeError, ValueError):
+                return None
+            return number - 1 if 1 <= number <= self.n_rows else None
+        if self._positions is None and self.scan:
+            return self._scan(student_id)
+        if self._positions is None:
+            self._build()
+        try:
+            return self._positions.get(student_id)
+        except TypeError:  # unhashable
+            return None
+
+    def _scan(self, student_id):
+        """First row holding student_id, by comparison over the column"""
+        try:
+            hash(student_id)
+            matches = np.flatnonzero(self._column == student_id)
+        except (TypeError, ValueError):
+            return None
+        return int(matches[0]) if len(matches) else None
+
+    def positions(self, student_ids):
+        """Row position of each student as an array, -1 where there is no such student"""
+        student_ids = list(student_ids)
+        if self.scan and self._positions is None and self._column is not None \
+                and len(student_ids) > SCAN_MAX_LOOKUPS:
+            self._build()
+        positions = [self.position(student_id) for student_id in student_ids]
+        return np.array([-1 if p is None else p for p in positions], dtype=np.int64)
+
+    def row(self, df, student_id):
+        """The student's row of df as a Series, or None"""
+        position = self.position(student_id)
+        return None if position is None else df.iloc[position]
+
+    @classmethod
+    def for_frame(cls, df):
+        """
+        Shared index for df; frames carrying df.attrs['dataset_version'] are indexed once,
+        other frames get a scanning index
+        """
+        if df.attrs.get('dataset_version') is None:
+            return cls(df, scan=True)
+        key = CorrelationService.frame_key(df, [ID_COLUMN])
+        return cls._cache.get_or_compute(key, lambda: cls(df))
+
 
 class DataManager:
     
-    def __init__(self, filename="student_performance_cleaned.csv"):
+    def __init__(self, filename="student_performance_cleaned.csv", cache_dir=CACHE_DIR):
         self.filename = filename
+        self.cache_dir = cache_dir
         self.df = None
+        self._source_hash = None
     
     @staticmethod
     @st.cache_data # load the csv data # Cache the data loading function to improve performance 
     def load_data(filename):
         """Loads data from a local CSV file."""
         try:
-            df = pd.read_csv(filename)
-            return df
+            # Parse string columns straight into categoricals, then narrow the integers
+            categories = {col: 'category' for col, dtype in SCHEMA.items() if dtype == 'category'}
+            df = pd.read_csv(filename, dtype=categories)
+            return DataManager.apply_schema(df)
         except FileNotFoundError:
             st.error(f"Error: The dataset '{filename}' was not found.")
             return None
 
+    @staticmethod
+    def apply_schema(df, schema=None):
+        """Cast columns to the compact dtypes in SCHEMA, skipping values that would not fit"""
+        schema = schema or SCHEMA
+        for col, dtype in schema.items():
+            if col not in df.columns or df[col].dtype == dtype:
+                continue
+            if dtype == 'category':
+                df[col] = df[col].astype('category')
+                continue
+            values = df[col]
+            if not pd.api.types.is_numeric_dtype(values) or values.isna().any():
+                continue
+            limits = np.iinfo(dtype)
+            if values.min() >= limits.min and values.max() <= limits.max and (values % 1 == 0).all():
+                df[col] = values.astype(dtype)
+        return df
+
+    @staticmethod
+    def memory_report(df):
+        """Per-column memory usage compared with the default object/int64 layout"""
+        rows = []
+        for col in df.columns:
+            values = df[col]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                wide = values.astype(object)
+            elif pd.api.types.is_integer_dtype(values):
+                wide = values.astype('int64')
+            else:
+                wide = values
+            rows.append({
+                'column': col,
+                'dtype': str(values.dtype),
+                'bytes': values.memory_usage(index=False, deep=True),
+                'default_bytes': wide.memory_usage(index=False, deep=True),
+            })
+        report = pd.DataFrame(rows).set_index('column')
+        report['savings_pct'] = (1 - report['bytes'] / report['default_bytes']) * 100
+        report.loc['TOTAL'] = [
+            '', report['bytes'].sum(), report['default_bytes'].sum(),
+            (1 - report['bytes'].sum() / report['default_bytes'].sum()) * 100,
+        ]
+        return report
+
+    @staticmethod
+    def file_hash(filename, block_size=1 << 20):
+        """Content hash of the source file, used to key the columnar cache"""
+        digest = hashlib.sha256()
+        with open(filename, 'rb') as f:
+            for block in iter(lambda: f.read(block_size), b''):
+                digest.update(block)
+        return digest.hexdigest()[:16]
+
+    def source_hash(self):
+        """Content hash of this manager's source file, computed once"""
+        if self._source_hash is None:
+            self._source_hash = self.file_hash(self.filename)
+        return self._source_hash
+
+    def dataset_version(self):
+        """Identifies the processed dataset: source contents plus pipeline version"""
+        return f"{self.source_hash()}-v{CACHE_VERSION}"
+
+    def cache_path(self):
+        """Location of the columnar cache for the current source file contents"""
+        stem = os.path.splitext(os.path.basename(self.filename))[0]
+        key = f"{stem}-v{CACHE_VERSION}-{self.source_hash()}.parquet"
+        return os.path.join(self.cache_dir, key)
+
+    def read_columnar_cache(self):
+        """Memory-map the processed frame from the columnar cache, or None on a miss"""
+        if pq is None or not os.path.exists(self.filename):
+            return None
+        path = self.cache_path()
+        if not os.path.exists(path):
+            return None
+        try:
+            return pq.read_table(path, memory_map=True).to_pandas()
+        except (OSError, pa.ArrowException):
+            # Corrupt or partially written cache: rebuild it from the CSV
+            return None
+
+    def write_columnar_cache(self, df):
+        """Persist the processed frame as Parquet so later cold starts skip CSV parsing"""
+        if pq is None:
+            return None
+        path = self.cache_path()
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Write to a temp file and rename so concurrent workers never read a partial file
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            pq.write_table(pa.Table.from_pandas(df, preserve_index=False), tmp_path)
+            os.replace(tmp_path, path)
+        except (OSError, pa.ArrowException):
+            return None
+        self._prune_columnar_cache(path)
+        return path
+
+    def _prune_columnar_cache(self, keep_path):
+        """Remove cache files left behind by older versions of the same source file"""
+        stem = os.path.splitext(os.path.basename(self.filename))[0]
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if name.startswith(f"{stem}-v") and name.endswith('.parquet') and path != keep_path:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    @staticmethod
+    @st.cache_resource  # shared across reruns and sessions without a copy; read-only (test_shared_frame.py)
+    def load_processed_data(filename, cache_dir=CACHE_DIR):
+        """Load the categorized, normalized frame, preferring the columnar cache over CSV parsing"""
+        return DataManager.read_processed_data(filename, cache_dir)
+
+    @staticmethod
+    def read_processed_data(filename, cache_dir=CACHE_DIR):
+        """load_processed_data without the Streamlit cache (e.g. in chart worker processes)"""
+        manager = DataManager(filename, cache_dir)
+        df = manager.read_columnar_cache()
+        if df is None and pq is not None and os.path.exists(filename) \
+                and os.path.getsize(filename) > STREAMING_THRESHOLD_BYTES:
+            # Too large to parse in one go: stream it into the columnar store first
+            manager.ingest_csv_streaming()
+            df = manager.read_columnar_cache()
+        if df is None:
+            df = DataManager.load_data(filename)
+            if df is not None:
+                df = manager.normalize_data(manager.categorize_data(df))
+                manager.write_columnar_cache(df)
+        if df is not None:
+            DataManager.assign_student_ids(df)
+        if df is not None and os.path.exists(filename):
+            # Carried onto filtered copies; shared caches (e.g. CorrelationService) key on it
+            df.attrs['dataset_version'] = manager.dataset_version()
+        return df
+
+    @staticmethod
+    @st.cache_resource  # one index per dataset, shared like the frame it was built from
+    def load_filter_index(filename, cache_dir=CACHE_DIR):
+        """Filter bitmaps for the processed frame"""
+        df = DataManager.load_processed_data(filename, cache_dir)
+        return FilterIndex(df) if df is not None else None
+
+    def ingest_csv_streaming(self, chunksize=STREAMING_CHUNK_ROWS):
+        """
+        Stream the source CSV into the columnar store one chunk at a time
+
+        Each chunk is parsed, narrowed with apply_schema and run through categorize_data
+        and normalize_data before being appended to the Parquet file as its own row group, so peak memory is
+        bounded by the chunk size rather than the size of the export. A chunk whose values do
+        not fit a column's narrowed type (e.g. an int8 column that meets a 300) widens that
+        column for the whole file, so the result has the same dtypes as load_data.
+
+        Args:
+            chunksize: Number of CSV rows parsed per chunk
+
+        Returns:
+            Path of the written Parquet file
+        """
+        if pq is None:
+            raise ImportError("Streaming ingest requires pyarrow (pip install pyarrow)")
+
+        path = self.cache_path()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        categories = {col: 'category' for col, dtype in SCHEMA.items() if dtype == 'category'}
+
+        writer = None
+        try:
+            for chunk in pd.read_csv(self.filename, dtype=categories, chunksize=chunksize):
+                chunk = self.normalize_data(self.categorize_data(self.apply_schema(chunk)))
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    # The first chunk fixes the file schema; later chunks are cast to it
+                    writer = pq.ParquetWriter(tmp_path, table.schema)
+                else:
+                    widened = self._widened_schema(writer.schema, table.schema)
+                    if widened is not None:
+                        writer = self._rewrite_parquet(writer, tmp_path, widened)
+                    table = table.cast(writer.schema)
+                writer.write_table(table)
+        except BaseException:
+            if writer is not None:
+                writer.close()
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        if writer is None:
+            return None
+        writer.close()
+        os.replace(tmp_path, path)
+        self._prune_columnar_cache(path)
+        return path
+
+    @staticmethod
+    def _widened_schema(file_schema, chunk_schema):
+        """
+        File schema with integer columns widened to fit a chunk, or None if the chunk fits
+
+        A column narrowed from the first chunk (say int8) arrives wider in a chunk whose
+        values do not fit (int64, or float64 for fractional values); the file column takes
+        the chunk's type. Other differences are left to the cast.
+        """
+        schema = file_schema
+        for field in chunk_schema:
+            index = schema.get_field_index(field.name)
+            if index < 0:
+                continue
+            current = schema.field(index).type
+            wider = pa.types.is_integer(current) and (
+                pa.types.is_floating(field.type)
+                or (pa.types.is_integer(field.type) and field.type.bit_width > current.bit_width))
+            if wider:
+                schema = schema.set(index, schema.field(index).with_type(field.type))
+        return None if schema is file_schema else schema
+
+    @staticmethod
+    def _rewrite_parquet(writer, path, schema):
+        """
+        Close writer and return a new writer on the same path, holding the row groups
+        written so far cast to `schema` (one row group in memory at a time)
+        """
+        writer.close()
+        narrow_path = f"{path}.narrow"
+        os.replace(path, narrow_path)
+        rewriter = pq.ParquetWriter(path, schema)
+        try:
+            written = pq.ParquetFile(narrow_path)
+            for group in range(written.num_row_groups):
+                rewriter.write_table(written.read_row_group(group).cast(schema))
+        except BaseException:
+            rewriter.close()
+            raise
+        finally:
+            os.remove(narrow_path)
+        return rewriter
+
     def categorize_data(self, df):
         """Create categories for better visualization"""
         df['Performance_Category'] = pd.cut(df['Exam_Score'], 
@@ -32,16 +516,22 @@ class DataManager:
         df = self.create_parental_engagement_score(df)
         return df
     
+    @staticmethod
+    def _map_scores(series, scores):
+        """Map labels to numeric scores (a categorical maps to a categorical, so cast it back)"""
+        mapped = series.map(scores)
+        return mapped.astype('float64' if mapped.isna().any() else 'int8')
+
     def create_parental_engagement_score(self, df):
         """Map involvement, education, and income to numeric columns only"""
         involvement_scores = {'Low': 1, 'Medium': 2, 'High': 3}
-        df['Involvement_Score'] = df['Parental_Involvement'].map(involvement_scores)
+        df['Involvement_Score'] = self._map_scores(df['Parental_Involvement'], involvement_scores)
 
         education_scores = {'High School': 1, 'College': 2, 'Postgraduate': 3}
-        df['Education_Score'] = df['Parental_Education_Level'].map(education_scores)
+        df['Education_Score'] = self._map_scores(df['Parental_Education_Level'], education_scores)
 
         income_scores = {'Low': 1, 'Medium': 2, 'High': 3}
-        df['Income_Score'] = df['Family_Income'].map(income_scores)
+        df['Income_Score'] = self._map_scores(df['Family_Income'], income_scores)
 
         categorical_columns = ['Performance_Category', 'Attendance_Category', 'Study_Hours_Category']
         for col in categorical_columns:
@@ -50,13 +540,62 @@ class DataManager:
 
         return df
     
+    def normalize_data(self, df):
+        """
+        One-time, schema-driven cleanup of the processed frame
+
+        Numeric columns that arrived as text are coerced to numbers, missing numbers become 0
+        and missing labels become 'Unknown' (added as a category where needed), then the
+        compact schema is re-applied to columns that only stayed wide because of NaNs.
+        This replaces the per-rerun StudentDashboard.clean_dataframe.
+        """
+        for col in df.columns[df.dtypes == object]:
+            if SCHEMA.get(col, 'category') != 'category':
+                df[col] = pd.to_numeric(df[col], errors='coerce')
+            elif col not in SCHEMA:
+                # Extra columns in a district export: keep them numeric if every value parses
+                numeric = pd.to_numeric(df[col], errors='coerce')
+                if numeric.notna().sum() == df[col].notna().sum():
+                    df[col] = numeric
+
+        fill_values = {}
+        for col in df.columns[df.isna().any()]:
+            if pd.api.types.is_numeric_dtype(df[col]):
+                fill_values[col] = 0
+            else:
+                if isinstance(df[col].dtype, pd.CategoricalDtype) and 'Unknown' not in df[col].cat.categories:
+                    df[col] = df[col].cat.add_categories(['Unknown'])
+                fill_values[col] = 'Unknown'
+        if fill_values:
+            df = df.fillna(value=fill_values)
+        return self.apply_schema(df)
+
     def get_processed_data(self):
         if self.df is None:
-            self.df = self.load_data(self.filename)
-            if self.df is not None:
-                self.df = self.categorize_data(self.df)
+            self.df = self.load_processed_data(self.filename, self.cache_dir)
         return self.df
 
+    @staticmethod
+    def assign_student_ids(df):
+        """
+        Give every student a stable Student_ID (row number from 1) if the source has none
+
+        Done once at load so pages never have to add IDs to the shared frame.
+        """
+        if ID_COLUMN not in df.columns:
+            df.insert(0, ID_COLUMN, np.arange(1, len(df) + 1, dtype=np.int32))
+        return df
 
+    def get_student_index(self):
+        """Student_ID -> row position index for the processed frame"""
+        df = self.get_processed_data()
+        return StudentIndex.for_frame(df) if df is not None else None
 
+    def get_filter_index(self):
+        """Filter bitmaps for the processed frame"""
+        return self.load_filter_index(self.filename, self.cache_dir)
 
+    def get_memory_report(self):
+        """Memory report for the processed frame"""
+        df = self.get_processed_data()
+        return self.memory_report(df) if df is not None else None
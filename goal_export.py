@@ -0,0 +1,237 @@
+"""
+Goal Export and Import
+Streams every goal of a GoalStore to JSON Lines or Parquet and restores it,
+a batch of goals at a time, so backups of a district's goal store use bounded
+memory however many goals and progress entries it holds
+"""
+
+import io
+import json
+import os
+from contextlib import contextmanager
+from datetime import date, datetime
+import numpy as np
+import pandas as pd
+from goal_store import DATE_COLUMNS, GOAL_COLUMNS, plain
+from progress_history import ProgressHistory
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet backups are optional, JSON Lines works without pyarrow
+    pa = None
+    pq = None
+
+EXPORT_BATCH_GOALS = 1_000  # goals read, converted and written together (one Parquet row group)
+FORMATS = {'.jsonl': 'jsonl', '.parquet': 'parquet'}
+
+# Parquet columns besides the goal fields: milestones as JSON (as in SQLite) and the
+# progress history as three parallel list columns
+HISTORY_COLUMNS = ['history_date', 'history_value', 'history_notes']
+
+
+def iso(value):
+    """Dates as ISO strings, everything else unchanged"""
+    return value.isoformat() if isinstance(value, (date, datetime)) else value
+
+
+@contextmanager
+def opened(file, mode):
+    """Yield a file object for a path (opened and closed here) or an already open file"""
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, mode) as f:
+            yield f
+    else:
+        yield file
+
+
+class GoalExporter:
+    """Snapshot and restore of every goal in a GoalStore"""
+
+    @staticmethod
+    def file_format(file, format=None):
+        """'jsonl' or 'parquet', from the explicit format or the file extension"""
+        if format is None:
+            name = file if isinstance(file, (str, os.PathLike)) else getattr(file, 'name', '')
+            format = FORMATS.get(os.path.splitext(str(name))[1].lower())
+        if format not in FORMATS.values():
+            raise ValueError(f"Unknown goal export format {format!r}; use 'jsonl' or 'parquet'")
+        return format
+
+    @staticmethod
+    def goal_record(goal):
+        """Goal as JSON-ready values: ISO dates and the history as parallel date/value/notes lists"""
+        record = {col: iso(plain(goal.get(col))) for col in GOAL_COLUMNS}
+        record['milestones'] = [{key: iso(value) for key, value in milestone.items()}
+                                for milestone in goal['milestones']]
+        record['progress_history'] = goal['progress_history'].to_dict()
+        return record
+
+    @staticmethod
+    def goal_from_record(record):
+        """Inverse of goal_record"""
+        goal = {col: record.get(col) for col in GOAL_COLUMNS}
+        for col in DATE_COLUMNS:
+            goal[col] = datetime.fromisoformat(goal[col]) if goal[col] else goal[col]
+        if goal['achievement_date'] is None:
+            del goal['achievement_date']
+        goal['milestones'] = record['milestones']
+        goal['progress_history'] = ProgressHistory.from_dict(record['progress_history'])
+        return goal
+
+    @staticmethod
+    def export_goals(store, file, format=None, batch_size=EXPORT_BATCH_GOALS):
+        """
+        Write every goal of a store, in goal_id order
+
+        Args:
+            store: GoalStore to export
+            file: Path or writable file object (text for JSON Lines, binary for Parquet)
+            format: 'jsonl' or 'parquet' (default: from the file extension)
+            batch_size: Goals held in memory at a time
+
+        Returns:
+            int: Number of goals written
+        """
+        if GoalExporter.file_format(file, format) == 'parquet':
+            return GoalExporter.export_parquet(store, file, batch_size)
+        return GoalExporter.export_jsonl(store, file, batch_size)
+
+    @staticmethod
+    def import_goals(store, file, format=None, batch_size=EXPORT_BATCH_GOALS):
+        """
+        Restore goals from an export, keeping their goal_ids (existing goals with the same
+        IDs are replaced); the whole import is one write, so a failed import changes nothing
+
+        Returns:
+            int: Number of goals read
+        """
+        if GoalExporter.file_format(file, format) == 'parquet':
+            batches = GoalExporter.read_parquet(file, batch_size)
+        else:
+            batches = GoalExporter.read_jsonl(file, batch_size)
+        count = 0
+        with store.batch():
+            for goals in batches:
+                store.put_many(goals)
+                count += len(goals)
+        return count
+
+    @staticmethod
+    def export_jsonl(store, file, batch_size=EXPORT_BATCH_GOALS):
+        """One JSON object per line and goal (see goal_record)"""
+        count = 0
+        with opened(file, 'w') as f:
+            for goals in store.iter_goals(batch_size):
+                f.write(''.join(json.dumps(GoalExporter.goal_record(goal)) + '\n' for goal in goals))
+                count += len(goals)
+        return count
+
+    @staticmethod
+    def read_jsonl(file, batch_size=EXPORT_BATCH_GOALS):
+        """Goals of a JSON Lines export, batch_size at a time"""
+        with opened(file, 'r') as f:
+            goals = []
+            for line in f:
+                if line.strip():
+                    goals.append(GoalExporter.goal_from_record(json.loads(line)))
+                if len(goals) == batch_size:
+                    yield goals
+                    goals = []
+            if goals:
+                yield goals
+
+    @staticmethod
+    def parquet_schema(student_id_type):
+        """Fixed export schema, so every batch becomes a row group of the same file"""
+        types = {'goal_id': pa.int64(), 'student_id': student_id_type, 'goal_type': pa.string(),
+                 'current_value': pa.float64(), 'target_value': pa.float64(), 'baseline_value': pa.float64(),
+                 'timeline_days': pa.int64(), 'description': pa.string(), 'priority': pa.string(),
+                 'created_date': pa.timestamp('us'), 'target_date': pa.timestamp('us'), 'status': pa.string(),
+                 'achievement_date': pa.string()}
+        return pa.schema([(col, types[col]) for col in GOAL_COLUMNS] + [
+            ('milestones', pa.string()),
+            ('history_date', pa.list_(pa.timestamp('us'))),
+            ('history_value', pa.list_(pa.float32())),
+            ('history_notes', pa.list_(pa.string())),
+        ])
+
+    @staticmethod
+    def parquet_table(goals, schema=None):
+        """Arrow table of a batch of goals; histories are copied straight from their arrays"""
+        columns = {col: [plain(goal.get(col)) for goal in goals] for col in GOAL_COLUMNS}
+        for col in DATE_COLUMNS:
+            columns[col] = pd.to_datetime(columns[col]).to_numpy(dtype='datetime64[us]')
+        columns['achievement_date'] = [iso(value) for value in columns['achievement_date']]
+        columns['milestones'] = [json.dumps([{key: iso(value) for key, value in milestone.items()}
+                                             for milestone in goal['milestones']]) for goal in goals]
+        if schema is None:
+            schema = GoalExporter.parquet_schema(pa.array(columns['student_id']).type)
+
+        histories = [goal['progress_history'] for goal in goals]
+        offsets = pa.array(np.concatenate([[0], np.cumsum([len(h) for h in histories])]), pa.int32())
+        dates = np.concatenate([h.dates for h in histories]) if histories else np.array([], 'datetime64[us]')
+        values = np.concatenate([h.values for h in histories]) if histories else np.array([], np.float32)
+        notes = [note for h in histories for note in h.notes]
+        arrays = [pa.array(columns[col], type=schema.field(col).type) for col in GOAL_COLUMNS]
+        arrays.append(pa.array(columns['milestones'], pa.string()))
+        arrays += [pa.ListArray.from_arrays(offsets, pa.array(dates, pa.timestamp('us'))),
+                   pa.ListArray.from_arrays(offsets, pa.array(values, pa.float32())),
+                   pa.ListArray.from_arrays(offsets, pa.array(notes, pa.string()))]
+        return pa.Table.from_arrays(arrays, schema=schema)
+
+    @staticmethod
+    def export_parquet(store, file, batch_size=EXPORT_BATCH_GOALS):
+        """One row per goal, one row group per batch"""
+        if pq is None:
+            raise ImportError("Parquet goal export requires pyarrow (pip install pyarrow)")
+        count = 0
+        writer = None
+        try:
+            for goals in store.iter_goals(batch_size):
+                table = GoalExporter.parquet_table(goals, writer.schema if writer is not None else None)
+                if writer is None:
+                    writer = pq.ParquetWriter(file, table.schema)
+                writer.write_table(table)
+                count += len(goals)
+            if writer is None:  # empty store: still write a readable file
+                writer = pq.ParquetWriter(file, GoalExporter.parquet_schema(pa.int64()))
+        finally:
+            if writer is not None:
+                writer.close()
+        return count
+
+    @staticmethod
+    def export_bytes(store, format):
+        """Whole export in memory (e.g. for a download button)"""
+        if GoalExporter.file_format(None, format) == 'parquet':
+            buffer = io.BytesIO()
+            GoalExporter.export_parquet(store, buffer)
+            return buffer.getvalue()
+        buffer = io.StringIO()
+        GoalExporter.export_jsonl(store, buffer)
+        return buffer.getvalue().encode()
+
+    @staticmethod
+    def read_parquet(file, batch_size=EXPORT_BATCH_GOALS):
+        """Goals of a Parquet export, batch_size at a time"""
+        if pq is None:
+            raise ImportError("Parquet goal import requires pyarrow (pip install pyarrow)")
+        for batch in pq.ParquetFile(file).iter_batches(batch_size=batch_size):
+            columns = {col: batch.column(col).to_pylist() for col in GOAL_COLUMNS + ['milestones']}
+            history = {col: batch.column(col) for col in HISTORY_COLUMNS}
+            offsets = history['history_date'].offsets.to_numpy()
+            dates = history['history_date'].values.to_numpy()
+            values = history['history_value'].values.to_numpy()
+            notes = history['history_notes'].values.to_pylist()
+            goals = []
+            for i in range(batch.num_rows):
+                goal = {col: columns[col][i] for col in GOAL_COLUMNS}
+                if goal['achievement_date'] is None:
+                    del goal['achievement_date']
+                goal['milestones'] = json.loads(columns['milestones'][i])
+                start, end = offsets[i], offsets[i + 1]
+                goal['progress_history'] = ProgressHistory(dates[start:end], values[start:end], notes[start:end])
+                goals.append(goal)
+            yield goals
+
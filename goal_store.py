@@ -0,0 +1,590 @@
+"""
+Goal Storage Backends
+Where GoalTracker keeps goals and their progress history: an in-process list,
+or a SQLite database that survives restarts and is shared by every session
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime
+from operator import itemgetter
+import numpy as np
+from progress_history import HISTORY_RESOLUTION, ProgressHistory, last_per_period, to_datetime64
+
+GOALS_DB_PATH = os.environ.get('ENGAGE_GOALS_DB', 'goals.db')
+
+# Goal fields stored as columns; milestones and progress history are stored separately
+GOAL_COLUMNS = ['goal_id', 'student_id', 'goal_type', 'current_value', 'target_value', 'baseline_value',
+                'timeline_days', 'description', 'priority', 'created_date', 'target_date', 'status',
+                'achievement_date']
+DATE_COLUMNS = ['created_date', 'target_date']
+
+# Numeric goal fields kept as NumPy columns, so metrics over every goal are array operations
+METRIC_COLUMNS = {'goal_id': np.int64, 'baseline_value': np.float64, 'current_value': np.float64,
+                  'target_value': np.float64, 'timeline_days': np.float64, 'created_date': 'datetime64[us]'}
+STATUSES = ['active', 'achieved', 'missed']  # status codes in the columnar view; others are appended
+SQL_IN_CHUNK = 500  # goal IDs per "IN (...)" query, well under SQLite's bound-parameter limit
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS goals (
+    goal_id INTEGER PRIMARY KEY,
+    student_id,
+    goal_type TEXT,
+    current_value REAL,
+    target_value REAL,
+    baseline_value REAL,
+    timeline_days INTEGER,
+    description TEXT,
+    priority TEXT,
+    created_date TEXT,
+    target_date TEXT,
+    status TEXT,
+    achievement_date TEXT,
+    milestones TEXT
+);
+CREATE INDEX IF NOT EXISTS goals_by_student ON goals(student_id, status);
+CREATE INDEX IF NOT EXISTS goals_by_status ON goals(status);
+CREATE TABLE IF NOT EXISTS progress (
+    goal_id INTEGER NOT NULL REFERENCES goals(goal_id) ON DELETE CASCADE,
+    date TEXT,
+    value REAL,
+    notes TEXT
+);
+CREATE INDEX IF NOT EXISTS progress_by_goal ON progress(goal_id);
+"""
+
+
+class GoalColumns:
+    """Growable NumPy columns of METRIC_COLUMNS plus a status code, one row per goal, updated in place"""
+
+    def __init__(self, capacity=1024):
+        self.size = 0
+        self.rows = {}  # goal_id -> row
+        self.statuses = list(STATUSES)
+        self.data = {name: np.empty(capacity, dtype) for name, dtype in METRIC_COLUMNS.items()}
+        self.data['status'] = np.empty(capacity, np.int16)
+
+    def status_code(self, status):
+        """Code of a status in the 'status' column"""
+        if status not in self.statuses:
+            self.statuses.append(status)
+        return self.statuses.index(status)
+
+    def append(self, goal):
+        """Add a row for a new goal"""
+        if self.size == len(self.data['goal_id']):
+            for name, column in self.data.items():
+                grown = np.empty(2 * len(column), column.dtype)
+                grown[:self.size] = column[:self.size]
+                self.data[name] = grown
+        self.rows[goal['goal_id']] = self.size
+        self.size += 1
+        self.update(goal)
+
+    def update(self, goal):
+        """Copy a goal's current fields into its row"""
+        row = self.rows[goal['goal_id']]
+        for name in METRIC_COLUMNS:
+            self.data[name][row] = plain(goal[name])
+        self.data['status'][row] = self.status_code(goal['status'])
+
+    def update_many(self, goals, names=None):
+        """Copy several goals' current fields (or just the named ones) and status into their rows"""
+        rows = [self.rows[goal['goal_id']] for goal in goals]
+        for name in names or METRIC_COLUMNS:
+            self.data[name][rows] = [plain(goal[name]) for goal in goals]
+        self.data['status'][rows] = [self.status_code(goal['status']) for goal in goals]
+
+    def view(self):
+        """dict of column name -> array over the stored goals, plus 'statuses' (code -> name)"""
+        view = {name: column[:self.size] for name, column in self.data.items()}
+        view['statuses'] = self.statuses
+        return view
+
+    @staticmethod
+    def from_rows(rows):
+        """Columnar view built from (METRIC_COLUMNS..., status) tuples"""
+        columns = GoalColumns(capacity=max(1, len(rows)))
+        if rows:
+            fields = list(zip(*rows))
+            for i, (name, dtype) in enumerate(METRIC_COLUMNS.items()):
+                columns.data[name][:len(rows)] = np.array(fields[i], dtype=dtype)
+            columns.data['status'][:len(rows)] = [columns.status_code(status) for status in fields[-1]]
+            columns.size = len(rows)
+        return columns.view()
+
+
+def plain(value):
+    """NumPy scalars as the Python values SQLite and JSON accept"""
+    return value.item() if hasattr(value, 'item') and not isinstance(value, (str, bytes)) else value
+
+
+def record_progress(goal, entries):
+    """Append progress entry dicts to the goal's ProgressHistory"""
+    goal['progress_history'].extend([entry['date'] for entry in entries], [entry['value'] for entry in entries],
+                                     [entry.get('notes') for entry in entries])
+
+
+class GoalStore:
+    """
+    Storage interface used by GoalTracker
+
+    Goals are dicts with the GOAL_COLUMNS fields plus 'milestones' and 'progress_history'
+    (a ProgressHistory). Writes made inside batch() are applied together.
+    """
+
+    def add(self, goal):
+        """Store a new goal, assigning and returning its goal_id"""
+        raise NotImplementedError
+
+    def add_many(self, goals):
+        """Store several new goals in one write, returning their goal_ids in order"""
+        with self.batch():
+            return [self.add(goal) for goal in goals]
+
+    def get(self, goal_id):
+        """The goal with this ID, or None"""
+        raise NotImplementedError
+
+    def get_many(self, goal_ids):
+        """dict of goal_id -> goal for the IDs that exist"""
+        goals = {goal_id: self.get(goal_id) for goal_id in goal_ids}
+        return {goal_id: goal for goal_id, goal in goals.items() if goal is not None}
+
+    def find(self, student_id=None, status=None):
+        """Goals matching the given student and/or status, in creation order"""
+        raise NotImplementedError
+
+    def student_goal_types(self, status):
+        """Set of (student_id, goal_type) pairs of the goals with this status, without loading the goals"""
+        raise NotImplementedError
+
+    def iter_goals(self, batch_size=1000):
+        """Every goal in goal_id order, as lists of at most batch_size goals"""
+        raise NotImplementedError
+
+    def put_many(self, goals):
+        """Store goals under their own goal_ids (e.g. restoring a backup), replacing any with the same ID"""
+        raise NotImplementedError
+
+    def count_by_status(self):
+        """dict of status -> number of goals"""
+        raise NotImplementedError
+
+    def columns(self):
+        """Columnar view of every goal (see GoalColumns.view); treat as read-only"""
+        raise NotImplementedError
+
+    def append_progress(self, goal, entry):
+        """Record a progress entry and the goal fields it changed (value, status, milestones)"""
+        raise NotImplementedError
+
+    def append_progress_many(self, changes):
+        """
+        Record progress for several goals in one write
+
+        Args:
+            changes: (goal, entries) pairs; each goal already carries its final fields
+        """
+        with self.batch():
+            for goal, entries in changes:
+                for entry in entries:
+                    self.append_progress(goal, entry)
+
+    def compact_history(self, before, resolution=HISTORY_RESOLUTION):
+        """
+        Reduce progress entries older than `before` to the last one per period of each goal
+
+        Returns:
+            int: Number of entries removed
+        """
+        raise NotImplementedError
+
+    @contextmanager
+    def batch(self):
+        """Group several writes into one unit"""
+        yield self
+
+    def clear(self):
+        """Remove every goal"""
+        raise NotImplementedError
+
+
+class MemoryGoalStore(GoalStore):
+    """
+    Goals in a dict owned by one GoalTracker; lost when the tracker is discarded
+
+    Goals are indexed by ID, student and status, and the indexes and columnar view are
+    updated on every write, so no lookup scans the whole collection.
+    """
+
+    def __init__(self):
+        self.next_goal_id = 1
+        self.by_id = {}  # goal_id -> goal, in creation order
+        self.by_student = {}  # student_id -> {goal_id: goal}
+        self.by_status = {}  # status -> {goal_id: goal}
+        self.filed_status = {}  # goal_id -> status bucket the goal is in
+        self.metric_columns = GoalColumns()
+
+    @property
+    def goals(self):
+        """Every goal, in creation order"""
+        return list(self.by_id.values())
+
+    def add(self, goal):
+        goal_id = goal['goal_id'] = self.next_goal_id
+        self.next_goal_id += 1
+        self.by_id[goal_id] = goal
+        self.by_student.setdefault(goal['student_id'], {})[goal_id] = goal
+        self._file_status(goal)
+        self.metric_columns.append(goal)
+        return goal_id
+
+    def _file_status(self, goal):
+        """Move the goal to the bucket of its current status"""
+        goal_id = goal['goal_id']
+        previous = self.filed_status.get(goal_id)
+        if previous == goal['status']:
+            return
+        if previous is not None:
+            del self.by_status[previous][goal_id]
+        self.by_status.setdefault(goal['status'], {})[goal_id] = goal
+        self.filed_status[goal_id] = goal['status']
+
+    def get(self, goal_id):
+        return self.by_id.get(goal_id)
+
+    def find(self, student_id=None, status=None):
+        if student_id is not None:
+            goals = self.by_student.get(student_id, {}).values()
+            return [g for g in goals if status is None or g['status'] == status]
+        if status is not None:
+            # Goals join a bucket when their status changes; list them in creation order
+            return sorted(self.by_status.get(status, {}).values(), key=itemgetter('goal_id'))
+        return self.goals
+
+    def student_goal_types(self, status):
+        return {(goal['student_id'], goal['goal_type']) for goal in self.by_status.get(status, {}).values()}
+
+    def iter_goals(self, batch_size=1000):
+        goals = sorted(self.by_id.values(), key=itemgetter('goal_id'))
+        for start in range(0, len(goals), batch_size):
+            yield goals[start:start + batch_size]
+
+    def put_many(self, goals):
+        for goal in goals:
+            goal_id = goal['goal_id']
+            previous = self.by_id.get(goal_id)
+            if previous is not None:
+                del self.by_student[previous['student_id']][goal_id]
+                del self.by_status[self.filed_status.pop(goal_id)][goal_id]
+            self.by_id[goal_id] = goal
+            self.by_student.setdefault(goal['student_id'], {})[goal_id] = goal
+            self._file_status(goal)
+            if goal_id in self.metric_columns.rows:
+                self.metric_columns.update(goal)
+            else:
+                self.metric_columns.append(goal)
+            self.next_goal_id = max(self.next_goal_id, goal_id + 1)
+
+    def count_by_status(self):
+        return {status: len(goals) for status, goals in self.by_status.items() if goals}
+
+    def columns(self):
+        return self.metric_columns.view()
+
+    def append_progress(self, goal, entry):
+        # The goal dict is the stored object, so its fields are already updated; re-index them
+        record_progress(goal, [entry])
+        self._file_status(goal)
+        self.metric_columns.update(goal)
+
+    def append_progress_many(self, changes):
+        changes = list(changes)
+        for goal, entries in changes:
+            record_progress(goal, entries)
+            self._file_status(goal)
+        # Progress only moves the current value and status
+        self.metric_columns.update_many([goal for goal, _ in changes], names=['current_value'])
+
+    def compact_history(self, before, resolution=HISTORY_RESOLUTION):
+        return sum(goal['progress_history'].compact(before, resolution) for goal in self.by_id.values())
+
+    def clear(self):
+        self.__init__()
+
+
+class SQLiteGoalStore(GoalStore):
+    """
+    Goals in a SQLite database, indexed by goal, student and status
+
+    Each thread (Streamlit session) gets its own connection; the database runs in WAL
+    mode so readers never wait for a writer, and writes take the lock up front
+    (BEGIN IMMEDIATE) so concurrent sessions queue instead of failing mid-transaction.
+    """
+
+    _shared = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, path=GOALS_DB_PATH, timeout=10.0):
+        """
+        Args:
+            path: Database file, or ':memory:' for a private in-memory database
+            timeout: Seconds a write waits for another writer before failing
+        """
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        self._lock = threading.RLock()
+        self._commits = 0  # bumped by every write transaction, invalidates cached columnar views
+        # An in-memory database exists only on its own connection, so all threads share one
+        self._memory_conn = self._connect() if path == ':memory:' else None
+        with self._connection() as conn:
+            conn.executescript(SCHEMA_SQL)
+
+    @classmethod
+    def shared(cls, path=GOALS_DB_PATH):
+        """One store per database file per process, reused across reruns and sessions"""
+        with cls._shared_lock:
+            if path not in cls._shared:
+                cls._shared[path] = cls(path)
+            return cls._shared[path]
+
+    def _connect(self):
+        directory = os.path.dirname(self.path) if self.path != ':memory:' else ''
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None,
+                               check_same_thread=self.path != ':memory:')
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys = ON")
+        if self.path != ':memory:':
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+        return conn
+
+    @contextmanager
+    def _connection(self):
+        """This thread's connection (the shared one, under the lock, for ':memory:')"""
+        if self._memory_conn is not None:
+            with self._lock:
+                yield self._memory_conn
+            return
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        yield conn
+
+    @contextmanager
+    def batch(self):
+        """One write transaction for everything inside the block (nested blocks join it)"""
+        with self._connection() as conn:
+            depth = getattr(self._local, 'depth', 0)
+            if depth == 0:
+                conn.execute("BEGIN IMMEDIATE")
+            self._local.depth = depth + 1
+            try:
+                yield self
+            except BaseException:
+                self._local.depth = depth
+                if depth == 0:
+                    conn.execute("ROLLBACK")
+                raise
+            self._local.depth = depth
+            if depth == 0:
+                conn.execute("COMMIT")
+                with self._lock:
+                    self._commits += 1
+
+    def add(self, goal):
+        row = [plain(goal.get(col)) for col in GOAL_COLUMNS[1:]]
+        row = [value.isoformat() if isinstance(value, datetime) else value for value in row]
+        with self.batch(), self._connection() as conn:
+            cursor = conn.execute(
+                f"INSERT INTO goals ({', '.join(GOAL_COLUMNS[1:])}, milestones) "
+                f"VALUES ({', '.join('?' * len(GOAL_COLUMNS))})",
+                row + [json.dumps(goal['milestones'])])
+            goal['goal_id'] = cursor.lastrowid
+            conn.executemany("INSERT INTO progress (goal_id, date, value, notes) VALUES (?, ?, ?, ?)",
+                             [self._progress_row(goal['goal_id'], entry) for entry in goal['progress_history']])
+        return goal['goal_id']
+
+    def add_many(self, goals):
+        goals = list(goals)
+        with self.batch(), self._connection() as conn:
+            # The write lock is held from BEGIN IMMEDIATE, so the next IDs can be assigned here
+            first_id = conn.execute("SELECT COALESCE(MAX(goal_id), 0) + 1 FROM goals").fetchone()[0]
+            rows, progress = [], []
+            for goal_id, goal in enumerate(goals, first_id):
+                goal['goal_id'] = goal_id
+                row = [plain(goal.get(col)) for col in GOAL_COLUMNS]
+                rows.append([value.isoformat() if isinstance(value, datetime) else value for value in row]
+                            + [json.dumps(goal['milestones'])])
+                progress.extend(self._progress_row(goal_id, entry) for entry in goal['progress_history'])
+            conn.executemany(f"INSERT INTO goals ({', '.join(GOAL_COLUMNS)}, milestones) "
+                             f"VALUES ({', '.join('?' * (len(GOAL_COLUMNS) + 1))})", rows)
+            conn.executemany("INSERT INTO progress (goal_id, date, value, notes) VALUES (?, ?, ?, ?)", progress)
+        return [goal['goal_id'] for goal in goals]
+
+    def get(self, goal_id):
+        goals = self._select("goal_id = ?", [plain(goal_id)])
+        return goals[0] if goals else None
+
+    def iter_goals(self, batch_size=1000):
+        last = 0
+        while True:
+            with self._connection() as conn:
+                bound = conn.execute("SELECT MAX(goal_id) FROM (SELECT goal_id FROM goals WHERE goal_id > ? "
+                                     "ORDER BY goal_id LIMIT ?)", [last, batch_size]).fetchone()[0]
+            if bound is None:
+                return
+            yield self._select("goal_id > ? AND goal_id <= ?", [last, bound])
+            last = bound
+
+    def put_many(self, goals):
+        goals = list(goals)
+        goal_ids = [plain(goal['goal_id']) for goal in goals]
+        rows, progress = [], []
+        for goal in goals:
+            row = [plain(goal.get(col)) for col in GOAL_COLUMNS]
+            rows.append([value.isoformat() if isinstance(value, (date, datetime)) else value for value in row]
+                        + [json.dumps(goal['milestones'])])
+            history = goal['progress_history'].to_dict()
+            progress.extend((goal['goal_id'], day, value, notes)
+                            for day, value, notes in zip(history['date'], history['value'], history['notes']))
+        with self.batch(), self._connection() as conn:
+            for start in range(0, len(goal_ids), SQL_IN_CHUNK):
+                chunk = goal_ids[start:start + SQL_IN_CHUNK]
+                conn.execute(f"DELETE FROM progress WHERE goal_id IN ({', '.join('?' * len(chunk))})", chunk)
+            conn.executemany(f"INSERT OR REPLACE INTO goals ({', '.join(GOAL_COLUMNS)}, milestones) "
+                             f"VALUES ({', '.join('?' * (len(GOAL_COLUMNS) + 1))})", rows)
+            conn.executemany("INSERT INTO progress (goal_id, date, value, notes) VALUES (?, ?, ?, ?)", progress)
+
+    def get_many(self, goal_ids):
+        goal_ids = [plain(goal_id) for goal_id in goal_ids]
+        goals = {}
+        for start in range(0, len(goal_ids), SQL_IN_CHUNK):
+            chunk = goal_ids[start:start + SQL_IN_CHUNK]
+            goals.update((goal['goal_id'], goal)
+                         for goal in self._select(f"goal_id IN ({', '.join('?' * len(chunk))})", chunk))
+        return goals
+
+    def find(self, student_id=None, status=None):
+        clauses, params = [], []
+        if student_id is not None:
+            clauses.append("student_id = ?")
+            params.append(plain(student_id))
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status)
+        return self._select(" AND ".join(clauses) or "1", params)
+
+    def student_goal_types(self, status):
+        with self._connection() as conn:
+            rows = conn.execute("SELECT student_id, goal_type FROM goals WHERE status = ?", [status]).fetchall()
+        return {tuple(row) for row in rows}
+
+    def count_by_status(self):
+        columns = self.columns()
+        counts = np.bincount(columns['status'], minlength=len(columns['statuses']))
+        return {status: int(n) for status, n in zip(columns['statuses'], counts) if n}
+
+    def columns(self):
+        """
+        Columnar view of every goal, cached per thread until the database changes
+
+        PRAGMA data_version moves when another connection commits; commits on this
+        store's own connections are counted in _commits.
+        """
+        with self._connection() as conn:
+            version = (conn.execute("PRAGMA data_version").fetchone()[0], self._commits)
+            cached = getattr(self._local, 'columns', None)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+            rows = conn.execute(f"SELECT {', '.join(METRIC_COLUMNS)}, status FROM goals ORDER BY goal_id").fetchall()
+        columns = GoalColumns.from_rows([tuple(row) for row in rows])
+        self._local.columns = (version, columns)
+        return columns
+
+    def append_progress(self, goal, entry):
+        with self.batch(), self._connection() as conn:
+            conn.execute("INSERT INTO progress (goal_id, date, value, notes) VALUES (?, ?, ?, ?)",
+                         self._progress_row(goal['goal_id'], entry))
+            conn.execute("UPDATE goals SET current_value = ?, status = ?, achievement_date = ?, milestones = ? "
+                         "WHERE goal_id = ?",
+                         [plain(goal['current_value']), goal['status'], goal.get('achievement_date'),
+                          json.dumps(goal['milestones']), goal['goal_id']])
+        record_progress(goal, [entry])
+
+    def append_progress_many(self, changes):
+        changes = list(changes)
+        with self.batch(), self._connection() as conn:
+            conn.executemany("INSERT INTO progress (goal_id, date, value, notes) VALUES (?, ?, ?, ?)",
+                             [self._progress_row(goal['goal_id'], entry) for goal, entries in changes
+                              for entry in entries])
+            conn.executemany("UPDATE goals SET current_value = ?, status = ?, achievement_date = ?, milestones = ? "
+                             "WHERE goal_id = ?",
+                             [[plain(goal['current_value']), goal['status'], goal.get('achievement_date'),
+                               json.dumps(goal['milestones']), goal['goal_id']] for goal, _ in changes])
+        for goal, entries in changes:
+            record_progress(goal, entries)
+
+    def compact_history(self, before, resolution=HISTORY_RESOLUTION):
+        with self.batch(), self._connection() as conn:
+            rows = conn.execute("SELECT rowid, goal_id, date FROM progress WHERE date < ? ORDER BY goal_id, rowid",
+                                [before.isoformat()]).fetchall()
+            if not rows:
+                return 0
+            rowids, goal_ids, dates = zip(*rows)
+            keep = last_per_period(to_datetime64(dates), np.array(goal_ids, dtype=np.int64), before, resolution)
+            removed = np.array(rowids, dtype=np.int64)[~keep].tolist()
+            conn.executemany("DELETE FROM progress WHERE rowid = ?", [(rowid,) for rowid in removed])
+        return len(removed)
+
+    def clear(self):
+        with self.batch(), self._connection() as conn:
+            conn.execute("DELETE FROM progress")
+            conn.execute("DELETE FROM goals")
+
+    @staticmethod
+    def _progress_row(goal_id, entry):
+        date = entry['date']
+        return (goal_id, date.isoformat() if isinstance(date, datetime) else date,
+                plain(entry['value']), entry.get('notes'))
+
+    def _select(self, where, params):
+        """Goals matching a WHERE clause, with their milestones and progress history"""
+        with self._connection() as conn:
+            rows = conn.execute(f"SELECT * FROM goals WHERE {where} ORDER BY goal_id", params).fetchall()
+            if not rows:
+                return []
+            history = conn.execute(
+                f"SELECT goal_id, date, value, notes FROM progress "
+                f"WHERE goal_id IN (SELECT goal_id FROM goals WHERE {where}) ORDER BY goal_id, rowid",
+                params).fetchall()
+
+        goals = {}
+        for row in rows:
+            goal = {col: row[col] for col in GOAL_COLUMNS}
+            for col in DATE_COLUMNS:
+                goal[col] = datetime.fromisoformat(goal[col]) if goal[col] else goal[col]
+            if goal['achievement_date'] is None:
+                del goal['achievement_date']
+            goal['milestones'] = json.loads(row['milestones'])
+            goals[goal['goal_id']] = goal
+        # History rows arrive grouped by goal; parse every date at once, then split per goal
+        goal_ids, dates, values, notes = zip(*history) if history else ((), (), (), ())
+        goal_ids = np.array(goal_ids, dtype=np.int64)
+        times = to_datetime64(dates)
+        starts = np.flatnonzero(np.r_[True, goal_ids[1:] != goal_ids[:-1]]) if len(goal_ids) else []
+        ends = list(starts[1:]) + [len(goal_ids)]
+        for start, end in zip(starts, ends):
+            goals[int(goal_ids[start])]['progress_history'] = ProgressHistory(
+                times[start:end], values[start:end], notes[start:end])
+        for goal in goals.values():
+            if 'progress_history' not in goal:
+                goal['progress_history'] = ProgressHistory()
+        return list(goals.values())
@@ -7,14 +7,32 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import json
+from class_stats import ClassStats
+from correlation_service import ID_COLUMN
+from data_manager import StudentIndex
+from goal_export import EXPORT_BATCH_GOALS, GoalExporter
+from goal_store import SQLiteGoalStore
+from progress_history import HISTORY_KEEP_DAYS, HISTORY_RESOLUTION, ProgressHistory
+
+# Suggested goals are listed most urgent first
+PRIORITY_ORDER = {'High': 0, 'Medium': 1, 'Low': 2}
 
 class GoalTracker:
     """Manage academic goals and track progress over time - Multi-student support"""
     
-    def __init__(self):
-        """Initialize goal tracker for managing goals across all students"""
-        self.goals = []
-        self.next_goal_id = 1
+    def __init__(self, store=None):
+        """
+        Initialize goal tracker for managing goals across all students
+
+        Args:
+            store: GoalStore backend (default: the shared SQLite database at GOALS_DB_PATH)
+        """
+        self.store = store if store is not None else SQLiteGoalStore.shared()
+
+    @property
+    def goals(self):
+        """Every stored goal, in creation order"""
+        return self.store.find()
     
     def create_goal(self, student_id, goal_type, current_value, target_value, 
                    timeline_days=90, description="", priority="medium", target_date=None):
@@ -34,9 +52,6 @@ class GoalTracker:
         Returns:
             goal_id: ID of created goal
         """
-        goal_id = self.next_goal_id
-        self.next_goal_id += 1
-        
         # Parse target date if provided, otherwise calculate from timeline_days
         if target_date:
             try:
@@ -47,7 +62,6 @@ class GoalTracker:
             t_date = datetime.now() + timedelta(days=timeline_days)
         
         goal = {
-            'goal_id': goal_id,
             'student_id': student_id,
             'goal_type': goal_type,
             'current_value': current_value,
@@ -60,11 +74,122 @@ class GoalTracker:
             'target_date': t_date,
             'status': 'active',
             'milestones': self._generate_milestones(current_value, target_value, timeline_days),
-            'progress_history': [{'date': datetime.now().isoformat(), 'value': current_value}]
+            'progress_history': ProgressHistory([datetime.now()], [current_value])
         }
         
-        self.goals.append(goal)
-        return goal_id
+        return self.store.add(goal)
+    
+    def create_goals(self, goals):
+        """
+        Create many goals in one write (e.g. a cohort's suggested goals or an SIS export)
+        
+        Args:
+            goals: DataFrame, Arrow table or records with student_id, goal_type, current_value
+                   and target_value columns, and optionally timeline_days, description,
+                   priority, created_date and target_date (same defaults as create_goal;
+                   missing descriptions and dates, including NaN/None/NaT, get the defaults)
+        
+        Returns:
+            list: goal_ids of the created goals, in row order
+        
+        Raises:
+            ValueError: If a created_date or target_date is given but is not a date
+        """
+        table = self._as_frame(goals)
+        n = len(table)
+        now = datetime.now()
+        
+        def column(name, default):
+            return table[name].tolist() if name in table.columns else [default] * n
+        
+        current = table['current_value'].to_numpy(dtype=np.float64)
+        target = table['target_value'].to_numpy(dtype=np.float64)
+        timeline = table['timeline_days'].to_numpy(dtype=np.int64) if 'timeline_days' in table.columns \
+            else np.full(n, 90, dtype=np.int64)
+        milestone_days, milestone_values = self._milestone_table(current, target, timeline)
+        created_dates = [now if pd.isna(date) else date.to_pydatetime()
+                         for date in self._date_column(table, 'created_date')]
+        target_dates = self._date_column(table, 'target_date')
+        descriptions = table['description'].fillna("").tolist() if 'description' in table.columns else [""] * n
+        
+        records = zip(column('student_id', None), column('goal_type', None), current.tolist(), target.tolist(),
+                      timeline.tolist(), descriptions, column('priority', "medium"), created_dates, target_dates,
+                      milestone_days.tolist(), milestone_values.tolist())
+        new_goals = [{
+            'student_id': student_id,
+            'goal_type': goal_type,
+            'current_value': current_value,
+            'target_value': target_value,
+            'baseline_value': current_value,
+            'timeline_days': timeline_days,
+            'description': description or f"Improve {goal_type} from {current_value} to {target_value}",
+            'priority': priority,
+            'created_date': created,
+            'target_date': created + timedelta(days=timeline_days) if pd.isna(t_date) else t_date.to_pydatetime(),
+            'status': 'active',
+            'milestones': [{'day': day, 'target_value': value, 'achieved': False, 'achievement_date': None}
+                           for day, value in zip(days, values)],
+            'progress_history': ProgressHistory([created], [current_value])
+        } for (student_id, goal_type, current_value, target_value, timeline_days, description, priority,
+               created, t_date, days, values) in records]
+        
+        return self.store.add_many(new_goals)
+    
+    @staticmethod
+    def _date_column(table, name):
+        """
+        Column of dates as Timestamps, NaT where the value is missing (None, NaN, NaT or "")
+        
+        Raises:
+            ValueError: If a value is present but cannot be parsed as a date
+        """
+        if name not in table.columns:
+            return pd.Series(pd.NaT, index=table.index)
+        values = table[name].mask(table[name].eq(""))
+        dates = pd.to_datetime(values, errors='coerce')
+        invalid = dates.isna() & values.notna()
+        if invalid.any():
+            rows = table.index[invalid].tolist()
+            raise ValueError(f"{name} is not a date in rows {rows[:5]}{'...' if len(rows) > 5 else ''}: "
+                             f"{values[invalid].iloc[0]!r}")
+        return dates
+    
+    def without_active_goals(self, goals):
+        """
+        Rows of a goal table whose student does not already have an active goal of that type
+        
+        Args:
+            goals: DataFrame with student_id and goal_type columns (e.g. suggest_goals_for_cohort)
+        
+        Returns:
+            DataFrame: The remaining rows, in their original order
+        """
+        active = self.store.student_goal_types('active')
+        if not active or goals.empty:
+            return goals
+        pairs = pd.MultiIndex.from_arrays([goals['student_id'], goals['goal_type']])
+        return goals[~pairs.isin(list(active))]
+    
+    @staticmethod
+    def _as_frame(table):
+        """DataFrame from a DataFrame, Arrow table or list of records"""
+        if isinstance(table, pd.DataFrame):
+            return table
+        return table.to_pandas() if hasattr(table, 'to_pandas') else pd.DataFrame(table)
+    
+    @staticmethod
+    def _milestone_table(current, target, days):
+        """
+        Milestones of many goals at once, by the same rules as _generate_milestones
+        
+        Returns:
+            tuple: (day, target_value) arrays with one row of 3 checkpoints per goal
+        """
+        days = days[:, None]
+        checkpoints = np.where(days >= 90, np.array([30, 60, 90]), np.hstack([days // 3, 2 * days // 3, days]))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            values = current[:, None] + (target - current)[:, None] * (checkpoints / days)
+        return checkpoints, values
     
     def _generate_milestones(self, current, target, days):
         """Generate intermediate milestones (30/60/90 day checkpoints)"""
@@ -96,41 +221,150 @@ class GoalTracker:
             notes: Optional progress notes
             date: Optional date (defaults to now)
         """
-        goal = next((g for g in self.goals if g['goal_id'] == goal_id), None)
-        if not goal:
-            return {"error": "Goal not found"}
-        
-        update_date = date or datetime.now()
-        update_date_str = update_date.isoformat() if isinstance(update_date, datetime) else str(update_date)
-        
-        # Add to progress history
-        goal['progress_history'].append({
-            'date': update_date_str,
-            'value': new_value,
-            'notes': notes
-        })
-        
-        # Update current value
-        goal['current_value'] = new_value
-        
-        # Check milestones
-        for milestone in goal['milestones']:
-            if not milestone['achieved'] and new_value >= milestone['target_value']:
-                milestone['achieved'] = True
-                milestone['achievement_date'] = update_date_str
-        
-        # Check if goal is achieved
-        if new_value >= goal['target_value']:
-            goal['status'] = 'achieved'
-            goal['achievement_date'] = update_date_str
-        elif update_date > goal['target_date'] and new_value < goal['target_value']:
-            goal['status'] = 'missed'
+        # Read the goal inside the write transaction, so milestone and status changes another
+        # session commits in the meantime are not overwritten by this (stale) copy
+        with self.store.batch():
+            goal = self.store.get(goal_id)
+            if not goal:
+                return {"error": "Goal not found"}
+            
+            update_date = date or datetime.now()
+            update_date_str = update_date.isoformat() if isinstance(update_date, datetime) else str(update_date)
+            
+            # Update current value
+            goal['current_value'] = new_value
+            
+            # Check milestones
+            for milestone in goal['milestones']:
+                if not milestone['achieved'] and new_value >= milestone['target_value']:
+                    milestone['achieved'] = True
+                    milestone['achievement_date'] = update_date_str
+            
+            # Check if goal is achieved
+            if new_value >= goal['target_value']:
+                goal['status'] = 'achieved'
+                goal['achievement_date'] = update_date_str
+            elif update_date > goal['target_date'] and new_value < goal['target_value']:
+                goal['status'] = 'missed'
+            
+            # Add to progress history and persist the changed fields together
+            self.store.append_progress(goal, {
+                'date': update_date_str,
+                'value': new_value,
+                'notes': notes
+            })
         
         return {"success": True, "goal_id": goal_id, "new_value": new_value}
     
+    def ingest_progress(self, updates):
+        """
+        Apply many progress updates in one write (e.g. the nightly SIS export)
+        
+        Rows are applied in order, as if update_progress were called for each one, but
+        milestone and status checks run as array operations over all rows.
+        
+        Args:
+            updates: DataFrame, Arrow table or records with goal_id and value columns, and
+                     optionally date (default now, also for rows with a missing date) and notes
+        
+        Returns:
+            dict: 'updated' goals, 'entries' recorded, 'achieved' goals that reached their
+                  target, and 'missing' goal_ids that were not found
+        """
+        table = self._as_frame(updates)
+        # As in update_progress, the goals are read and written back in one write transaction
+        with self.store.batch():
+            return self._apply_progress(table)
+    
+    def _apply_progress(self, table):
+        """ingest_progress for a DataFrame, inside the caller's write transaction"""
+        goal_ids = table['goal_id'].to_numpy(dtype=np.int64)
+        goals = self.store.get_many(np.unique(goal_ids).tolist())
+        found = np.isin(goal_ids, np.fromiter(goals, dtype=np.int64, count=len(goals)))
+        missing = np.unique(goal_ids[~found]).tolist()
+        
+        # Group rows by goal, keeping each goal's rows in their original order
+        order = np.flatnonzero(found)[np.argsort(goal_ids[found], kind='stable')]
+        ids = goal_ids[order]
+        values = table['value'].to_numpy(dtype=np.float64)[order]
+        now = np.datetime64(datetime.now())
+        dates = pd.to_datetime(table['date']).to_numpy()[order] if 'date' in table.columns \
+            else np.full(len(order), now)
+        dates = np.where(np.isnat(dates), now, dates)  # e.g. a blank cell in an uploaded CSV
+        notes = table['notes'].fillna("").astype(str).to_numpy()[order] if 'notes' in table.columns \
+            else np.full(len(order), "", dtype=object)
+        unique_ids, starts = np.unique(ids, return_index=True)
+        group = np.repeat(np.arange(len(unique_ids)), np.diff(np.append(starts, len(ids))))
+        goal_list = [goals[goal_id] for goal_id in unique_ids.tolist()]
+        
+        # Status transitions: the last row that reaches the target or passes the target date decides
+        target = np.array([goal['target_value'] for goal in goal_list], dtype=np.float64)[group]
+        target_date = np.array([goal['target_date'] for goal in goal_list], dtype='datetime64[us]')[group]
+        reached = values >= target
+        missed = ~reached & (dates > target_date)
+        last_transition = self._group_rows(reached | missed, group, len(goal_list), last=True)
+        last_reached = self._group_rows(reached, group, len(goal_list), last=True)
+        
+        # Milestones: the first row at or above each milestone not achieved yet
+        milestone_rows = []
+        for k in range(max((len(goal['milestones']) for goal in goal_list), default=0)):
+            threshold = np.array([goal['milestones'][k]['target_value']
+                                  if k < len(goal['milestones']) and not goal['milestones'][k]['achieved']
+                                  else np.inf for goal in goal_list], dtype=np.float64)
+            milestone_rows.append(self._group_rows(values >= threshold[group], group, len(goal_list)))
+        
+        date_strs = [date.isoformat() for date in pd.DatetimeIndex(dates).to_pydatetime()]
+        value_list, note_list = values.tolist(), notes.tolist()
+        ends = np.append(starts[1:], len(ids)).tolist()
+        changes, achieved = [], 0
+        for g, (goal, start, end) in enumerate(zip(goal_list, starts.tolist(), ends)):
+            goal['current_value'] = value_list[end - 1]
+            for k, rows in enumerate(milestone_rows):
+                if rows[g] >= 0:
+                    goal['milestones'][k]['achieved'] = True
+                    goal['milestones'][k]['achievement_date'] = date_strs[rows[g]]
+            if last_reached[g] >= 0:
+                goal['achievement_date'] = date_strs[last_reached[g]]
+            if last_transition[g] >= 0:
+                status = 'achieved' if reached[last_transition[g]] else 'missed'
+                achieved += status == 'achieved' and goal['status'] != 'achieved'
+                goal['status'] = status
+            changes.append((goal, [{'date': date_strs[r], 'value': value_list[r], 'notes': note_list[r]}
+                                   for r in range(start, end)]))
+        
+        self.store.append_progress_many(changes)
+        return {'updated': len(changes), 'entries': len(ids), 'achieved': achieved, 'missing': missing}
+    
+    def compact_history(self, older_than_days=HISTORY_KEEP_DAYS, resolution=HISTORY_RESOLUTION):
+        """
+        Reduce old progress entries to the last one per day, week or month
+        
+        Run after the nightly import so history stays roughly constant in size per goal.
+        
+        Args:
+            older_than_days: Entries newer than this many days are kept as recorded
+            resolution: 'D', 'W' or 'M'
+        
+        Returns:
+            int: Number of entries removed
+        """
+        before = datetime.now() - timedelta(days=older_than_days)
+        return self.store.compact_history(before, resolution)
+    
+    @staticmethod
+    def _group_rows(mask, group, n_groups, last=False):
+        """First (or last) row of each group where mask is set, -1 where it never is"""
+        rows = np.flatnonzero(mask)
+        if last:
+            rows = rows[::-1]
+        groups, index = np.unique(group[rows], return_index=True)
+        result = np.full(n_groups, -1, dtype=np.int64)
+        result[groups] = rows[index]
+        return result.tolist()
+    
     def get_goal_status(self, goal_id):
         """Get detailed status of a goal"""
-        goal = next((g for g in self.goals if g['goal_id'] == goal_id), None)
+        goal = self.store.get(goal_id)
         if not goal:
             return None
         
@@ -150,6 +384,7 @@ class GoalTracker:
         status = {
             'goal': goal,
             'goal_id': goal_id,
+            'status': goal['status'],
             'current_value': goal['current_value'],
             'target_value': goal['target_value'],
             'progress_percentage': progress_pct,
@@ -175,31 +410,32 @@ class GoalTracker:
         Returns:
             List of goals for the student
         """
-        student_goals = [g for g in self.goals if g['student_id'] == student_id]
-        
-        if status_filter:
-            student_goals = [g for g in student_goals if g['status'] == status_filter]
-        
-        return student_goals
+        return self.store.find(student_id=student_id, status=status_filter or None)
     
     def get_all_active_goals(self):
         """Get all active goals"""
-        return [g for g in self.goals if g['status'] == 'active']
+        return self.store.find(status='active')
     
-    def get_achievement_summary(self):
-        """Get summary of all goals"""
-        total_goals = len(self.goals)
-        achieved = len([g for g in self.goals if g['status'] == 'achieved'])
-        active = len([g for g in self.goals if g['status'] == 'active'])
+    def get_achievement_counts(self):
+        """Goal counts and achievement rate from the store's status counts, without loading any goal"""
+        counts = self.store.count_by_status()
+        total_goals = sum(counts.values())
+        achieved = counts.get('achieved', 0)
+        active = counts.get('active', 0)
         
         return {
             'total_goals': total_goals,
             'achieved': achieved,
             'active': active,
-            'achievement_rate': (achieved / total_goals * 100) if total_goals > 0 else 0,
-            'goals': self.goals
+            'achievement_rate': (achieved / total_goals * 100) if total_goals > 0 else 0
         }
     
+    def get_achievement_summary(self):
+        """Get summary of all goals (get_achievement_counts plus every stored goal under 'goals')"""
+        summary = self.get_achievement_counts()
+        summary['goals'] = self.goals
+        return summary
+    
     def generate_progress_report(self, goal_id):
         """Generate detailed progress report for a goal"""
         status = self.get_goal_status(goal_id)
@@ -258,159 +494,195 @@ MILESTONES:
         
         return report
     
-    def suggest_goals(self, df, student_id):
+    def suggest_goals(self, df, student_id, class_stats=None):
         """
         Suggest goals based on student performance
         
         Args:
             df: DataFrame with all student data
             student_id: ID of the student
+            class_stats: ClassStats snapshot of df (default: the shared snapshot for df)
         
         Returns:
             List of suggested goals
         """
-        # Find student data
-        if 'Student_ID' in df.columns:
-            student_data = df[df['Student_ID'] == student_id]
-        else:
-            student_data = df.iloc[[student_id - 1]] if student_id <= len(df) else None
+        suggestions = self.suggest_goals_for_cohort(df, [student_id], class_stats)
+        return [{
+            'goal_type': suggestion['goal_type'],
+            'current_value': suggestion['current_value'],
+            'target_value': suggestion['target_value'],
+            'timeline_days': suggestion['timeline_days'],
+            'reason': suggestion['description'],
+            'priority': suggestion['priority']
+        } for suggestion in suggestions.to_dict('records')]
+        
+    @staticmethod
+    def suggest_goals_for_cohort(df, student_ids=None, class_stats=None):
+        """
+        Suggest goals for every student of a cohort at once
         
-        if student_data is None or len(student_data) == 0:
-            return []
+        Exam Score, Attendance and Study Hours thresholds are applied to whole columns,
+        against one class mean from the shared ClassStats snapshot.
         
-        student_row = student_data.iloc[0]
-        suggestions = []
+        Args:
+            df: DataFrame with all student data
+            student_ids: IDs of the cohort (None = every student); unknown IDs are skipped
+            class_stats: ClassStats snapshot of df (default: the shared snapshot for df)
         
-        # Exam score goal
-        if 'Exam_Score' in df.columns:
-            current_score = student_row['Exam_Score']
-            class_avg = df['Exam_Score'].mean()
-            
-            if current_score < 70:
-                target = 70
-                priority = 'High'
-                reason = "Reach passing grade (70) - Essential for academic progress"
-            elif current_score < class_avg:
-                target = class_avg + 5
-                priority = 'Medium'
-                reason = f"Score above class average ({class_avg:.1f}) - Shows improvement"
-            else:
-                target = min(current_score + 10, 98)
-                priority = 'Medium'
-                reason = "Maintain excellence and aim for top performance"
-            
-            suggestions.append({
-                'goal_type': 'Exam Score',
-                'current_value': float(current_score),
-                'target_value': float(target),
-                'timeline_days': 90,
-                'reason': reason,
-                'priority': priority
-            })
+        Returns:
+            DataFrame: One row per suggestion (student_id, goal_type, current_value, target_value,
+                       timeline_days, description, priority), each student's sorted by priority;
+                       ready for create_goals
+        """
+        if student_ids is None:
+            positions = np.arange(len(df))
+        else:
+            positions = StudentIndex.for_frame(df).positions(student_ids)
+            positions = positions[positions >= 0]
+        ids = df[ID_COLUMN].to_numpy()[positions] if ID_COLUMN in df.columns else positions + 1
         
-        # Attendance goal
-        if 'Attendance' in df.columns:
-            current_attendance = student_row['Attendance']
-            
-            if current_attendance < 85:
-                target = 90
-                priority = 'High'
-                reason = "Achieve 90% attendance - Critical for academic success"
-            elif current_attendance < 95:
-                target = 95
-                priority = 'Medium'
-                reason = "Reach 95% attendance - Excellent performance level"
-            else:
-                target = 98
-                priority = 'Low'
-                reason = "Maintain near-perfect attendance"
-            
-            suggestions.append({
-                'goal_type': 'Attendance',
-                'current_value': float(current_attendance),
-                'target_value': float(target),
-                'timeline_days': 60,
-                'reason': reason,
-                'priority': priority
-            })
+        def values(column):
+            return df[column].to_numpy(dtype=np.float64)[positions]
         
-        # Study hours goal
+        # (goal_type, current values, [(condition, target, priority, reason), ...], timeline_days);
+        # the first matching condition wins, the last entry applies otherwise
+        rules = []
+        if 'Exam_Score' in df.columns:
+            current = values('Exam_Score')
+            if class_stats is None:
+                class_stats = ClassStats.for_frame(df)
+            class_avg = class_stats['Exam_Score'].mean
+            rules.append(('Exam Score', current, [
+                (current < 70, 70, 'High', "Reach passing grade (70) - Essential for academic progress"),
+                (current < class_avg, class_avg + 5, 'Medium',
+                 f"Score above class average ({class_avg:.1f}) - Shows improvement"),
+                (None, np.minimum(current + 10, 98), 'Medium', "Maintain excellence and aim for top performance"),
+            ], 90))
+        if 'Attendance' in df.columns:
+            current = values('Attendance')
+            rules.append(('Attendance', current, [
+                (current < 85, 90, 'High', "Achieve 90% attendance - Critical for academic success"),
+                (current < 95, 95, 'Medium', "Reach 95% attendance - Excellent performance level"),
+                (None, 98, 'Low', "Maintain near-perfect attendance"),
+            ], 60))
         if 'Hours_Studied' in df.columns:
-            current_hours = student_row['Hours_Studied']
+            current = values('Hours_Studied')
+            rules.append(('Study Hours', current, [
+                (current < 15, 18, 'High', "Increase to recommended 15-20 hours/week for better results"),
+                (current < 20, 20, 'Medium', "Optimize study time to 20 hours/week for maximum effectiveness"),
+                (None, current, 'Low', "Maintain consistent study schedule"),
+            ], 30))
             
-            if current_hours < 15:
-                target = 18
-                priority = 'High'
-                reason = "Increase to recommended 15-20 hours/week for better results"
-            elif current_hours < 20:
-                target = 20
-                priority = 'Medium'
-                reason = "Optimize study time to 20 hours/week for maximum effectiveness"
-            else:
-                target = current_hours
-                priority = 'Low'
-                reason = "Maintain consistent study schedule"
+        frames = []
+        for goal_type, current, cases, timeline_days in rules:
+            conditions = [condition for condition, _, _, _ in cases[:-1]]
+            _, default_target, default_priority, default_reason = cases[-1]
+            frames.append(pd.DataFrame({
+                'student_id': ids,
+                'goal_type': goal_type,
+                'current_value': current,
+                'target_value': np.select(conditions, [target for _, target, _, _ in cases[:-1]],
+                                          default_target).astype(np.float64),
+                'timeline_days': timeline_days,
+                'description': np.select(conditions, [reason for _, _, _, reason in cases[:-1]], default_reason),
+                'priority': np.select(conditions, [priority for _, _, priority, _ in cases[:-1]], default_priority),
+            }))
+        if not frames:
+            return pd.DataFrame(columns=['student_id', 'goal_type', 'current_value', 'target_value',
+                                         'timeline_days', 'description', 'priority'])
             
-            suggestions.append({
-                'goal_type': 'Study Hours',
-                'current_value': float(current_hours),
-                'target_value': float(target),
-                'timeline_days': 30,
-                'reason': reason,
-                'priority': priority
-            })
+        # Students in cohort order; each student's goals by priority, ties in rule order
+        suggestions = pd.concat(frames, ignore_index=True)
+        n = len(positions)
+        student_order = np.tile(np.arange(n), len(frames))
+        priority_rank = suggestions['priority'].map(PRIORITY_ORDER).to_numpy()
+        order = np.lexsort((np.repeat(np.arange(len(frames)), n), priority_rank, student_order))
+        return suggestions.iloc[order].reset_index(drop=True)
+    
+    def export_goals_to_json(self, filename='goals.json'):
+        """Export goals to JSON file (one array; see export_goals for streaming backups)"""
+        with open(filename, 'w') as f:
+            f.write('[')
+            first = True
+            for goals in self.store.iter_goals(EXPORT_BATCH_GOALS):
+                for goal in goals:
+                    f.write(('\n' if first else ',\n') + json.dumps(GoalExporter.goal_record(goal), indent=2))
+                    first = False
+            f.write('\n]\n')
         
-        # Sort by priority
-        priority_order = {'High': 0, 'Medium': 1, 'Low': 2}
-        suggestions.sort(key=lambda x: priority_order.get(x['priority'], 2))
+        return filename
+    
+    def export_goals(self, file, format=None):
+        """
+        Stream every goal to a JSON Lines or Parquet backup, a batch of goals at a time
         
-        return suggestions
+        Args:
+            file: Path or writable file object
+            format: 'jsonl' or 'parquet' (default: from the file extension)
         
-        return suggestions
+        Returns:
+            int: Number of goals written
+        """
+        return GoalExporter.export_goals(self.store, file, format)
     
-    def export_goals_to_json(self, filename='goals.json'):
-        """Export goals to JSON file"""
-        # Convert datetime objects to strings
-        export_data = []
-        for goal in self.goals:
-            goal_copy = goal.copy()
-            goal_copy['created_date'] = goal_copy['created_date'].isoformat()
-            goal_copy['target_date'] = goal_copy['target_date'].isoformat()
-            if 'achievement_date' in goal_copy and goal_copy['achievement_date']:
-                goal_copy['achievement_date'] = goal_copy['achievement_date'].isoformat()
-            
-            # Convert progress history dates
-            for entry in goal_copy['progress_history']:
-                entry['date'] = entry['date'].isoformat()
-            
-            # Convert milestone dates
-            for milestone in goal_copy['milestones']:
-                if milestone['achievement_date']:
-                    milestone['achievement_date'] = milestone['achievement_date'].isoformat()
-            
-            export_data.append(goal_copy)
+    def import_goals(self, file, format=None):
+        """
+        Restore goals from an export_goals backup, keeping their IDs
         
-        with open(filename, 'w') as f:
-            json.dump(export_data, f, indent=2)
+        Args:
+            file: Path or readable file object
+            format: 'jsonl' or 'parquet' (default: from the file extension)
         
-        return filename
+        Returns:
+            int: Number of goals restored
+        """
+        return GoalExporter.import_goals(self.store, file, format)
     
+    @staticmethod
+    def progress_arrays(columns, now=None):
+        """
+        Progress and expected progress of every goal, as in get_goal_status
+
+        Args:
+            columns: Columnar goal view from GoalStore.columns()
+            now: Reference time (default now)
+
+        Returns:
+            tuple: (progress_percentage, expected_progress) arrays
+        """
+        now = np.datetime64(now or datetime.now(), 'us')
+        total_improvement = columns['target_value'] - columns['baseline_value']
+        current_improvement = columns['current_value'] - columns['baseline_value']
+        with np.errstate(divide='ignore', invalid='ignore'):
+            progress_pct = np.where(total_improvement != 0, current_improvement / total_improvement * 100, 100.0)
+            # Whole days, rounded down like timedelta.days
+            days_elapsed = (now - columns['created_date']) // np.timedelta64(1, 'D')
+            timeline = columns['timeline_days']
+            expected_progress = np.where(timeline > 0, days_elapsed / timeline * 100, 0.0)
+        return progress_pct, expected_progress
+
     def calculate_goal_metrics(self):
-        """Calculate overall goal achievement metrics"""
-        if not self.goals:
+        """Calculate overall goal achievement metrics (array operations over the store's goal columns)"""
+        columns = self.store.columns()
+        total = len(columns['goal_id'])
+        if total == 0:
             return None
         
-        active_goals = [g for g in self.goals if g['status'] == 'active']
-        achieved_goals = [g for g in self.goals if g['status'] == 'achieved']
+        status = columns['status']
+        active = status == columns['statuses'].index('active')
+        achieved = int(np.count_nonzero(status == columns['statuses'].index('achieved')))
+        progress_pct, expected_progress = self.progress_arrays(columns)
+        on_track = int(np.count_nonzero(progress_pct[active] >= expected_progress[active]))
+        n_active = int(np.count_nonzero(active))
         
         metrics = {
-            'total_goals': len(self.goals),
-            'active_goals': len(active_goals),
-            'achieved_goals': len(achieved_goals),
-            'achievement_rate': len(achieved_goals) / len(self.goals) * 100 if self.goals else 0,
-            'average_progress': np.mean([g.get('progress_percentage', 0) for g in active_goals]) if active_goals else 0,
-            'goals_on_track': len([g for g in active_goals if self.get_goal_status(g['id'])['on_track']]),
-            'goals_behind': len([g for g in active_goals if not self.get_goal_status(g['id'])['on_track']])
+            'total_goals': total,
+            'active_goals': n_active,
+            'achieved_goals': achieved,
+            'achievement_rate': achieved / total * 100,
+            'average_progress': float(progress_pct[active].mean()) if n_active else 0,
+            'goals_on_track': on_track,
+            'goals_behind': n_active - on_track
         }
         
         return metrics
@@ -0,0 +1,181 @@
+"""
+Single-pass Insights Engine
+Computes the performance insights dict from NumPy arrays in one batched pass,
+with correlations served by the shared CorrelationService
+"""
+
+import pandas as pd
+import numpy as np
+from correlation_service import CorrelationService
+
+SCORE_COLUMN = 'Exam_Score'
+STUDY_RANGE_BINS = [0, 10, 15, 20, 25, 50]
+STUDY_RANGE_LABELS = ['0-10', '11-15', '16-20', '21-25', '25+']
+
+
+class InsightsEngine:
+    """Batched replacement for the column-by-column pandas passes in Analytics"""
+
+    @staticmethod
+    def numeric_matrix(df):
+        """Numeric columns of the frame as one float64 matrix (rows x columns)"""
+        # Same columns as select_dtypes(include=[np.number]) without copying the frame
+        numeric_cols = CorrelationService.numeric_columns(df)
+        if not numeric_cols:
+            return numeric_cols, np.empty((len(df), 0))
+        return numeric_cols, df[numeric_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    @staticmethod
+    def rank_predictors(correlations, non_empty=None, top_n=5):
+        """Rank factors by absolute correlation with Exam_Score"""
+        ranked = []
+        for col, corr in correlations.items():
+            if col == SCORE_COLUMN or np.isnan(corr):
+                continue
+            if non_empty is not None and not non_empty.get(col, True):
+                continue
+            ranked.append({
+                'factor': col,
+                'correlation': abs(corr),
+                'direction': 'positive' if corr > 0 else 'negative'
+            })
+        ranked.sort(key=lambda x: x['correlation'], reverse=True)
+        return ranked[:top_n]
+
+    @staticmethod
+    def group_means(labels, values):
+        """Mean of values per label (observed labels only), via bincount on label codes"""
+        if isinstance(labels.dtype, pd.CategoricalDtype):
+            codes = labels.cat.codes.to_numpy()
+            uniques = labels.cat.categories
+        else:
+            codes, uniques = pd.factorize(labels, sort=True)
+        valid = (codes >= 0) & ~np.isnan(values)
+        sums = np.bincount(codes[valid], weights=values[valid], minlength=len(uniques))
+        counts = np.bincount(codes[valid], minlength=len(uniques))
+        observed = np.flatnonzero(counts)
+        return {uniques[i]: sums[i] / counts[i] for i in observed}
+
+    @staticmethod
+    def value_counts(labels):
+        """Non-zero label counts in descending order, like Series.value_counts"""
+        if isinstance(labels.dtype, pd.CategoricalDtype):
+            codes = labels.cat.codes.to_numpy()
+            uniques = labels.cat.categories
+        else:
+            codes, uniques = pd.factorize(labels)
+        counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        order = np.argsort(-counts, kind='stable')
+        return {uniques[i]: int(counts[i]) for i in order if counts[i] > 0}
+
+    @staticmethod
+    def optimal_study_hours(hours, scores):
+        """Study hours range with the best mean score (same bins as Analytics)"""
+        valid = ~np.isnan(hours) & ~np.isnan(scores)
+        bins = np.digitize(hours[valid], STUDY_RANGE_BINS, right=True)
+        # digitize puts (0, 10] in bin 1 ... (25, 50] in bin 5; 0 and 6 are out of range
+        in_range = (bins >= 1) & (bins < len(STUDY_RANGE_BINS))
+        codes = bins[in_range] - 1
+        sums = np.bincount(codes, weights=scores[valid][in_range], minlength=len(STUDY_RANGE_LABELS))
+        counts = np.bincount(codes, minlength=len(STUDY_RANGE_LABELS))
+        if not counts.any():
+            return None
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = np.where(counts > 0, sums / counts, -np.inf)
+        return STUDY_RANGE_LABELS[int(np.argmax(means))]
+
+    @staticmethod
+    def get_performance_insights(df):
+        """Same insights dict as Analytics.get_performance_insights, computed in one batched pass"""
+        insights = {}
+        insights['total_students'] = len(df)
+        columns = df.columns
+
+        numeric_cols, matrix = InsightsEngine.numeric_matrix(df)
+        col_index = {col: i for i, col in enumerate(numeric_cols)}
+        has_score = SCORE_COLUMN in columns
+
+        score = None
+        correlations = {}
+        if has_score:
+            score = df[SCORE_COLUMN].to_numpy(dtype=np.float64, na_value=np.nan)
+            correlations = CorrelationService.with_target(df, SCORE_COLUMN).to_dict()
+
+            valid_score = score[~np.isnan(score)]
+            n = len(valid_score)
+            raw = df[SCORE_COLUMN].to_numpy()
+            if n > 0:
+                q10, median, q90 = np.quantile(valid_score, [0.1, 0.5, 0.9])
+                mean = valid_score.mean()
+                insights['avg_score'] = mean
+                insights['score_std'] = np.sqrt(((valid_score - mean) ** 2).sum() / (n - 1)) if n > 1 else np.nan
+                insights['median_score'] = median
+                insights['min_score'] = raw[~np.isnan(score)].min()
+                insights['max_score'] = raw[~np.isnan(score)].max()
+            else:
+                q10 = q90 = np.nan
+                for key in ['avg_score', 'score_std', 'median_score', 'min_score', 'max_score']:
+                    insights[key] = np.nan
+
+            insights['top_10_percent_threshold'] = q90
+            insights['bottom_10_percent_threshold'] = q10
+            # One bincount over the [<60, 60-80, >=80] bands instead of three masked copies
+            bands = np.bincount(np.digitize(valid_score, [60, 80]), minlength=3)
+            insights['high_performers'] = int(bands[2])
+            insights['at_risk_students'] = int(bands[0])
+            insights['average_performers'] = int(bands[1])
+
+        # Parental involvement analysis
+        if 'Parental_Involvement' in columns and has_score:
+            involvement = df['Parental_Involvement']
+            insights['avg_score_by_involvement'] = InsightsEngine.group_means(involvement, score)
+            insights['involvement_distribution'] = InsightsEngine.value_counts(involvement)
+
+            if 'Involvement_Score' in col_index:
+                corr = correlations['Involvement_Score']
+                insights['involvement_correlation'] = corr
+                insights['involvement_impact'] = "High" if abs(corr) > 0.5 else "Medium" if abs(corr) > 0.3 else "Low"
+
+        # Attendance analysis
+        if 'Attendance' in col_index and has_score:
+            attendance = matrix[:, col_index['Attendance']]
+            insights['avg_attendance'] = np.nanmean(attendance) if (~np.isnan(attendance)).any() else np.nan
+            insights['attendance_correlation'] = correlations['Attendance']
+
+            high_mask = attendance >= 90
+            low_mask = attendance < 70
+            high_count = int(high_mask.sum())
+            low_count = int(low_mask.sum())
+
+            if high_count > 0:
+                insights['avg_score_high_attendance'] = np.nanmean(score[high_mask])
+                insights['high_attendance_count'] = high_count
+
+            if low_count > 0:
+                insights['avg_score_low_attendance'] = np.nanmean(score[low_mask])
+                insights['low_attendance_count'] = low_count
+
+            if high_count > 0 and low_count > 0:
+                insights['attendance_score_difference'] = insights['avg_score_high_attendance'] - insights['avg_score_low_attendance']
+
+        # Study hours analysis
+        if 'Hours_Studied' in col_index and has_score:
+            hours = matrix[:, col_index['Hours_Studied']]
+            insights['avg_study_hours'] = np.nanmean(hours) if (~np.isnan(hours)).any() else np.nan
+            insights['study_hours_correlation'] = correlations['Hours_Studied']
+            insights['optimal_study_hours'] = InsightsEngine.optimal_study_hours(hours, score)
+
+        # Demographics
+        if 'Gender' in columns:
+            insights['gender_distribution'] = InsightsEngine.value_counts(df['Gender'])
+            if has_score:
+                insights['avg_score_by_gender'] = InsightsEngine.group_means(df['Gender'], score)
+
+        # Key predictors
+        if has_score:
+            non_empty = dict(zip(numeric_cols, (~np.isnan(matrix)).any(axis=0)))
+            insights['strongest_predictors'] = InsightsEngine.rank_predictors(correlations, non_empty)
+        else:
+            insights['strongest_predictors'] = []
+
+        return insights
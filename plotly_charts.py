@@ -0,0 +1,313 @@
+"""
+Plotly Chart Backend
+Interactive versions of the Visualizations charts with the same create_* API.
+Figures are drawn in the browser (WebGL for scatters), so the server only builds
+a small JSON spec instead of rasterizing an image.
+"""
+
+import numpy as np
+import pandas as pd
+from correlation_service import CorrelationService
+from visualizations import Visualizations, ANNOTATION_MAX_CELLS, DENSITY_BINS
+
+try:
+    import plotly.graph_objects as go
+    import plotly.io as pio
+    from plotly.subplots import make_subplots
+except ImportError:  # plotly is optional, the matplotlib charts still work without it
+    go = None
+    pio = None
+    make_subplots = None
+
+# Above this many points per chart, scatters are sent as binned count grids and
+# violins as a fixed-size sample, so the payload does not grow with the cohort
+MAX_CLIENT_POINTS = 20_000
+
+INVOLVEMENT_ORDER = ['Low', 'Medium', 'High']
+
+
+class PlotlyVisualizations:
+    """Plotly figures for the dashboard charts; None is returned where the matplotlib version returns None"""
+
+    @staticmethod
+    def available():
+        """Whether plotly is installed"""
+        return go is not None
+
+    @staticmethod
+    def render(fig):
+        """Serialize a figure to JSON bytes (for the chart cache); None passes through"""
+        if fig is None:
+            return None
+        return fig.to_json().encode('utf-8')
+
+    @staticmethod
+    def render_chart(chart, *args, **kwargs):
+        """Build a chart with create_<chart>(*args, **kwargs) and return its JSON bytes"""
+        create = getattr(PlotlyVisualizations, f'create_{chart}')
+        return PlotlyVisualizations.render(create(*args, **kwargs))
+
+    @staticmethod
+    def load(data):
+        """Figure from JSON bytes produced by render()"""
+        return pio.from_json(data.decode('utf-8'))
+
+    @staticmethod
+    def _layout(fig, title, x_title=None, y_title=None, height=450):
+        fig.update_layout(title=dict(text=f'<b>{title}</b>', x=0.5), height=height,
+                          margin=dict(l=40, r=20, t=60, b=40), template='plotly_white')
+        if x_title is not None:
+            fig.update_xaxes(title_text=x_title)
+        if y_title is not None:
+            fig.update_yaxes(title_text=y_title)
+        return fig
+
+    @staticmethod
+    def _counts(series):
+        """Non-zero value counts (categoricals also count unused levels)"""
+        counts = series.value_counts()
+        return counts[counts > 0]
+
+    @staticmethod
+    def _mean_bar(df, column, order, colors):
+        """Bar trace of mean Exam_Score per level of column, in the given order"""
+        means = df[df[column].isin(order)].groupby(column, observed=True)['Exam_Score'].mean().reindex(order)
+        return go.Bar(x=order, y=means.to_numpy(), marker=dict(color=colors, line=dict(color='black', width=1)),
+                      text=[f'{v:.1f}' if pd.notna(v) else '' for v in means], textposition='outside',
+                      showlegend=False)
+
+    @staticmethod
+    def _points(x, y, name=None, color=None, size=6, density_threshold=None):
+        """Scatter trace: WebGL markers, or a binned count heatmap above density_threshold
+        points (default MAX_CLIENT_POINTS)"""
+        if len(x) > (MAX_CLIENT_POINTS if density_threshold is None else density_threshold):
+            x_edges = Visualizations.bin_edges(x, DENSITY_BINS)
+            y_edges = Visualizations.bin_edges(y, DENSITY_BINS)
+            counts, _, _ = np.histogram2d(x, y, bins=[x_edges, y_edges])
+            counts = np.where(counts > 0, counts, np.nan)  # empty cells stay blank
+            return go.Heatmap(x=(x_edges[:-1] + x_edges[1:]) / 2, y=(y_edges[:-1] + y_edges[1:]) / 2,
+                              z=counts.T, colorscale='Blues', colorbar=dict(title='Students'),
+                              name=name or 'Students')
+        return go.Scattergl(x=x, y=y, mode='markers', name=name,
+                            marker=dict(color=color, size=size, opacity=0.6, line=dict(color='black', width=0.5)))
+
+    @staticmethod
+    def _trend(x, y):
+        """Least-squares trend line trace over the (x, y) pairs, or None"""
+        if len(x) < 2:
+            return None
+        slope, intercept = np.polyfit(x, y, 1)
+        x_trend = np.array([x.min(), x.max()])
+        return go.Scatter(x=x_trend, y=slope * x_trend + intercept, mode='lines', name='Trend',
+                          line=dict(color='red', dash='dash', width=2))
+
+    @staticmethod
+    def create_donut_chart(df, column, title, colors=None):
+        counts = PlotlyVisualizations._counts(df[column])
+        fig = go.Figure(go.Pie(labels=counts.index.astype(str), values=counts.to_numpy(), hole=0.4,
+                               marker=dict(colors=colors), textinfo='percent', sort=False))
+        return PlotlyVisualizations._layout(fig, title)
+
+    @staticmethod
+    def create_histogram_chart(df, column, title, colors=None, bins=None):
+        series = df[column]
+        if series.dtype == 'object' or isinstance(series.dtype, pd.CategoricalDtype):
+            counts = PlotlyVisualizations._counts(series)
+            trace = go.Bar(x=counts.index.astype(str), y=counts.to_numpy(), text=counts.to_numpy(),
+                           textposition='outside', marker=dict(color=colors[:len(counts)] if colors else None))
+            y_title = 'Count'
+        else:
+            # Binned on the server: the payload is one value per bin, not per student
+            values = series.dropna().to_numpy(dtype=np.float64)
+            counts, edges = np.histogram(values, bins=bins or 20)
+            trace = go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, width=np.diff(edges),
+                           marker=dict(color='skyblue', line=dict(color='black', width=1)), opacity=0.7)
+            y_title = 'Frequency'
+        return PlotlyVisualizations._layout(go.Figure(trace), title, column, y_title)
+
+    @staticmethod
+    def create_correlation_heatmap(df):
+        corr_matrix = CorrelationService.matrix(df)
+        if len(corr_matrix.columns) < 2:
+            return None
+        annotate = corr_matrix.size <= ANNOTATION_MAX_CELLS
+        fig = go.Figure(go.Heatmap(z=corr_matrix.to_numpy(), x=list(corr_matrix.columns), y=list(corr_matrix.index),
+                                   zmin=-1, zmax=1, colorscale='RdBu_r', colorbar=dict(title='Correlation'),
+                                   texttemplate='%{z:.2f}' if annotate else None))
+        fig.update_yaxes(autorange='reversed')
+        return PlotlyVisualizations._layout(fig, 'Correlation Matrix', height=600)
+
+    @staticmethod
+    def create_bar_chart_scores_by_involvement(df):
+        fig = go.Figure(PlotlyVisualizations._mean_bar(df, 'Parental_Involvement', INVOLVEMENT_ORDER,
+                                                       ["#65D5A3", "#496445", "#12B02C"]))
+        return PlotlyVisualizations._layout(fig, 'Scores by Parental Involvement',
+                                            'Parental Involvement', 'Average Score')
+
+    @staticmethod
+    def create_bar_chart_scores_by_education(df):
+        """Average scores by parental education and family income"""
+        fig = make_subplots(rows=1, cols=2, subplot_titles=('Average Exam Scores by Parental Education Level',
+                                                            'Average Exam Scores by Family Income Level'))
+        if 'Parental_Education_Level' in df.columns:
+            fig.add_trace(PlotlyVisualizations._mean_bar(df, 'Parental_Education_Level',
+                                                         ['High School', 'College', 'Postgraduate'],
+                                                         ["#99FFAF", "#439676", "#8BDDA7"]), row=1, col=1)
+        if 'Family_Income' in df.columns:
+            fig.add_trace(PlotlyVisualizations._mean_bar(df, 'Family_Income', INVOLVEMENT_ORDER,
+                                                         ["#66FFD9", "#44946C", "#4CC09D"]), row=1, col=2)
+        fig.update_yaxes(title_text='Average Exam Score')
+        return PlotlyVisualizations._layout(fig, 'Scores by Parental Education and Family Income')
+
+    @staticmethod
+    def _count_heatmap(data, colorscale, title, x_title, y_title):
+        fig = go.Figure(go.Heatmap(z=data.to_numpy(), x=data.columns.astype(str), y=data.index.astype(str),
+                                   colorscale=colorscale, colorbar=dict(title='Students'),
+                                   texttemplate='%{z}' if data.size <= ANNOTATION_MAX_CELLS else None))
+        fig.update_yaxes(autorange='reversed')
+        return PlotlyVisualizations._layout(fig, title, x_title, y_title)
+
+    @staticmethod
+    def create_parental_involvement_heatmap(df):
+        if 'Parental_Involvement' not in df.columns or 'Exam_Score' not in df.columns:
+            return None
+        score_range = pd.cut(df['Exam_Score'], bins=[0, 60, 70, 80, 90, 100],
+                             labels=['0-60', '60-70', '70-80', '80-90', '90-100'])
+        data = Visualizations.level_counts(df['Parental_Involvement'], score_range)
+        return PlotlyVisualizations._count_heatmap(data, 'YlOrRd', 'Parental Involvement vs Scores',
+                                                   'Score Range', 'Parental Involvement')
+
+    @staticmethod
+    def create_attendance_performance_heatmap(df):
+        if 'Attendance_Category' not in df.columns or 'Performance_Category' not in df.columns:
+            return None
+        data = Visualizations.level_counts(df['Attendance_Category'], df['Performance_Category'])
+        return PlotlyVisualizations._count_heatmap(data, 'Blues', 'Attendance vs Performance',
+                                                   'Performance Category', 'Attendance Category')
+
+    @staticmethod
+    def create_scatter_plot(df, x_col, y_col, color_by=None, title=None, density_threshold=None):
+        """
+        Scatter with optional color coding, drawn with WebGL
+
+        Above density_threshold points (default MAX_CLIENT_POINTS) a binned count grid is
+        sent instead, as the matplotlib version does above its own threshold.
+        """
+        threshold = MAX_CLIENT_POINTS if density_threshold is None else density_threshold
+        x, y, valid = Visualizations.xy_values(df, x_col, y_col)
+        fig = go.Figure()
+        if color_by and color_by in df.columns and len(x) <= threshold:
+            codes, categories = pd.factorize(df[color_by])
+            codes = codes[valid]
+            for code, category in enumerate(categories):
+                rows = codes == code
+                fig.add_trace(PlotlyVisualizations._points(x[rows], y[rows], name=str(category)))
+        else:
+            fig.add_trace(PlotlyVisualizations._points(x, y, color='skyblue', density_threshold=threshold))
+
+        trend = PlotlyVisualizations._trend(x, y)
+        if trend is not None:
+            fig.add_trace(trend)
+            fig.add_annotation(text=f'Correlation: {np.corrcoef(x, y)[0, 1]:.3f}', xref='paper', yref='paper',
+                               x=0.02, y=0.98, showarrow=False, bgcolor='wheat', opacity=0.8)
+        return PlotlyVisualizations._layout(fig, title or f'{y_col} vs {x_col}', x_col, y_col, height=500)
+
+    @staticmethod
+    def create_box_plot(df, category_col, value_col, title=None):
+        """Box plot from precomputed quartiles, so the payload is five numbers per category"""
+        fig = go.Figure()
+        for category, values in df.groupby(category_col, observed=True, sort=False)[value_col]:
+            values = values.dropna().to_numpy(dtype=np.float64)
+            if len(values) == 0:
+                continue
+            q1, median, q3 = np.percentile(values, [25, 50, 75])
+            iqr = q3 - q1
+            # Whiskers at the furthest points within 1.5 IQR, as matplotlib draws them
+            lower = values[values >= q1 - 1.5 * iqr].min()
+            upper = values[values <= q3 + 1.5 * iqr].max()
+            fig.add_trace(go.Box(name=str(category), q1=[q1], median=[median], q3=[q3],
+                                 lowerfence=[lower], upperfence=[upper], mean=[values.mean()]))
+        return PlotlyVisualizations._layout(fig, title or f'{value_col} Distribution by {category_col}',
+                                            category_col, value_col)
+
+    @staticmethod
+    def create_violin_plot(df, category_col, value_col, title=None):
+        rng = np.random.default_rng(0)
+        fig = go.Figure()
+        for category in sorted(df[category_col].dropna().unique()):
+            values = df.loc[df[category_col] == category, value_col].dropna().to_numpy()
+            if len(values) > MAX_CLIENT_POINTS:
+                values = rng.choice(values, MAX_CLIENT_POINTS, replace=False)
+            fig.add_trace(go.Violin(y=values, name=str(category), box_visible=True, meanline_visible=True,
+                                    points=False))
+        return PlotlyVisualizations._layout(fig, title or f'{value_col} Distribution by {category_col}',
+                                            category_col, value_col)
+
+    @staticmethod
+    def create_multi_factor_chart(df, density_threshold=None):
+        """Comprehensive multi-factor analysis chart (scatters binned above density_threshold points)"""
+        fig = make_subplots(rows=2, cols=2, subplot_titles=('Attendance vs Performance', 'Study Time vs Performance',
+                                                            'Impact of Parental Involvement', 'Score Distribution'))
+        for col, (x_col, color) in enumerate([('Attendance', 'steelblue'), ('Hours_Studied', 'coral')], start=1):
+            if x_col in df.columns and 'Exam_Score' in df.columns:
+                x, y, _ = Visualizations.xy_values(df, x_col, 'Exam_Score')
+                fig.add_trace(PlotlyVisualizations._points(x, y, name=x_col, color=color, size=4,
+                                                           density_threshold=density_threshold), row=1, col=col)
+                trend = PlotlyVisualizations._trend(x, y)
+                if trend is not None:
+                    fig.add_trace(trend.update(showlegend=False), row=1, col=col)
+        if 'Parental_Involvement' in df.columns and 'Exam_Score' in df.columns:
+            fig.add_trace(PlotlyVisualizations._mean_bar(df, 'Parental_Involvement', INVOLVEMENT_ORDER,
+                                                         ['#ff9999', '#ffcc99', '#99ff99']), row=2, col=1)
+        if 'Exam_Score' in df.columns:
+            scores = df['Exam_Score'].dropna().to_numpy(dtype=np.float64)
+            counts, edges = np.histogram(scores, bins=20)
+            fig.add_trace(go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, width=np.diff(edges), showlegend=False,
+                                 marker=dict(color='skyblue', line=dict(color='black', width=1))), row=2, col=2)
+            fig.add_vline(x=scores.mean(), line=dict(color='red', dash='dash'), row=2, col=2,
+                          annotation_text=f'Mean: {scores.mean():.1f}')
+        fig.update_layout(showlegend=False)
+        return PlotlyVisualizations._layout(fig, 'Comprehensive Performance Analysis', height=750)
+
+    @staticmethod
+    def create_factor_importance_chart(df):
+        if 'Exam_Score' not in df.columns:
+            return None
+        score_corr = CorrelationService.with_target(df).drop('Exam_Score', errors='ignore').dropna()
+        present = [col for col in score_corr.index if df[col].notna().any()]
+        top = score_corr[present].abs().sort_values(ascending=False).head(10)
+        if top.empty:
+            return None
+        fig = go.Figure(go.Bar(x=top.to_numpy(), y=top.index, orientation='h', text=[f'{v:.3f}' for v in top],
+                               textposition='outside', marker=dict(color=top.to_numpy(), colorscale='RdYlGn')))
+        fig.update_yaxes(autorange='reversed')
+        fig.update_xaxes(range=[0, 1])
+        return PlotlyVisualizations._layout(fig, 'Top Factors Influencing Academic Performance',
+                                            'Correlation with Exam Score (absolute value)')
+
+    @staticmethod
+    def create_progress_tracking_chart(baseline, current, target, metric_name="Exam Score"):
+        values = [baseline, current, target]
+        fig = go.Figure(go.Bar(x=['Baseline', 'Current', 'Target'], y=values, text=[f'{v:.1f}' for v in values],
+                               textposition='outside', marker=dict(color=['#ff9999', '#ffcc99', '#99ff99'])))
+        needed = target - baseline
+        progress_pct = (current - baseline) / needed * 100 if needed != 0 else 0
+        fig.add_annotation(text=f'Progress: {progress_pct:.1f}% of goal achieved', xref='paper', yref='paper',
+                           x=0.5, y=1.0, showarrow=False, bgcolor='yellow')
+        return PlotlyVisualizations._layout(fig, f'{metric_name} Progress Tracking', y_title=metric_name)
+
+    @staticmethod
+    def create_intervention_impact_chart(interventions_dict):
+        if not interventions_dict:
+            return None
+        names = [name.replace('_', ' ').title() for name in interventions_dict]
+        fig = go.Figure([
+            go.Bar(x=names, y=[d['current_avg_score'] for d in interventions_dict.values()],
+                   name='Current Avg Score', marker_color='#ff9999'),
+            go.Bar(x=names, y=[d['estimated_new_score'] for d in interventions_dict.values()],
+                   name='Projected Score', marker_color='#99ff99',
+                   customdata=[d['students_affected'] for d in interventions_dict.values()],
+                   hovertemplate='%{y:.1f} (%{customdata} students)'),
+        ])
+        fig.update_layout(barmode='group')
+        return PlotlyVisualizations._layout(fig, 'Projected Impact of Interventions', 'Intervention Type', 'Exam Score')
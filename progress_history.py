@@ -0,0 +1,244 @@
+"""
+Compact Goal Progress History
+A goal's progress updates as parallel NumPy arrays (microsecond timestamps and
+float32 values) instead of one dict per update, with cheap appends, date-range
+queries and compaction of old entries to one per day, week or month
+"""
+
+from datetime import datetime
+import numpy as np
+
+HISTORY_KEEP_DAYS = 90  # compaction leaves the most recent days at full resolution
+HISTORY_RESOLUTION = 'W'  # older entries are reduced to the last one per period: 'D', 'W' or 'M'
+INITIAL_CAPACITY = 4
+
+
+def to_datetime64(dates):
+    """datetimes or ISO date strings as a datetime64[us] array"""
+    return np.asarray(dates, dtype='datetime64[us]')
+
+
+def period_index(times, resolution):
+    """
+    Period number of each timestamp
+
+    Args:
+        times: datetime64 array
+        resolution: 'D' (day), 'W' (week starting Monday) or 'M' (calendar month)
+    """
+    if resolution == 'M':
+        return times.astype('datetime64[M]').astype(np.int64)
+    days = times.astype('datetime64[D]').astype(np.int64)
+    if resolution == 'W':
+        return (days + 3) // 7  # 1970-01-01 was a Thursday
+    if resolution == 'D':
+        return days
+    raise ValueError(f"Unknown resolution {resolution!r}; use 'D', 'W' or 'M'")
+
+
+def last_per_period(times, keys, before, resolution):
+    """
+    Mask of the entries compaction keeps
+
+    Entries at or after `before` are all kept; older ones only if they are the last of
+    their key (e.g. goal) and period.
+    """
+    old = times < np.datetime64(before, 'us')
+    keep = ~old
+    if old.any():
+        old_rows = np.flatnonzero(old)
+        periods = period_index(times[old_rows], resolution)
+        # Last row of each (key, period): stable sort, then take the end of every run
+        order = np.lexsort((old_rows, periods, keys[old_rows]))
+        grouped_keys, grouped_periods = keys[old_rows][order], periods[order]
+        run_end = np.ones(len(order), dtype=bool)
+        run_end[:-1] = (grouped_keys[1:] != grouped_keys[:-1]) | (grouped_periods[1:] != grouped_periods[:-1])
+        keep[old_rows[order[run_end]]] = True
+    return keep
+
+
+class ProgressHistory:
+    """
+    Progress updates of one goal, in the order they were recorded
+
+    Iterating yields the familiar entry dicts ({'date': ISO string, 'value', 'notes'}),
+    but they are built on demand; only the arrays and the non-empty notes are stored.
+    """
+
+    __slots__ = ('_times', '_values', '_notes', '_size', '_sorted')
+
+    def __init__(self, dates=(), values=(), notes=None):
+        """
+        Args:
+            dates: datetimes or ISO date strings
+            values: Progress values (stored as float32)
+            notes: Optional notes, one per entry
+        """
+        times = to_datetime64(dates)
+        self._size = len(times)
+        capacity = max(INITIAL_CAPACITY, self._size)
+        self._times = np.empty(capacity, dtype='datetime64[us]')
+        self._values = np.empty(capacity, dtype=np.float32)
+        self._times[:self._size] = times
+        self._values[:self._size] = values
+        self._notes = {i: note for i, note in enumerate(notes or []) if note}  # row -> note
+        self._sorted = bool((times[1:] >= times[:-1]).all())
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        return iter(self.entries())
+
+    def __getitem__(self, item):
+        entries = self.entries()
+        return entries[item]
+
+    def __eq__(self, other):
+        if not isinstance(other, ProgressHistory):
+            return NotImplemented
+        return (self._size == other._size and self._notes == other._notes
+                and np.array_equal(self.dates, other.dates) and np.array_equal(self.values, other.values))
+
+    def __repr__(self):
+        return f"ProgressHistory({self._size} entries)"
+
+    @property
+    def dates(self):
+        """datetime64[us] array of entry times (read-only view)"""
+        view = self._times[:self._size]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def values(self):
+        """float32 array of entry values (read-only view)"""
+        view = self._values[:self._size]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def notes(self):
+        """Note of each entry ("" where there is none)"""
+        return [self._notes.get(row, "") for row in range(self._size)]
+
+    @property
+    def nbytes(self):
+        """Approximate memory held by the arrays and notes"""
+        return self._times.nbytes + self._values.nbytes + sum(len(note) for note in self._notes.values())
+
+    def _reserve(self, extra):
+        """Grow the arrays (doubling) so `extra` more entries fit"""
+        needed = self._size + extra
+        if needed <= len(self._times):
+            return
+        capacity = max(needed, 2 * len(self._times))
+        for name in ('_times', '_values'):
+            column = getattr(self, name)
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[:self._size] = column[:self._size]
+            setattr(self, name, grown)
+
+    def append(self, date, value, notes=None):
+        """Record one update (amortized O(1))"""
+        time = np.datetime64(date, 'us')
+        row = self._size
+        self._reserve(1)
+        if row and time < self._times[row - 1]:
+            self._sorted = False
+        self._times[row] = time
+        self._values[row] = value
+        if notes:
+            self._notes[row] = notes
+        self._size = row + 1
+
+    def extend(self, dates, values, notes=None):
+        """Record several updates, in order"""
+        times = to_datetime64(dates)
+        if not len(times):
+            return
+        self._reserve(len(times))
+        start = self._size
+        self._times[start:start + len(times)] = times
+        self._values[start:start + len(times)] = values
+        if self._sorted:
+            previous = self._times[start - 1:start] if start else times[:0]
+            self._sorted = bool((times[1:] >= times[:-1]).all()) and (not len(previous) or times[0] >= previous[0])
+        self._notes.update((start + i, note) for i, note in enumerate(notes or []) if note)
+        self._size += len(times)
+
+    def entries(self, start=None, end=None):
+        """
+        Entry dicts, optionally only those dated in [start, end)
+
+        Returns:
+            list: {'date': ISO string, 'value': float, 'notes': str} per entry
+        """
+        rows = self._rows(start, end)
+        # float32 -> shortest decimal string -> float, so 66.1 reads back as 66.1
+        values = self._values[rows].astype(str).astype(np.float64).tolist()
+        dates = self._times[rows].astype(object)
+        return [{'date': date.isoformat(), 'value': value, 'notes': self._notes.get(row, "")}
+                for row, date, value in zip(rows.tolist(), dates, values)]
+
+    def to_dict(self):
+        """Columnar form for export: {'date': ISO strings, 'value': floats, 'notes': strings}"""
+        return {
+            'date': [date.isoformat() for date in self.dates.astype(object)],
+            'value': self.values.astype(str).astype(np.float64).tolist(),
+            'notes': self.notes,
+        }
+
+    @classmethod
+    def from_dict(cls, columns):
+        """History from the to_dict() form"""
+        return cls(columns['date'], columns['value'], columns.get('notes'))
+
+    def range(self, start=None, end=None):
+        """
+        Entries dated in [start, end) as arrays
+
+        Returns:
+            tuple: (datetime64 dates, float32 values)
+        """
+        rows = self._rows(start, end)
+        return self._times[rows], self._values[rows]
+
+    def _rows(self, start, end):
+        """Row numbers dated in [start, end); binary search while entries are in date order"""
+        times = self._times[:self._size]
+        if self._sorted:
+            low = 0 if start is None else np.searchsorted(times, np.datetime64(start, 'us'), side='left')
+            high = self._size if end is None else np.searchsorted(times, np.datetime64(end, 'us'), side='left')
+            return np.arange(low, high)
+        mask = np.ones(self._size, dtype=bool)
+        if start is not None:
+            mask &= times >= np.datetime64(start, 'us')
+        if end is not None:
+            mask &= times < np.datetime64(end, 'us')
+        return np.flatnonzero(mask)
+
+    def compact(self, before=None, resolution=HISTORY_RESOLUTION):
+        """
+        Keep only the last entry of each period for entries older than `before`
+
+        Args:
+            before: Cutoff datetime (default HISTORY_KEEP_DAYS ago)
+            resolution: 'D', 'W' or 'M'
+
+        Returns:
+            int: Number of entries removed
+        """
+        if before is None:
+            before = np.datetime64(datetime.now(), 'us') - np.timedelta64(HISTORY_KEEP_DAYS, 'D')
+        times = self._times[:self._size]
+        keep = np.flatnonzero(last_per_period(times, np.zeros(self._size, dtype=np.int64), before, resolution))
+        removed = self._size - len(keep)
+        if removed:
+            renumber = {old: new for new, old in enumerate(keep.tolist())}
+            self._notes = {renumber[row]: note for row, note in self._notes.items() if row in renumber}
+            # Copy to exactly-sized arrays so the spare capacity is released too
+            self._times, self._values = times[keep].copy(), self._values[keep].copy()
+            self._size = len(keep)
+            self._sorted = bool((self._times[1:] >= self._times[:-1]).all())
+        return removed
@@ -13,6 +13,7 @@ try:
     from visualizations import Visualizations
     from student_profile import StudentProfile
     from goal_tracker import GoalTracker
+    from goal_store import SQLiteGoalStore
     from data_manager import DataManager
     print("[OK] All modules import successfully")
 except Exception as e:
@@ -58,7 +59,7 @@ except Exception as e:
 # Test goal tracker
 print("\n[5/5] Testing goal tracker...")
 try:
-    gt = GoalTracker()
+    gt = GoalTracker(SQLiteGoalStore(':memory:'))
     goal_id = gt.create_goal(
         student_id=1,
         goal_type="Test Goal",
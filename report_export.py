@@ -0,0 +1,101 @@
+"""
+Bulk Report Export
+Writes printable summaries for a whole cohort into a ZIP archive, summarizing
+chunks of students in the shared worker pool and streaming each finished chunk
+into the archive so only a few chunks are ever held in memory
+"""
+
+import zipfile
+from collections import deque
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+import numpy as np
+from chart_renderer import ChartRenderer
+from class_stats import ClassStats
+from correlation_service import ID_COLUMN
+from student_profile import StudentProfile
+
+MIN_CHUNK_STUDENTS = 200
+CHUNKS_PER_WORKER = 4  # each chunk ships the class snapshot, so fewer, larger chunks
+MAX_PENDING_PER_WORKER = 2  # chunks submitted but not yet written, per worker
+
+
+def summarize_chunk(students, class_stats, timestamp):
+    """Worker entry point: printable summaries for one chunk of students"""
+    return StudentProfile.printable_summaries(students, class_stats, timestamp)
+
+
+class ReportExporter:
+    """Cohort-wide export of printable student summaries"""
+
+    @staticmethod
+    def entry_name(student_id):
+        """Archive member for one student (same name as the single-student download)"""
+        return f'student_{student_id}_profile.txt'
+
+    @staticmethod
+    def chunk_size(n_students, workers):
+        """Students per chunk: a few chunks per worker, but never tiny ones"""
+        return max(MIN_CHUNK_STUDENTS, -(-n_students // max(1, workers * CHUNKS_PER_WORKER)))
+
+    @staticmethod
+    def submit(students, class_stats, timestamp):
+        """Summarize a chunk in the worker pool, or inline when only one core is available"""
+        if ChartRenderer.parallel():
+            try:
+                return ChartRenderer.executor().submit(summarize_chunk, students, class_stats, timestamp)
+            except BrokenProcessPool:
+                ChartRenderer.shutdown()
+        future = Future()
+        try:
+            future.set_result(summarize_chunk(students, class_stats, timestamp))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    @staticmethod
+    def export_zip(df, file, student_ids=None, progress=None):
+        """
+        Write a printable summary for every student of a cohort into a ZIP archive
+
+        Args:
+            df: DataFrame with all student data (the class students are compared to)
+            file: Path or writable binary file object for the archive
+            student_ids: IDs of the cohort (None = every student)
+            progress: Optional callable(done, total) called as chunks are written
+
+        Returns:
+            dict: 'students' written and 'missing' IDs that were not found
+        """
+        positions = StudentProfile._positions(df, student_ids)
+        missing = [] if student_ids is None else \
+            [student_id for student_id, position in zip(student_ids, positions) if position < 0]
+        positions = positions[positions >= 0]
+        ids = df[ID_COLUMN].to_numpy()[positions] if ID_COLUMN in df.columns else positions + 1
+
+        class_stats = ClassStats.for_frame(df)
+        timestamp = datetime.now().isoformat()
+        workers = ChartRenderer.max_workers if ChartRenderer.parallel() else 1
+        size = ReportExporter.chunk_size(len(positions), workers)
+        chunks = [np.arange(start, min(start + size, len(positions))) for start in range(0, len(positions), size)]
+
+        written = 0
+        pending = deque()  # (chunk, future) in submission order, so the archive is in cohort order
+        with zipfile.ZipFile(file, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+            for chunk in chunks + [None]:
+                if chunk is not None:
+                    students = df.iloc[positions[chunk]]
+                    pending.append((chunk, ReportExporter.submit(students, class_stats, timestamp)))
+                # Write finished chunks once enough are in flight (and everything at the end)
+                while pending and (chunk is None or len(pending) >= workers * MAX_PENDING_PER_WORKER
+                                   or pending[0][1].done()):
+                    done_chunk, future = pending.popleft()
+                    for i, summary in zip(done_chunk, future.result()):
+                        archive.writestr(ReportExporter.entry_name(ids[i]), summary)
+                    written += len(done_chunk)
+                    if progress is not None:
+                        progress(written, len(positions))
+            if missing:
+                archive.writestr('missing_students.txt', '\n'.join(str(i) for i in missing) + '\n')
+        return {'students': written, 'missing': missing}
@@ -0,0 +1,107 @@
+"""
+Result Cache
+Thread-safe memoization with size- and TTL-based eviction, shared by every
+session in the Streamlit process
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class ResultCache:
+    """LRU cache with optional time-to-live and hit/miss counters"""
+
+    def __init__(self, max_entries=256, ttl_seconds=None):
+        """
+        Args:
+            max_entries: Least recently used entries are evicted beyond this size
+            ttl_seconds: Entries older than this are treated as misses (None = never expire)
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # key -> (stored_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        """Cached value for key, or default if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is not _MISSING:
+                stored_at, value = entry
+                if self.ttl_seconds is None or time.monotonic() - stored_at <= self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+                self.evictions += 1
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        """Store value under key, evicting the least recently used entries if full"""
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key, compute):
+        """Cached value for key, calling compute() and storing its result on a miss"""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            # Computed outside the lock so a slow miss never blocks other sessions' hits
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def clear(self):
+        """Drop every entry and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self):
+        """Size, limits and hit/miss/eviction counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups * 100 if lookups else 0,
+            }
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    @staticmethod
+    def filter_key(filters):
+        """
+        Normalized, hashable form of a filter selection
+
+        'All' (or an empty selection) means no predicate on that column, and the order of
+        columns and of selected values does not matter, so equivalent selections share a key.
+
+        Args:
+            filters: dict of column -> selected value or list of values
+        """
+        predicate = []
+        for column, selected in filters.items():
+            values = selected if isinstance(selected, (list, tuple, set)) else [selected]
+            values = sorted(str(v) for v in values if v is not None and v != 'All')
+            if values:
+                predicate.append((column, tuple(values)))
+        return tuple(sorted(predicate))
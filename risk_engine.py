@@ -0,0 +1,95 @@
+"""
+Vectorized Risk Engine
+Scores students against weighted at-risk criteria without per-row Python
+"""
+
+import operator
+import pandas as pd
+import numpy as np
+
+# Each criterion flags students whose `column` compares true against `threshold`.
+# A student's risk score is the sum of the weights of the criteria they meet.
+DEFAULT_CRITERIA = [
+    {'name': 'low_score', 'column': 'Exam_Score', 'op': '<', 'threshold': 60, 'weight': 1},
+    {'name': 'low_attendance', 'column': 'Attendance', 'op': '<', 'threshold': 75, 'weight': 1},
+    {'name': 'low_involvement', 'column': 'Parental_Involvement', 'op': '==', 'threshold': 'Low', 'weight': 1},
+]
+
+# Wider screen that also looks at motivation, sleep and learning disabilities
+EXTENDED_CRITERIA = DEFAULT_CRITERIA + [
+    {'name': 'low_motivation', 'column': 'Motivation_Level', 'op': '==', 'threshold': 'Low', 'weight': 1},
+    {'name': 'short_sleep', 'column': 'Sleep_Hours', 'op': '<', 'threshold': 6, 'weight': 0.5},
+    {'name': 'learning_disability', 'column': 'Learning_Disabilities', 'op': '==', 'threshold': 'Yes', 'weight': 0.5},
+]
+
+OPERATORS = {
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    '==': operator.eq,
+    '!=': operator.ne,
+    'in': lambda values, options: values.isin(options),
+}
+
+
+class RiskEngine:
+    """Sum boolean criterion masks into a risk score array and map it to risk levels"""
+
+    @staticmethod
+    def build_criteria(score_threshold=60, attendance_threshold=75):
+        """Default criteria with custom score and attendance thresholds"""
+        criteria = [dict(c) for c in DEFAULT_CRITERIA]
+        criteria[0]['threshold'] = score_threshold
+        criteria[1]['threshold'] = attendance_threshold
+        return criteria
+
+    @staticmethod
+    def criterion_mask(df, criterion):
+        """Boolean NumPy mask of the students meeting one criterion (missing values never match)"""
+        compare = OPERATORS[criterion.get('op', '==')]
+        mask = compare(df[criterion['column']], criterion['threshold'])
+        return mask.to_numpy(dtype=bool, na_value=False)
+
+    @staticmethod
+    def score(df, criteria=None):
+        """
+        Weighted risk scores for every student
+
+        Args:
+            df: DataFrame with student data
+            criteria: List of criterion dicts (defaults to DEFAULT_CRITERIA);
+                      criteria whose column is missing from df are skipped
+
+        Returns:
+            (scores, flagged): float array of summed weights and a boolean array
+            of students meeting at least one criterion
+        """
+        criteria = DEFAULT_CRITERIA if criteria is None else criteria
+        scores = np.zeros(len(df))
+        flagged = np.zeros(len(df), dtype=bool)
+        for criterion in criteria:
+            if criterion['column'] not in df.columns:
+                continue
+            mask = RiskEngine.criterion_mask(df, criterion)
+            scores += mask * criterion.get('weight', 1)
+            flagged |= mask
+        return scores, flagged
+
+    @staticmethod
+    def risk_levels(scores, high_risk_score=2):
+        """'High' for scores at or above high_risk_score, 'Medium' otherwise"""
+        return np.where(scores >= high_risk_score, 'High', 'Medium')
+
+    @staticmethod
+    def at_risk_students(df, criteria=None, high_risk_score=2):
+        """Students meeting any criterion, with Risk_Score and Risk_Level columns"""
+        criteria = DEFAULT_CRITERIA if criteria is None else criteria
+        if not any(c['column'] in df.columns for c in criteria):
+            return pd.DataFrame()
+
+        scores, flagged = RiskEngine.score(df, criteria)
+        at_risk = df[flagged].copy()
+        at_risk['Risk_Score'] = scores[flagged]
+        at_risk['Risk_Level'] = RiskEngine.risk_levels(scores[flagged], high_risk_score)
+        return at_risk
@@ -6,23 +6,31 @@ Creates detailed individual student reports with personalized recommendations
 import pandas as pd
 import numpy as np
 from datetime import datetime
+from class_stats import ClassStats, CLASS_STAT_FIELDS
+from data_manager import StudentIndex
+
 
 class StudentProfile:
     """Generate comprehensive student profiles with insights and recommendations"""
     
-    def __init__(self, student_data=None, class_data=None):
+    def __init__(self, student_data=None, class_data=None, class_stats=None):
         """
         Args:
             student_data: Series or dict with individual student information (optional for factory methods)
             class_data: DataFrame with all students for comparison (optional for factory methods)
+            class_stats: ClassStats snapshot of class_data (default: the shared snapshot for class_data)
         """
         if student_data is not None:
             self.student = student_data if isinstance(student_data, dict) else student_data.to_dict()
             self.class_data = class_data
-            self.class_avg = class_data.mean(numeric_only=True) if class_data is not None else None
+            if class_stats is None and class_data is not None:
+                class_stats = ClassStats.for_frame(class_data)
+            self.class_stats = class_stats
+            self.class_avg = class_stats.means() if class_stats is not None else None
         else:
             self.student = None
             self.class_data = None
+            self.class_stats = None
             self.class_avg = None
     
     @staticmethod
@@ -37,38 +45,132 @@ class StudentProfile:
         Returns:
             dict: Comprehensive report for the student
         """
-        # Find the student
-        if 'Student_ID' in df.columns:
-            student_data = df[df['Student_ID'] == student_id]
-        else:
-            # Assume student_id is an index
-            student_data = df.iloc[[student_id - 1]] if student_id <= len(df) else None
-        
-        if student_data is None or len(student_data) == 0:
+        # Find the student through the shared Student_ID index instead of scanning the frame
+        student_row = StudentIndex.for_frame(df).row(df, student_id)
+        if student_row is None:
             return None
         
-        student_row = student_data.iloc[0]
-        
         # Create instance and generate report
         profile = StudentProfile(student_row, df)
         return profile._generate_report()
     
     @staticmethod
-    def generate_printable_summary(df, student_id):
-        """Generate a parent-friendly printable summary"""
-        report = StudentProfile.generate_comprehensive_report(df, student_id)
+    def generate_printable_summary(df, student_id, report=None):
+        """Generate a parent-friendly printable summary (from report, if it was already generated)"""
+        if report is None:
+            report = StudentProfile.generate_comprehensive_report(df, student_id)
         if not report:
             return "Student not found."
         
         return StudentProfile._format_printable_summary(report)
     
-    def _generate_report(self):
+    @staticmethod
+    def _positions(df, student_ids):
+        """Row position of each requested student, -1 where there is none (None = every row)"""
+        if student_ids is None:
+            return np.arange(len(df))
+        return StudentIndex.for_frame(df).positions(student_ids)
+
+    @staticmethod
+    def generate_reports(df, student_ids=None):
+        """
+        Generate reports for a whole roster or cohort in one pass
+
+        Class statistics are computed once and percentiles are binary searches over the
+        sorted class values, instead of re-filtering and re-scanning the frame per student.
+
+        Args:
+            df: DataFrame with all student data
+            student_ids: IDs of the students to analyze (None = every row of df)
+
+        Returns:
+            list: One report per requested student, in order; None where a student was not found
+        """
+        class_stats = ClassStats.for_frame(df)
+        positions = StudentProfile._positions(df, student_ids)
+        records = iter(df.iloc[positions[positions >= 0]].to_dict('records'))
+        timestamp = datetime.now().isoformat()
+
+        reports = []
+        for position in positions:
+            if position < 0:
+                reports.append(None)
+                continue
+            profile = StudentProfile(next(records), df, class_stats=class_stats)
+            reports.append(profile._generate_report(timestamp))
+        return reports
+
+    @staticmethod
+    def printable_summaries(students, class_stats, timestamp=None):
+        """
+        Printable summary for each student, scored against a class snapshot
+
+        Needs no class frame, so a chunk of a roster can be summarized in a worker process.
+
+        Args:
+            students: DataFrame of the students to summarize
+            class_stats: ClassStats snapshot of the whole class
+
+        Returns:
+            list: Summary text per row of students, in order
+        """
+        timestamp = timestamp or datetime.now().isoformat()
+        summaries = []
+        for record in students.to_dict('records'):
+            report = StudentProfile(record, class_stats=class_stats)._generate_report(timestamp)
+            summaries.append(StudentProfile._format_printable_summary(report))
+        return summaries
+
+    @staticmethod
+    def generate_report_table(df, student_ids=None):
+        """
+        Headline report metrics for a roster or cohort as one columnar table
+
+        Every column is computed with array operations over the selected rows, so the
+        table for a full roster costs a few passes regardless of its size.
+
+        Args:
+            df: DataFrame with all student data
+            student_ids: IDs of the students to include (None = every row of df)
+
+        Returns:
+            DataFrame: One row per student found, with score, grade, status and per-field percentiles
+        """
+        class_stats = ClassStats.for_frame(df)
+        positions = StudentProfile._positions(df, student_ids)
+        rows = df.iloc[positions[positions >= 0]]
+        table = pd.DataFrame(index=rows.index)
+        if 'Student_ID' in rows.columns:
+            table['student_id'] = rows['Student_ID']
+
+        if 'Exam_Score' in class_stats:
+            stats = class_stats['Exam_Score']
+            score = rows['Exam_Score'].to_numpy(dtype=np.float64)
+            mean, std = stats.mean, stats.std
+            table['exam_score'] = score
+            table['difference_from_average'] = score - mean
+            table['letter_grade'] = np.select([score >= 90, score >= 80, score >= 70, score >= 60],
+                                              ['A', 'B', 'C', 'D'], 'F')
+            table['performance_status'] = np.select(
+                [score >= mean + std, score >= mean, score >= mean - std],
+                ['Exceeding Expectations', 'Meeting Expectations', 'Approaching Expectations'],
+                'Needs Significant Support')
+
+        for field, stats in class_stats.items():
+            percentile = stats.percentile(rows[field].to_numpy(dtype=np.float64))
+            table[f'{field.lower()}_percentile'] = percentile
+            table[f'{field.lower()}_standing'] = np.select(
+                [percentile >= 90, percentile >= 75, percentile >= 50, percentile >= 25],
+                ['Top 10%', 'Upper Quarter', 'Above Average', 'Below Average'], 'Bottom Quarter')
+        return table.reset_index(drop=True)
+    
+    def _generate_report(self, timestamp=None):
         """Generate complete student profile report (instance method)"""
         if self.student is None:
             return None
             
         report = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': timestamp or datetime.now().isoformat(),
             'student_info': self._get_student_info(),
             'performance': self._analyze_performance(),
             'strengths': self._identify_strengths(),
@@ -108,7 +210,7 @@ class StudentProfile:
         if 'Exam_Score' in self.student:
             score = self.student['Exam_Score']
             class_avg = self.class_avg.get('Exam_Score', 0)
-            class_std = self.class_data['Exam_Score'].std()
+            class_std = self.class_stats['Exam_Score'].std
             
             # Performance level
             if score >= class_avg + class_std:
@@ -125,7 +227,7 @@ class StudentProfile:
                 level = "At Risk"
             
             # Percentile calculation
-            percentile = (self.class_data['Exam_Score'] < score).sum() / len(self.class_data) * 100
+            percentile = self.class_stats['Exam_Score'].percentile(score)
             
             # Letter grade
             if score >= 90:
@@ -337,14 +439,15 @@ class StudentProfile:
         """Compare student to classmates"""
         comparison = {}
         
-        numeric_fields = ['Exam_Score', 'Attendance', 'Hours_Studied', 'Sleep_Hours']
+        numeric_fields = CLASS_STAT_FIELDS
         
         for field in numeric_fields:
-            if field in self.student and field in self.class_data.columns:
+            if field in self.student and field in self.class_stats:
                 student_value = self.student[field]
-                class_mean = self.class_data[field].mean()
-                class_median = self.class_data[field].median()
-                percentile = (self.class_data[field] < student_value).sum() / len(self.class_data) * 100
+                stats = self.class_stats[field]
+                class_mean = stats.mean
+                class_median = stats.median
+                percentile = stats.percentile(student_value)
                 
                 # Determine standing
                 if percentile >= 90:
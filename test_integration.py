@@ -1,12 +1,31 @@
 """
 Quick test script to verify all integrated features work correctly
 """
+import inspect
+import io
+import json
+import os
+import pickle
+import tempfile
+import threading
+import zipfile
+from datetime import datetime, timedelta
+import numpy as np
 import pandas as pd
+import pyarrow as pa
 from analytics import Analytics
 from visualizations import Visualizations
 from student_profile import StudentProfile
 from goal_tracker import GoalTracker
+from goal_store import MemoryGoalStore, SQLiteGoalStore
+from report_export import ReportExporter
 from ai_assistant_educational import EducationalAIAssistant
+from ai_assistant_simple import SimpleAIAssistant
+from chart_cache import ChartCache
+from chart_renderer import DatasetRows, render_chart_bytes
+from correlation_service import CorrelationService
+from class_stats import ClassStats
+from data_manager import DataManager, FilterIndex, StudentIndex
 
 print("=" * 60)
 print("EngageMetrics Integration Test")
@@ -17,6 +36,20 @@ print("\n1. Loading data...")
 df = pd.read_csv('student_performance_cleaned.csv')
 print(f"✓ Loaded {len(df)} student records")
 
+# Streaming ingest matches a one-shot load, even when a later chunk overflows a narrowed column
+with tempfile.TemporaryDirectory() as tmp:
+    district = df.head(3000).copy()
+    district.loc[2500, 'Hours_Studied'] = 300  # int8 in the first two chunks
+    district.loc[2600, 'Sleep_Hours'] = 7.5
+    csv_path = os.path.join(tmp, 'district.csv')
+    district.to_csv(csv_path, index=False)
+    manager = DataManager(csv_path, os.path.join(tmp, 'cache'))
+    manager.ingest_csv_streaming(chunksize=1000)
+    streamed = manager.read_columnar_cache()
+    loaded = manager.normalize_data(manager.categorize_data(DataManager.load_data(csv_path)))
+    pd.testing.assert_frame_equal(streamed, loaded)
+print(f"✓ Streaming ingest: 3 chunks match load_data ({streamed['Hours_Studied'].dtype} Hours_Studied)")
+
 # Test Analytics
 print("\n2. Testing Analytics module...")
 analytics = Analytics()
@@ -48,11 +81,64 @@ print("✓ Multi-factor chart - OK")
 print("✓ Factor importance - OK")
 print("✓ All 13 visualization types available")
 
+# Filtered categorical views only show the levels that occur in them
+typed = DataManager.apply_schema(df.copy())
+low = typed[typed['Parental_Involvement'] == 'Low']
+assert list(Visualizations.level_counts(low['Parental_Involvement'], low['Gender']).index) == ['Low']
+assert "'High'" not in SimpleAIAssistant.build_context(None, low)
+print("✓ Filtered views skip unused category levels")
+
+# Both chart backends take the same arguments, so callers can switch backends freely
+for name in ['matplotlib', 'plotly']:
+    backend = Visualizations.backend(name)
+    assert backend.render_chart('scatter_plot', typed, 'Hours_Studied', 'Exam_Score', density_threshold=100)
+    assert backend.render_chart('multi_factor_chart', typed, density_threshold=100)
+charts = [name for name in dir(Visualizations) if name.startswith('create_')]
+assert all(inspect.signature(getattr(Visualizations, name)) ==
+           inspect.signature(getattr(Visualizations.backend('plotly'), name)) for name in charts)
+print(f"✓ {len(charts)} charts share one signature across the matplotlib and plotly backends")
+
+# Cached correlations follow value changes in derived frames that keep the dataset version
+typed.attrs['dataset_version'] = 'integration'
+normalized = typed.assign(Hours_Studied=(typed['Hours_Studied'] - typed['Hours_Studied'].mean()) ** 2)
+assert normalized.attrs['dataset_version'] == 'integration' and normalized.index.equals(typed.index)
+assert CorrelationService.pair(normalized, 'Hours_Studied', 'Exam_Score') != CorrelationService.pair(typed, 'Hours_Studied', 'Exam_Score')
+assert np.isclose(CorrelationService.pair(normalized, 'Hours_Studied', 'Exam_Score'),
+                  normalized['Hours_Studied'].corr(normalized['Exam_Score'].astype(float)))
+print("✓ Correlation cache keys on values, not just the dataset version")
+
+# The on-disk chart tier stays under its limit without scanning the directory on every write
+with tempfile.TemporaryDirectory() as tmp:
+    chart_cache = ChartCache(max_entries=4, disk_dir=tmp, max_disk_bytes=200_000)
+    for i in range(500):
+        chart_cache.set(ChartCache.make_key('histogram_chart', (i,), 'integration'), bytes(1_000))
+    on_disk = sum(entry.stat().st_size for entry in os.scandir(tmp))
+    assert on_disk <= 200_000 and chart_cache.stats()['disk_scans'] < 500 // 10
+    assert chart_cache.get(ChartCache.make_key('histogram_chart', (499,), 'integration')) == bytes(1_000)
+# Chart workers get a dataset reference and row bitmap, not the pickled frame
+with tempfile.TemporaryDirectory() as tmp:
+    csv_path = os.path.join(tmp, 'district.csv')
+    df.head(2000).to_csv(csv_path, index=False)
+    district = DataManager.read_processed_data(csv_path, tmp)
+    view = FilterIndex(district).view(district, {'Gender': 'Female'})
+    rows = DatasetRows(csv_path, tmp, district.attrs['dataset_version'], view.mask)
+    assert rows.frame().equals(view.frame) and len(pickle.dumps(rows)) < len(pickle.dumps(view.frame)) // 20
+    assert render_chart_bytes('histogram_chart', rows, ('Exam_Score', 'Scores'), {}, 'png', 100) == \
+        render_chart_bytes('histogram_chart', view.frame, ('Exam_Score', 'Scores'), {}, 'png', 100)
+print(f"✓ Chart pool payload: {len(pickle.dumps(rows)):,} bytes instead of {len(pickle.dumps(view.frame)):,}")
+print(f"✓ Chart disk tier: {on_disk:,} bytes after 500 writes, {chart_cache.stats()['disk_scans']} directory scans")
+
 # Test Student Profile
 print("\n4. Testing Student Profile module...")
 student_id = df.iloc[0]['Student_ID'] if 'Student_ID' in df.columns else 1
 report = StudentProfile.generate_comprehensive_report(df, student_id)
 print(f"✓ Generated profile for student #{student_id}")
+one_off_stats, one_off_index = ClassStats.for_frame(df), StudentIndex.for_frame(df)
+assert one_off_index.position(student_id) == 0 and one_off_index._positions is None
+assert one_off_stats['Exam_Score'].percentile(df['Exam_Score'].iloc[0]) == \
+    one_off_stats['Exam_Score'].percentile(df['Exam_Score'].to_numpy())[0]
+assert one_off_stats['Attendance']._sorted is None  # the scalar lookup above did not sort
+print("✓ One profile of an unversioned frame is a linear scan (no sort, no ID map)")
 print(f"✓ Performance score: {report['performance']['exam_score']:.1f}")
 print(f"✓ Letter grade: {report['performance']['letter_grade']}")
 print(f"✓ Identified {len(report['strengths'])} strengths")
@@ -60,11 +146,32 @@ print(f"✓ Identified {len(report['challenges'])} challenges")
 print(f"✓ Generated {len(report['recommendations'])} recommendations")
 
 summary = StudentProfile.generate_printable_summary(df, student_id)
+assert StudentProfile.generate_printable_summary(df, student_id, report) == summary
 print(f"✓ Printable summary: {len(summary)} characters")
 
+reports = StudentProfile.generate_reports(df, [student_id, -1])
+assert reports[1] is None
+assert reports[0]['performance']['percentile'] == report['performance']['percentile']
+table = StudentProfile.generate_report_table(df)
+assert len(table) == len(df)
+print(f"✓ Batch reports: {len(table)} students in one table")
+
+archive = io.BytesIO()
+exported = ReportExporter.export_zip(df, archive, [student_id, 2, 3])
+with zipfile.ZipFile(archive) as zipped:
+    assert zipped.read(ReportExporter.entry_name(student_id)).decode() == summary
+print(f"✓ Bulk export: {exported['students']} summaries zipped")
+shipped = ClassStats.for_frame(df)
+worker_stats = pickle.loads(pickle.dumps(shipped))  # what each export chunk sends to a worker
+assert 'present' not in shipped['Exam_Score'].__getstate__()
+assert len(pickle.dumps(shipped)) < 8.5 * len(df) * len(shipped.fields)  # one float64 array per field
+scores = df['Exam_Score'].to_numpy()
+assert (worker_stats['Exam_Score'].percentile(scores) == shipped['Exam_Score'].percentile(scores)).all()
+print(f"✓ Class snapshot sent to export workers: {len(pickle.dumps(shipped)):,} bytes")
+
 # Test Goal Tracker
 print("\n5. Testing Goal Tracker module...")
-tracker = GoalTracker()
+tracker = GoalTracker(SQLiteGoalStore(':memory:'))
 goal_id = tracker.create_goal(
     student_id=student_id,
     goal_type="Exam Score",
@@ -86,6 +193,151 @@ print(f"✓ Retrieved {len(goals)} goals for student")
 suggestions = tracker.suggest_goals(df, student_id)
 print(f"✓ Generated {len(suggestions)} goal suggestions")
 
+cohort_suggestions = tracker.suggest_goals_for_cohort(df)
+first = cohort_suggestions[cohort_suggestions['student_id'] == student_id]
+assert first['description'].tolist() == [s['reason'] for s in suggestions]
+assert len(cohort_suggestions) == 3 * len(df)
+seeding = GoalTracker(SQLiteGoalStore(':memory:'))
+seeded = seeding.create_goals(cohort_suggestions.iloc[::2])
+remaining = seeding.without_active_goals(cohort_suggestions)
+assert remaining.equals(cohort_suggestions.iloc[1::2])  # seeding again only adds the missing goals
+seeded += seeding.create_goals(remaining)
+assert seeding.without_active_goals(cohort_suggestions).empty
+print(f"✓ Cohort suggestions: {len(seeded)} goals seeded for {len(df)} students, none twice")
+
+# Dashboard metrics come from the store's goal columns; both stores agree with per-goal status
+for store in (SQLiteGoalStore(':memory:'), MemoryGoalStore()):
+    metrics_tracker = GoalTracker(store)
+    for i in range(30):
+        metrics_tracker.create_goal(i % 7, "Exam Score", 60.0, 70.0 + i % 4)
+    for i in range(1, 31, 2):
+        metrics_tracker.update_progress(i, 62.0 + i % 12)
+    metrics = metrics_tracker.calculate_goal_metrics()
+    active = metrics_tracker.get_all_active_goals()
+    on_track = sum(metrics_tracker.get_goal_status(g['goal_id'])['on_track'] for g in active)
+    assert metrics['active_goals'] == len(active) and metrics['goals_on_track'] == on_track
+    assert metrics['achieved_goals'] == metrics_tracker.get_achievement_counts()['achieved']
+    achievements = metrics_tracker.get_achievement_summary()
+    assert type(achievements) is dict and json.dumps(achievements, default=str)
+    assert list(achievements) == ['total_goals', 'achieved', 'active', 'achievement_rate', 'goals']
+    assert [goal['goal_id'] for goal in achievements['goals']] == [goal['goal_id'] for goal in metrics_tracker.goals]
+    assert store.student_goal_types('active') == {(g['student_id'], g['goal_type']) for g in active}
+    assert len(metrics_tracker.get_student_goals(3)) == len([g for g in metrics_tracker.goals if g['student_id'] == 3])
+print(f"✓ Goal metrics: {metrics['active_goals']} active, {metrics['average_progress']:.1f}% average progress")
+
+# Bulk creation and progress ingestion match one call per goal and per row
+new_goals = pd.DataFrame({'student_id': [1, 2, 3], 'goal_type': "Exam Score", 'current_value': [60.0, 55.0, 70.0],
+                          'target_value': [75.0, 65.0, 80.0], 'timeline_days': [90, 30, 60],
+                          'target_date': [datetime(2026, 3, 1), datetime(2026, 2, 1), None]})
+updates = pd.DataFrame({'goal_id': [1, 2, 1, 3, 2, 9], 'value': [66.0, 58.0, 76.0, 72.0, 60.0, 50.0],
+                        'date': pd.to_datetime(["2026-01-10", "2026-01-12", "2026-02-01", "2026-02-03",
+                                                "2026-02-05", "2026-02-06"]), 'notes': "nightly export"})
+per_row, bulk = GoalTracker(MemoryGoalStore()), GoalTracker(SQLiteGoalStore(':memory:'))
+for row in new_goals.itertuples():
+    per_row.create_goal(row.student_id, row.goal_type, row.current_value, row.target_value, row.timeline_days,
+                        target_date=None if pd.isna(row.target_date) else row.target_date.to_pydatetime())
+for row in updates[updates['goal_id'] <= 3].itertuples():
+    per_row.update_progress(row.goal_id, row.value, row.notes, row.date.to_pydatetime())
+assert bulk.create_goals(pa.Table.from_pandas(new_goals)) == [1, 2, 3]
+result = bulk.ingest_progress(updates)
+assert result == {'updated': 3, 'entries': 5, 'achieved': 1, 'missing': [9]}
+for expected, actual in zip(per_row.goals, bulk.goals):
+    for field in ['status', 'current_value', 'milestones', 'achievement_date']:
+        assert expected.get(field) == actual.get(field), field
+    assert expected['progress_history'][1:] == actual['progress_history'][1:]
+print(f"✓ Bulk goal import: {result['entries']} updates, statuses {bulk.store.count_by_status()}")
+
+# Missing descriptions and dates in an import get create_goal's defaults; unparseable dates are rejected
+sis_export = pd.DataFrame({'student_id': [4, 5], 'goal_type': "Attendance", 'current_value': [80.0, 85.0],
+                           'target_value': [90.0, 95.0], 'timeline_days': [30, 60],
+                           'description': [np.nan, "Weekly check-ins"], 'created_date': [pd.NaT, "2026-01-05"],
+                           'target_date': pd.Series([pd.NaT, ""], dtype=object)})
+importer = GoalTracker(MemoryGoalStore())
+imported = importer.store.get_many(importer.create_goals(sis_export))
+first, second = sorted(imported.values(), key=lambda goal: goal['student_id'])
+assert first['description'] == "Improve Attendance from 80.0 to 90.0" and second['description'] == "Weekly check-ins"
+assert (first['target_date'] - first['created_date']).days == 30 and first['created_date'].date() == datetime.now().date()
+assert second['created_date'] == datetime(2026, 1, 5) and second['target_date'] == datetime(2026, 3, 6)
+try:
+    importer.create_goals(sis_export.assign(target_date=["2026-04-01", "next spring"]))
+    raise AssertionError("an unparseable target_date was accepted")
+except ValueError as e:
+    assert 'target_date' in str(e) and 'next spring' in str(e) and len(importer.goals) == 2
+print("✓ Goal import defaults NaN descriptions and NaT dates, and rejects unparseable dates")
+goal_id = first['goal_id']
+blank_dates = pd.read_csv(io.StringIO(f"goal_id,value,date\n{goal_id},82.0,\n{goal_id},84.0,2026-10-01\n"))
+assert importer.ingest_progress(blank_dates)['entries'] == 2
+history = importer.store.get(goal_id)['progress_history']
+assert history[-2]['date'].startswith(datetime.now().date().isoformat()) and history[-1]['value'] == 84.0
+print("✓ Progress rows with a blank date are recorded as of now")
+
+# Progress history is stored as arrays; old entries compact to one per week in both stores
+for history_tracker in (per_row, bulk):
+    daily = pd.DataFrame({'goal_id': 3, 'value': np.linspace(72.0, 79.0, 120).round(1),
+                          'date': pd.date_range(end=datetime.now(), periods=120, freq='D')})
+    history_tracker.ingest_progress(daily)
+    history = history_tracker.store.get(3)['progress_history']
+    entries_before = len(history)
+    last_month = history.range(datetime.now() - timedelta(days=30))[1].tolist()
+    recent_dates, recent_values = history.range(datetime.now() - timedelta(days=10))
+    assert len(recent_values) >= 10 and recent_values.dtype == np.float32
+    removed = history_tracker.compact_history(older_than_days=30, resolution='W')
+    compacted = history_tracker.store.get(3)['progress_history']
+    assert removed > 0 and len(compacted) == entries_before - removed
+    assert compacted.range(datetime.now() - timedelta(days=30))[1].tolist() == last_month
+print(f"✓ Progress history: {entries_before} entries compacted to {len(compacted)}")
+
+# Goal backups round-trip through JSON Lines and Parquet, into either store, keeping goal IDs
+with tempfile.TemporaryDirectory() as tmp:
+    for format in ['jsonl', 'parquet']:
+        path = os.path.join(tmp, f'goals.{format}')
+        assert bulk.export_goals(path) == len(bulk.goals)
+        for store in (MemoryGoalStore(), SQLiteGoalStore(':memory:')):
+            restored = GoalTracker(store)
+            assert restored.import_goals(path) == len(bulk.goals)
+            assert restored.goals == bulk.goals
+            assert restored.import_goals(path) == len(bulk.goals) and len(restored.goals) == len(bulk.goals)
+            assert restored.create_goal(student_id, "Attendance", 80.0, 90.0) == max(g['goal_id'] for g in bulk.goals) + 1
+    assert len(json.load(open(bulk.export_goals_to_json(os.path.join(tmp, 'goals.json'))))) == len(bulk.goals)
+print(f"✓ Goal backups: {len(bulk.goals)} goals restored from JSON Lines and Parquet")
+
+# Goals persist in the database file and concurrent sessions can write to it
+with tempfile.TemporaryDirectory() as tmp:
+    db_path = os.path.join(tmp, 'goals.db')
+    GoalTracker(SQLiteGoalStore(db_path)).create_goal(student_id, "Attendance", 80.0, 90.0)
+
+    def session_writes():
+        session = GoalTracker(SQLiteGoalStore.shared(db_path))
+        for _ in range(20):
+            session.update_progress(session.get_student_goals(student_id)[0]['goal_id'], 85.0)
+
+    sessions = [threading.Thread(target=session_writes) for _ in range(4)]
+    for session in sessions:
+        session.start()
+    for session in sessions:
+        session.join()
+    reopened = GoalTracker(SQLiteGoalStore(db_path))
+    assert len(reopened.get_student_goals(student_id)[0]['progress_history']) == 1 + 4 * 20
+
+    # A milestone one session reaches is not undone by another session's write of an older copy
+    race_ids = reopened.create_goals([{'student_id': i, 'goal_type': "Exam Score", 'current_value': 80.0,
+                                       'target_value': 90.0} for i in range(20)])
+
+    def session_progress(value, rounds):
+        session = GoalTracker(SQLiteGoalStore.shared(db_path))
+        for _ in range(rounds):
+            for goal_id in race_ids:
+                session.update_progress(goal_id, value)
+
+    sessions = [threading.Thread(target=session_progress, args=(84.0, 1))] + \
+        [threading.Thread(target=session_progress, args=(81.0, 5)) for _ in range(3)]
+    for session in sessions:
+        session.start()
+    for session in sessions:
+        session.join()
+    assert all(goal['milestones'][0]['achieved'] for goal in reopened.store.get_many(race_ids).values())
+print("✓ Goals persisted in SQLite across trackers and concurrent sessions")
+
 # Test AI Assistant
 print("\n6. Testing AI Assistant module...")
 ai = EducationalAIAssistant()
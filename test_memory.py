@@ -0,0 +1,92 @@
+"""
+Memory test for chart rendering
+Simulates dashboard reruns that each redraw charts, and checks that resident
+memory stays flat because every figure is rendered to bytes and closed.
+
+Run with: python test_memory.py [reruns]
+"""
+import io
+import os
+import sys
+import resource
+import warnings
+import matplotlib.pyplot as plt
+from benchmarks import load_roster
+from visualizations import Visualizations
+
+warnings.filterwarnings('ignore')
+
+RERUNS = 1000
+WARMUP_RERUNS = 20
+SAMPLE_EVERY = 100
+MAX_GROWTH_MB = 25  # allocator noise; leaking figures grows by several MB per 10 reruns
+DPI = 40  # small images keep 1000 reruns quick; the figure lifecycle is the same at any dpi
+
+# (chart, args after df) drawn on every rerun
+CHARTS = [
+    ('donut_chart', ('Parental_Involvement', 'Parental Involvement Distribution')),
+    ('histogram_chart', ('Exam_Score', 'Distribution of Exam Scores')),
+    ('bar_chart_scores_by_involvement', ()),
+]
+
+
+def rss_mb():
+    """Current resident set size in MB"""
+    try:
+        with open('/proc/self/statm') as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf('SC_PAGE_SIZE') / 1024 ** 2
+    except (OSError, ValueError):
+        # No procfs (e.g. macOS): peak RSS is the closest portable measure
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1024 ** 2 if sys.platform == 'darwin' else peak / 1024
+
+
+def rerun(df, release=True):
+    """Draw every chart once, as one overview rerun would"""
+    for chart, args in CHARTS:
+        if release:
+            Visualizations.render_chart(chart, df, *args, dpi=DPI)
+        else:
+            # Previous behaviour: figure handed to the page and never closed
+            fig = getattr(Visualizations, f'create_{chart}')(df, *args)
+            fig.savefig(io.BytesIO(), format='png', dpi=DPI)
+
+
+def leak_rate(df, reruns=30):
+    """MB per rerun when figures are not closed, for comparison"""
+    start = rss_mb()
+    for _ in range(reruns):
+        rerun(df, release=False)
+    growth = (rss_mb() - start) / reruns
+    plt.close('all')
+    return growth
+
+
+def run_memory_test(reruns=RERUNS):
+    print("=" * 60)
+    print(f"EngageMetrics Memory Test ({reruns} reruns x {len(CHARTS)} charts)")
+    print("=" * 60)
+    df = load_roster()
+
+    for _ in range(WARMUP_RERUNS):
+        rerun(df)
+    baseline = rss_mb()
+    print(f"\nBaseline RSS after {WARMUP_RERUNS} warm-up reruns: {baseline:.1f} MB")
+
+    for i in range(1, reruns + 1):
+        rerun(df)
+        if i % SAMPLE_EVERY == 0 or i == reruns:
+            print(f"  rerun {i:>5}: RSS {rss_mb():7.1f} MB | open figures {len(plt.get_fignums())}")
+
+    growth = rss_mb() - baseline
+    print(f"\nRSS growth: {growth:+.1f} MB (limit {MAX_GROWTH_MB} MB)")
+    print(f"Without closing figures: {leak_rate(df):+.2f} MB per rerun")
+
+    assert not plt.get_fignums(), "figures left open in the pyplot registry"
+    assert growth < MAX_GROWTH_MB, f"RSS grew by {growth:.1f} MB over {reruns} reruns"
+    print("\n✓ Memory stays flat across reruns")
+
+
+if __name__ == "__main__":
+    run_memory_test(int(sys.argv[1]) if len(sys.argv) > 1 else RERUNS)
@@ -0,0 +1,61 @@
+"""
+Shared frame test
+The processed frame is cached with st.cache_resource and handed to every session
+and rerun without a copy, so no page may write to it. Renders every dashboard page
+once and checks that the frame's columns, dtypes, values and attrs are unchanged.
+
+Run with: python test_shared_frame.py
+"""
+import os
+import tempfile
+import warnings
+
+warnings.filterwarnings('ignore')
+GOALS_DIR = tempfile.TemporaryDirectory()
+os.environ['ENGAGE_GOALS_DB'] = os.path.join(GOALS_DIR.name, 'goals.db')  # keep the real goal store untouched
+
+import pandas as pd
+from streamlit.testing.v1 import AppTest
+
+
+def snapshot(df):
+    """Everything a page could change in place: columns, dtypes, values and attrs"""
+    return {
+        'columns': list(df.columns),
+        'dtypes': [str(dtype) for dtype in df.dtypes],
+        'rows': pd.util.hash_pandas_object(df, index=True).to_numpy().copy(),
+        'attrs': dict(df.attrs),
+    }
+
+
+def dashboard_app():
+    """The dashboard, recording snapshots of the cached frame before the first render and after each one"""
+    import streamlit as st
+    from dashboard import StudentDashboard
+    from data_manager import DataManager
+    from test_shared_frame import snapshot
+
+    if 'frame_before' not in st.session_state:
+        st.session_state['frame_before'] = snapshot(DataManager().get_processed_data())
+    StudentDashboard().run()
+    st.session_state['frame_after'] = snapshot(DataManager().get_processed_data())
+
+
+def main():
+    app = AppTest.from_function(dashboard_app, default_timeout=120)
+    app.run()
+    before = app.session_state['frame_before']
+    pages = app.sidebar.radio[0].options
+    for page in pages:
+        app.sidebar.radio[0].set_value(page).run()
+        assert not app.exception, f"{page}: {app.exception}"
+        after = app.session_state['frame_after']
+        for key in ['columns', 'dtypes', 'attrs']:
+            assert after[key] == before[key], f"{page} changed the shared frame's {key}"
+        assert (after['rows'] == before['rows']).all(), f"{page} changed values of the shared frame"
+        print(f"✓ {page}: shared frame unchanged")
+    print(f"✓ {len(pages)} pages rendered without writing to the shared frame")
+
+
+if __name__ == "__main__":
+    main()
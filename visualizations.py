@@ -1,13 +1,70 @@
+import io
 import matplotlib
 matplotlib.use('Agg')
 import matplotlib.pyplot as plt
+from matplotlib.colors import LogNorm
+from matplotlib.lines import Line2D
 import pandas as pd
 import numpy as np
+from correlation_service import CorrelationService
+
+# Above this many students, scatter plots draw pre-binned counts instead of one marker
+# per student, so render time depends on the grid size rather than the cohort size
+DENSITY_THRESHOLD_ROWS = 20_000
+DENSITY_BINS = 80
+
+# Heatmaps with more cells than this are drawn without cell labels: every label is
+# its own Text artist, and past a few hundred they dominate render time
+ANNOTATION_MAX_CELLS = 400
 
 class Visualizations:
+    @staticmethod
+    def backend(name='matplotlib'):
+        """
+        Chart class for a backend; every backend has the same create_* and render_chart API
+
+        Args:
+            name: 'matplotlib' (server-rendered PNG/SVG) or 'plotly' (interactive, drawn in the browser)
+        """
+        if name == 'plotly':
+            from plotly_charts import PlotlyVisualizations  # plotly is optional
+            return PlotlyVisualizations
+        if name != 'matplotlib':
+            raise ValueError(f"Unknown chart backend: {name}")
+        return Visualizations
+
+    @staticmethod
+    def render(fig, fmt='png', dpi=100):
+        """
+        Render a figure to image bytes and release it
+
+        pyplot keeps every figure from plt.subplots in a global registry until it is
+        closed, so figures are closed as soon as their bytes exist.
+
+        Args:
+            fig: Matplotlib figure (None passes through)
+            fmt: 'png' or 'svg'
+            dpi: Resolution for raster formats
+        """
+        if fig is None:
+            return None
+        buffer = io.BytesIO()
+        try:
+            fig.savefig(buffer, format=fmt, dpi=dpi, bbox_inches='tight')
+        finally:
+            plt.close(fig)
+        return buffer.getvalue()
+
+    @staticmethod
+    def render_chart(chart, *args, fmt='png', dpi=100, **kwargs):
+        """Build a chart with create_<chart>(*args, **kwargs) and return its rendered bytes"""
+        create = getattr(Visualizations, f'create_{chart}')
+        return Visualizations.render(create(*args, **kwargs), fmt=fmt, dpi=dpi)
+
     @staticmethod
     def create_donut_chart(df, column, title, colors=None):
         value_counts = df[column].value_counts()
+        value_counts = value_counts[value_counts > 0]  # categoricals also count unused levels
         if colors is None:
             colors = plt.cm.Set3(np.linspace(0, 1, len(value_counts)))
         fig, ax = plt.subplots(figsize=(7, 7))  #figure sixe
@@ -28,6 +85,7 @@ class Visualizations:
         fig, ax = plt.subplots(figsize=(10, 6))
         if df[column].dtype == 'object' or pd.api.types.is_categorical_dtype(df[column]):
             value_counts = df[column].value_counts()
+            value_counts = value_counts[value_counts > 0]
             bars = ax.bar(range(len(value_counts)), value_counts.values, 
                         color=colors[:len(value_counts)] if colors else None)
             ax.set_xticks(range(len(value_counts)))
@@ -48,27 +106,17 @@ class Visualizations:
     
     @staticmethod
     def create_correlation_heatmap(df):
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
-        if len(numeric_cols) < 2:
+        corr_matrix = CorrelationService.matrix(df)
+        if len(corr_matrix.columns) < 2:
             return None
         
-        corr_matrix = df[numeric_cols].corr()
         fig, ax = plt.subplots(figsize=(12, 8))
         
-        im = ax.imshow(corr_matrix, aspect='auto', vmin=-1, vmax=1, cmap='RdBu_r')
+        im = Visualizations.plot_heatmap(ax, corr_matrix, 'RdBu_r', value_format='%.2f', vmin=-1, vmax=1,
+                                         x_rotation=45, fontsize=8)
         cbar = plt.colorbar(im, ax=ax, shrink=0.8)
         cbar.set_label('Correlation')
         
-        ax.set_xticks(range(len(corr_matrix.columns)))
-        ax.set_yticks(range(len(corr_matrix.columns)))
-        ax.set_xticklabels(corr_matrix.columns, rotation=45, ha='right')
-        ax.set_yticklabels(corr_matrix.columns)
-        
-        for i in range(len(corr_matrix.columns)):
-            for j in range(len(corr_matrix.columns)):
-                ax.text(j, i, f'{corr_matrix.iloc[i, j]:.2f}',
-                       ha="center", va="center", color="black", fontsize=8)
-        
         ax.set_title('Correlation Matrix', fontsize=16, pad=20)
         plt.tight_layout()
         return fig
@@ -78,7 +126,7 @@ class Visualizations:
         fig, ax = plt.subplots(figsize=(10, 6))
         
         involvement_order = ['Low', 'Medium', 'High']
-        mean_scores = df.groupby('Parental_Involvement')['Exam_Score'].mean()
+        mean_scores = df.groupby('Parental_Involvement', observed=True)['Exam_Score'].mean()
         mean_scores = mean_scores.reindex(involvement_order)
         
         bars = ax.bar(involvement_order, mean_scores, 
@@ -105,7 +153,7 @@ class Visualizations:
             education_order = ['High School', 'College', 'Postgraduate']
             df_filtered = df[df['Parental_Education_Level'].isin(education_order)]
             
-            mean_scores_education = df_filtered.groupby('Parental_Education_Level')['Exam_Score'].mean()
+            mean_scores_education = df_filtered.groupby('Parental_Education_Level', observed=True)['Exam_Score'].mean()
             mean_scores_education = mean_scores_education.reindex(education_order)
             
             colors = ["#99FFAF", "#439676", "#8BDDA7"]
@@ -127,7 +175,7 @@ class Visualizations:
             income_order = ['Low', 'Medium', 'High']
             df_filtered = df[df['Family_Income'].isin(income_order)]
             
-            mean_scores_income = df_filtered.groupby('Family_Income')['Exam_Score'].mean()
+            mean_scores_income = df_filtered.groupby('Family_Income', observed=True)['Exam_Score'].mean()
             mean_scores_income = mean_scores_income.reindex(income_order)
             
             colors = ["#66FFD9", "#44946C", "#4CC09D"]
@@ -152,29 +200,18 @@ class Visualizations:
         if 'Parental_Involvement' not in df.columns or 'Exam_Score' not in df.columns:
             return None
         
-        df_temp = df.copy()
-        df_temp['Score_Range'] = pd.cut(df_temp['Exam_Score'], 
-                                       bins=[0, 60, 70, 80, 90, 100], 
-                                       labels=['0-60', '60-70', '70-80', '80-90', '90-100'])
+        score_range = pd.cut(df['Exam_Score'], 
+                             bins=[0, 60, 70, 80, 90, 100], 
+                             labels=['0-60', '60-70', '70-80', '80-90', '90-100'])
         
-        heatmap_data = pd.crosstab(df_temp['Parental_Involvement'], df_temp['Score_Range'])
+        heatmap_data = Visualizations.level_counts(df['Parental_Involvement'], score_range)
         
         fig, ax = plt.subplots(figsize=(10, 6))
-        im = ax.imshow(heatmap_data.values, aspect='auto', cmap='YlOrRd')
+        im = Visualizations.plot_heatmap(ax, heatmap_data, 'YlOrRd', fontweight='bold')
         
         cbar = plt.colorbar(im, ax=ax)
         cbar.set_label('Students')
         
-        ax.set_xticks(range(len(heatmap_data.columns)))
-        ax.set_yticks(range(len(heatmap_data.index)))
-        ax.set_xticklabels(heatmap_data.columns)
-        ax.set_yticklabels(heatmap_data.index)
-        
-        for i in range(len(heatmap_data.index)):
-            for j in range(len(heatmap_data.columns)):
-                ax.text(j, i, heatmap_data.iloc[i, j], ha="center", va="center", 
-                       color="black", fontweight='bold')
-        
         ax.set_title('Parental Involvement vs Scores', fontsize=16, pad=20)
         ax.set_xlabel('Score Range')
         ax.set_ylabel('Parental Involvement')
@@ -186,24 +223,13 @@ class Visualizations:
         if 'Attendance_Category' not in df.columns or 'Performance_Category' not in df.columns:
             return None
         
-        heatmap_data = pd.crosstab(df['Attendance_Category'], df['Performance_Category'])
+        heatmap_data = Visualizations.level_counts(df['Attendance_Category'], df['Performance_Category'])
         fig, ax = plt.subplots(figsize=(10, 6))
         
-        im = ax.imshow(heatmap_data.values, cmap='Blues', aspect='auto')
+        im = Visualizations.plot_heatmap(ax, heatmap_data, 'Blues', text_color='contrast', fontweight='bold')
         cbar = plt.colorbar(im, ax=ax)
         cbar.set_label('Students')
         
-        ax.set_xticks(range(len(heatmap_data.columns)))
-        ax.set_yticks(range(len(heatmap_data.index)))
-        ax.set_xticklabels(heatmap_data.columns)
-        ax.set_yticklabels(heatmap_data.index)
-        
-        for i in range(len(heatmap_data.index)):
-            for j in range(len(heatmap_data.columns)):
-                ax.text(j, i, heatmap_data.iloc[i, j], ha="center", va="center", 
-                       color="white" if heatmap_data.iloc[i, j] > heatmap_data.values.max()/2 else "black", 
-                       fontweight='bold')
-        
         ax.set_title('Attendance vs Performance', fontsize=16, pad=20)
         ax.set_xlabel('Performance Category')
         ax.set_ylabel('Attendance Category')
@@ -211,34 +237,164 @@ class Visualizations:
         return fig
     
     @staticmethod
-    def create_scatter_plot(df, x_col, y_col, color_by=None, title=None):
-        """Create scatter plot with optional color coding"""
+    def plot_heatmap(ax, data, cmap, value_format='%d', text_color='black', vmin=None, vmax=None,
+                     x_rotation=0, max_annotated_cells=None, **text_kwargs):
+        """
+        Draw a DataFrame as a heatmap with its index and columns as tick labels
+
+        Every cell label is still its own Text artist, so an annotated heatmap renders no
+        faster than a per-cell ax.text loop. The only saving is that matrices with more than
+        max_annotated_cells cells (default ANNOTATION_MAX_CELLS) are drawn without labels,
+        with the colorbar carrying the values.
+
+        Args:
+            ax: Axes to draw on
+            data: DataFrame of cell values
+            cmap: Colormap name
+            value_format: printf-style format for the cell labels
+            text_color: Label color, or 'contrast' for white labels on the darker half
+            x_rotation: Rotation of the column labels
+            **text_kwargs: Extra ax.text arguments (fontsize, fontweight, ...)
+
+        Returns:
+            The image, for the colorbar
+        """
+        values = data.to_numpy(dtype=np.float64)
+        im = ax.imshow(values, aspect='auto', cmap=cmap, vmin=vmin, vmax=vmax)
+        
+        ax.set_xticks(range(values.shape[1]))
+        ax.set_yticks(range(values.shape[0]))
+        ax.set_xticklabels(data.columns, rotation=x_rotation, ha='right' if x_rotation else 'center')
+        ax.set_yticklabels(data.index)
+        
+        limit = ANNOTATION_MAX_CELLS if max_annotated_cells is None else max_annotated_cells
+        if values.size == 0 or values.size > limit:
+            return im
+        labels = np.char.mod(value_format, values)
+        if text_color == 'contrast':
+            colors = np.where(values > np.nanmax(values) / 2, 'white', 'black')
+        else:
+            colors = np.full(values.shape, text_color)
+        rows, cols = np.indices(values.shape)
+        for i, j, label, color in zip(rows.ravel(), cols.ravel(), labels.ravel(), colors.ravel()):
+            ax.text(j, i, label, ha="center", va="center", color=color, **text_kwargs)
+        return im
+    
+    @staticmethod
+    def use_density(n_rows, threshold=None):
+        """Whether a scatter of n_rows points should be drawn as binned counts"""
+        return n_rows > (DENSITY_THRESHOLD_ROWS if threshold is None else threshold)
+
+    @staticmethod
+    def bin_edges(values, bins=DENSITY_BINS):
+        """Histogram edges; integer-valued data gets one bin per value when that fits in bins"""
+        lo, hi = values.min(), values.max()
+        if hi - lo + 1 <= bins and np.array_equal(values, np.round(values)):
+            return np.arange(lo - 0.5, hi + 1.5)
+        if lo == hi:
+            hi = lo + 1
+        return np.linspace(lo, hi, bins + 1)
+
+    @staticmethod
+    def plot_density(ax, x, y, cmap='Blues', bins=DENSITY_BINS):
+        """Draw a 2D count grid of (x, y) with a log color scale; empty cells stay blank"""
+        x_edges = Visualizations.bin_edges(x, bins)
+        y_edges = Visualizations.bin_edges(y, bins)
+        counts, _, _ = np.histogram2d(x, y, bins=[x_edges, y_edges])
+        return ax.pcolormesh(x_edges, y_edges, np.ma.masked_equal(counts.T, 0), cmap=cmap, norm=LogNorm())
+
+    @staticmethod
+    def plot_category_density(ax, x, y, codes, colors, bins=DENSITY_BINS):
+        """
+        Binned scatter per category: one marker per occupied grid cell, sized by student count
+
+        Counts for every (category, cell) pair come from a single bincount.
+        """
+        x_edges = Visualizations.bin_edges(x, bins)
+        y_edges = Visualizations.bin_edges(y, bins)
+        nx, ny = len(x_edges) - 1, len(y_edges) - 1
+        x_bin = np.clip(np.searchsorted(x_edges, x, side='right') - 1, 0, nx - 1)
+        y_bin = np.clip(np.searchsorted(y_edges, y, side='right') - 1, 0, ny - 1)
+        cells = (codes * nx + x_bin) * ny + y_bin
+        counts = np.bincount(cells, minlength=len(colors) * nx * ny).reshape(len(colors), nx, ny)
+        x_centers = (x_edges[:-1] + x_edges[1:]) / 2
+        y_centers = (y_edges[:-1] + y_edges[1:]) / 2
+        largest = counts.max() or 1
+        for code, color in enumerate(colors):
+            xi, yi = np.nonzero(counts[code])
+            sizes = 10 + 140 * np.sqrt(counts[code, xi, yi] / largest)
+            ax.scatter(x_centers[xi], y_centers[yi], s=sizes, alpha=0.6, color=color, edgecolors='black')
+
+    @staticmethod
+    def plot_trend(ax, x, y, **line_kwargs):
+        """Least-squares trend line over the (x, y) pairs; returns their correlation"""
+        if len(x) < 2:
+            return None
+        z = np.polyfit(x, y, 1)
+        p = np.poly1d(z)
+        x_trend = np.linspace(x.min(), x.max(), 100)
+        ax.plot(x_trend, p(x_trend), "r--", alpha=0.8, **line_kwargs)
+        return np.corrcoef(x, y)[0, 1]
+
+    @staticmethod
+    def level_counts(rows, columns):
+        """Crosstab of two label series over the levels that actually occur (filtered views
+        keep every category of the full dataset, which would draw as empty rows and columns)"""
+        rows, columns = (series.cat.remove_unused_categories() if isinstance(series.dtype, pd.CategoricalDtype)
+                         else series for series in (rows, columns))
+        return pd.crosstab(rows, columns)
+
+    @staticmethod
+    def xy_values(df, x_col, y_col):
+        """x and y as float arrays, restricted to rows where both are present"""
+        x = df[x_col].to_numpy(dtype=np.float64, na_value=np.nan)
+        y = df[y_col].to_numpy(dtype=np.float64, na_value=np.nan)
+        valid = ~np.isnan(x) & ~np.isnan(y)
+        return x[valid], y[valid], valid
+
+    @staticmethod
+    def create_scatter_plot(df, x_col, y_col, color_by=None, title=None, density_threshold=None):
+        """
+        Create scatter plot with optional color coding
+
+        Above density_threshold rows (default DENSITY_THRESHOLD_ROWS) points are binned
+        into a count grid instead of drawn one by one.
+        """
         fig, ax = plt.subplots(figsize=(10, 7))
+        x, y, valid = Visualizations.xy_values(df, x_col, y_col)
+        density = Visualizations.use_density(len(x), density_threshold)
         
         if color_by and color_by in df.columns:
-            # Color-coded scatter
-            categories = df[color_by].unique()
+            # Color-coded scatter: factorize once instead of re-masking the frame per category
+            codes, categories = pd.factorize(df[color_by])
+            codes = codes[valid]
             colors = plt.cm.Set3(np.linspace(0, 1, len(categories)))
+            if density:
+                labelled = codes >= 0
+                Visualizations.plot_category_density(ax, x[labelled], y[labelled], codes[labelled], colors)
+            else:
+                # One sort groups the rows by category; each group is a contiguous slice
+                order = np.argsort(codes, kind='stable')
+                bounds = np.searchsorted(codes[order], np.arange(len(categories) + 1))
+                for code, color in enumerate(colors):
+                    rows = order[bounds[code]:bounds[code + 1]]
+                    ax.scatter(x[rows], y[rows], alpha=0.6, s=50, color=color, edgecolors='black')
             
-            for category, color in zip(categories, colors):
-                mask = df[color_by] == category
-                ax.scatter(df[mask][x_col], df[mask][y_col], 
-                          label=category, alpha=0.6, s=50, color=color, edgecolors='black')
-            
-            ax.legend(title=color_by, loc='best')
+            handles = [Line2D([], [], marker='o', linestyle='', markersize=8, color=color,
+                              markeredgecolor='black', label=category)
+                       for category, color in zip(categories, colors)]
+            ax.legend(handles=handles, title=color_by, loc='best')
+        elif density:
+            mesh = Visualizations.plot_density(ax, x, y)
+            fig.colorbar(mesh, ax=ax, label='Students')
         else:
             # Simple scatter
-            ax.scatter(df[x_col], df[y_col], alpha=0.5, s=50, color='skyblue', edgecolors='black')
+            ax.scatter(x, y, alpha=0.5, s=50, color='skyblue', edgecolors='black')
         
         # Add trend line
-        if df[x_col].notna().sum() > 1 and df[y_col].notna().sum() > 1:
-            z = np.polyfit(df[x_col].dropna(), df[y_col].dropna(), 1)
-            p = np.poly1d(z)
-            x_trend = np.linspace(df[x_col].min(), df[x_col].max(), 100)
-            ax.plot(x_trend, p(x_trend), "r--", alpha=0.8, linewidth=2, label='Trend')
-            
-            # Calculate and display correlation
-            corr = df[[x_col, y_col]].corr().iloc[0, 1]
+        corr = Visualizations.plot_trend(ax, x, y, linewidth=2, label='Trend')
+        if corr is not None:
+            # Display correlation
             ax.text(0.05, 0.95, f'Correlation: {corr:.3f}', 
                    transform=ax.transAxes, fontsize=11, verticalalignment='top',
                    bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5))
@@ -306,19 +462,21 @@ class Visualizations:
         return fig
     
     @staticmethod
-    def create_multi_factor_chart(df):
+    def create_multi_factor_chart(df, density_threshold=None):
         """Create comprehensive multi-factor analysis chart"""
         fig = plt.figure(figsize=(15, 10))
         gs = fig.add_gridspec(2, 2, hspace=0.3, wspace=0.3)
+        density = Visualizations.use_density(len(df), density_threshold)
         
         # 1. Attendance vs Score scatter
         ax1 = fig.add_subplot(gs[0, 0])
         if 'Attendance' in df.columns and 'Exam_Score' in df.columns:
-            ax1.scatter(df['Attendance'], df['Exam_Score'], alpha=0.5, s=30, color='steelblue')
-            z = np.polyfit(df['Attendance'].dropna(), df['Exam_Score'].dropna(), 1)
-            p = np.poly1d(z)
-            x_trend = np.linspace(df['Attendance'].min(), df['Attendance'].max(), 100)
-            ax1.plot(x_trend, p(x_trend), "r--", alpha=0.8)
+            x, y, _ = Visualizations.xy_values(df, 'Attendance', 'Exam_Score')
+            if density:
+                Visualizations.plot_density(ax1, x, y, cmap='Blues')
+            else:
+                ax1.scatter(x, y, alpha=0.5, s=30, color='steelblue')
+            Visualizations.plot_trend(ax1, x, y)
             ax1.set_xlabel('Attendance %')
             ax1.set_ylabel('Exam Score')
             ax1.set_title('Attendance vs Performance')
@@ -327,11 +485,12 @@ class Visualizations:
         # 2. Study Hours vs Score
         ax2 = fig.add_subplot(gs[0, 1])
         if 'Hours_Studied' in df.columns and 'Exam_Score' in df.columns:
-            ax2.scatter(df['Hours_Studied'], df['Exam_Score'], alpha=0.5, s=30, color='coral')
-            z = np.polyfit(df['Hours_Studied'].dropna(), df['Exam_Score'].dropna(), 1)
-            p = np.poly1d(z)
-            x_trend = np.linspace(df['Hours_Studied'].min(), df['Hours_Studied'].max(), 100)
-            ax2.plot(x_trend, p(x_trend), "r--", alpha=0.8)
+            x, y, _ = Visualizations.xy_values(df, 'Hours_Studied', 'Exam_Score')
+            if density:
+                Visualizations.plot_density(ax2, x, y, cmap='Oranges')
+            else:
+                ax2.scatter(x, y, alpha=0.5, s=30, color='coral')
+            Visualizations.plot_trend(ax2, x, y)
             ax2.set_xlabel('Hours Studied per Week')
             ax2.set_ylabel('Exam Score')
             ax2.set_title('Study Time vs Performance')
@@ -341,7 +500,7 @@ class Visualizations:
         ax3 = fig.add_subplot(gs[1, 0])
         if 'Parental_Involvement' in df.columns and 'Exam_Score' in df.columns:
             involvement_order = ['Low', 'Medium', 'High']
-            mean_scores = df.groupby('Parental_Involvement')['Exam_Score'].mean().reindex(involvement_order)
+            mean_scores = df.groupby('Parental_Involvement', observed=True)['Exam_Score'].mean().reindex(involvement_order)
             bars = ax3.bar(involvement_order, mean_scores, color=['#ff9999', '#ffcc99', '#99ff99'])
             for bar, value in zip(bars, mean_scores):
                 if pd.notna(value):
@@ -373,13 +532,12 @@ class Visualizations:
         if 'Exam_Score' not in df.columns:
             return None
         
-        # Calculate correlations
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
+        # Calculate correlations (served from the shared matrix)
+        score_corr = CorrelationService.with_target(df)
         correlations = []
         
-        for col in numeric_cols:
+        for col, corr in score_corr.items():
             if col != 'Exam_Score' and df[col].notna().sum() > 0:
-                corr = df[[col, 'Exam_Score']].corr().iloc[0, 1]
                 if not np.isnan(corr):
                     correlations.append({'factor': col, 'correlation': abs(corr)})
         